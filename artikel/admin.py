@@ -7,3 +7,7 @@ class ArtikelAdmin(admin.ModelAdmin):
     search_fields = ("title", "description")
     list_filter   = ("created_at",)
     ordering      = ("-created_at",)
+
+    @admin.display(description="Total likes", ordering="like_count")
+    def total_likes(self, obj):
+        return obj.like_count
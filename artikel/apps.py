@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ArtikelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artikel'
+
+    def ready(self):
+        from artikel import signals  # noqa: F401
@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from artikel.models import Artikel
+from artikel import search
+
+WORDS = (
+    "gunung pendakian jalur puncak kawah savana danau basecamp pos tenda "
+    "kabut hutan lumut tanjakan sunrise logistik porter ranger camp cuaca "
+    "semeru rinjani merbabu merapi lawu prau sindoro sumbing kerinci raung "
+    "slamet ciremai gede pangrango papandayan bromo ijen tambora latimojong"
+).split()
+# kosakata pengisi supaya tiap kata gunung hanya muncul di sebagian kecil artikel
+FILLER = [f"kata{i}" for i in range(20_000)]
+VOCAB = WORDS + FILLER
+QUERIES = ["rinjani", "kawah savana", "sunrise puncak semeru", "tanja", "latimojong porter"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark pencarian full-text vs LIKE pada N artikel sintetis (data di-rollback)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        rows, batch_size = options['rows'], options['batch_size']
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                for offset in range(0, rows, batch_size):
+                    batch = [
+                        Artikel(
+                            title=" ".join(rng.choices(WORDS, k=4)).title(),
+                            description=" ".join(rng.choices(VOCAB, k=rng.randint(80, 200))),
+                        )
+                        for _ in range(min(batch_size, rows - offset))
+                    ]
+                    Artikel.objects.bulk_create(batch)
+                    search.index_many((a.id, a.title, a.description) for a in batch)
+                self.stdout.write(f'Insert + index {rows} artikel: {time.perf_counter() - start:.1f} s')
+
+                self.stdout.write(f'{"query":<26}{"fts (ms)":>12}{"like (ms)":>12}{"speedup":>10}')
+                for q in QUERIES:
+                    fts = self._median_ms(search.search, q, options['repeat'])
+                    like = self._median_ms(search.search_like, q, options['repeat'])
+                    self.stdout.write(f'{q:<26}{fts:>12.2f}{like:>12.2f}{like / fts:>9.1f}x')
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _median_ms(fn, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(query, page=1, per_page=10)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+from artikel import related
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang index artikel terkait (TF-IDF + cosine similarity) untuk semua artikel'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        total = related.build_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Index artikel terkait dibangun untuk {total} artikel dalam {time.perf_counter() - start:.2f} detik.'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from artikel import view_counter
+
+
+class Command(BaseCommand):
+    help = ('Menulis view Artikel yang tertunda di buffer proses ini ke database '
+            'dan meminta worker web mem-flush buffer mereka')
+
+    def handle(self, *args, **options):
+        pending = view_counter.pending_views()
+        updated = view_counter.flush()
+        view_counter.request_flush()
+        self.stdout.write(self.style.SUCCESS(
+            f'Berhasil flush {pending} view untuk {updated} artikel; flush diminta ke semua worker.'
+        ))
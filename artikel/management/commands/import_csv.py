@@ -1,49 +1,141 @@
 import csv
 import os
+import time
 from django.core.management.base import BaseCommand
-from artikel.models import Artikel
+from django.db import transaction
+from django.utils import timezone
+from artikel.models import Artikel, import_key_for
+from artikel import sampling, search, sections, related, trending
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 CSV_PATH = os.path.join(BASE_DIR, 'artikelgunung-Sheet1.csv')
 
+
+def sniff_delimiter(file, sample_size=64 * 1024):
+    """Tebak delimiter dari baris header di sampel kecil, lalu kembalikan posisi file ke awal."""
+    sample = file.read(sample_size)
+    file.seek(0)
+    header = sample.splitlines()[0] if sample else ''
+    try:
+        return csv.Sniffer().sniff(header, delimiters='\t;,').delimiter
+    except csv.Error:
+        return ','
+
+
+def iter_rows(file, delimiter):
+    """Generator baris CSV -> (import_key, title, description, image)."""
+    reader = csv.DictReader(file, delimiter=delimiter)
+    for row in reader:
+        keys = {(k or '').strip().lower(): (v or '').strip() for k, v in row.items()}
+        title = keys.get('judul', '')
+        if not title:
+            continue
+        yield import_key_for(title), title, keys.get('isi', ''), keys.get('thumbnail', '')
+
+
+def _match_by_title(incoming, existing):
+    """
+    Artikel tanpa import_key (mis. dibuat lewat form/admin) dicocokkan lewat
+    judulnya dan diberi kunci, supaya import ulang tidak menduplikasinya.
+    Bila judulnya kembar, yang tertua yang dipakai.
+    """
+    titles = {title: key for key, (title, _, _) in incoming.items() if key not in existing}
+    if not titles:
+        return {}
+    matched = {}
+    for artikel in Artikel.objects.filter(import_key__isnull=True, title__in=list(titles)).order_by('created_at'):
+        key = titles[artikel.title]
+        if key not in matched:
+            artikel.import_key = key
+            matched[key] = artikel
+    return matched
+
+
+@transaction.atomic
+def upsert_batch(rows):
+    """
+    Upsert satu batch berdasarkan import_key (atau judul untuk artikel yang
+    belum punya kunci). Baris yang isinya sama persis dilewati sehingga
+    import ulang hampir tidak menulis apa pun. Batch ditulis dalam satu
+    transaksi. Return (created, updated, unchanged).
+    """
+    incoming = {key: (title, description, image) for key, title, description, image in rows}
+    existing = Artikel.objects.in_bulk(list(incoming), field_name='import_key')
+    adopted = _match_by_title(incoming, existing)
+    existing.update(adopted)
+
+    to_create, to_update = [], []
+    now = timezone.now()
+    for key, (title, description, image) in incoming.items():
+        artikel = existing.get(key)
+        if artikel is None:
+            to_create.append(Artikel(import_key=key, title=title, description=description, image=image,
+                                     trending_score=trending.score(0, 0, now)))
+        elif key in adopted or (artikel.title, artikel.description, artikel.image or '') != (title, description, image):
+            artikel.title, artikel.description, artikel.image = title, description, image
+            artikel.updated_at = now  # bulk_update tidak mengisi auto_now
+            to_update.append(artikel)
+
+    Artikel.objects.bulk_create(to_create)
+    Artikel.objects.bulk_update(to_update, ['title', 'description', 'image', 'updated_at', 'import_key'])
+    # bulk_create/bulk_update tidak memicu signal post_save
+    search.index_many((a.id, a.title, a.description) for a in to_create + to_update)
+    return len(to_create), len(to_update), len(incoming) - len(to_create) - len(to_update)
+
+
 class Command(BaseCommand):
-    help = 'Mengimpor data Artikel dari CSV (otomatis deteksi delimiter)'
+    help = 'Mengimpor data Artikel dari satu atau lebih CSV secara streaming (otomatis deteksi delimiter, upsert per judul)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=[CSV_PATH], help='File CSV (default: artikelgunung-Sheet1.csv)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--encoding', default='latin-1')
+        parser.add_argument('--skip-related', action='store_true',
+                            help='Jangan bangun ulang index artikel terkait setelah import')
 
     def handle(self, *args, **options):
-        try:
-            with open(CSV_PATH, mode='r', encoding='latin-1', newline='') as file:
-                content = file.read()
-                file.seek(0)
-
-                # 🔹 Tes delimiter secara manual
-                if '\t' in content:
-                    delimiter = '\t'
-                elif ';' in content:
-                    delimiter = ';'
-                else:
-                    delimiter = ','
-
-                reader = csv.DictReader(file, delimiter=delimiter)
-
-                # Debug lihat header
-                headers = reader.fieldnames
-                print("DEBUG HEADER KEYS:", headers)
-
-                artikel_list = []
-                for row in reader:
-                    keys = {k.strip().lower(): (v or '').strip() for k, v in row.items()}
-                    artikel_list.append(
-                        Artikel(
-                            title=keys.get('judul', ''),
-                            description=keys.get('isi', ''),
-                            image=keys.get('thumbnail', ''),
-                        )
-                    )
-
-                Artikel.objects.bulk_create(artikel_list)
-                self.stdout.write(self.style.SUCCESS(f'✅ Berhasil mengimpor {len(artikel_list)} data Artikel.'))
-
-        except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f'File tidak ditemukan: {CSV_PATH}'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Terjadi kesalahan: {e}'))
+        batch_size = options['batch_size']
+        totals = [0, 0, 0]
+        start = time.perf_counter()
+
+        for path in options['paths']:
+            # dihitung per batch yang sudah tersimpan, supaya file yang gagal di tengah tetap ikut diinvalidasi
+            counts = [0, 0, 0]
+            try:
+                file_start = time.perf_counter()
+                with open(path, mode='r', encoding=options['encoding'], newline='') as file:
+                    delimiter = sniff_delimiter(file)
+                    batch = []
+                    for row in iter_rows(file, delimiter):
+                        batch.append(row)
+                        if len(batch) >= batch_size:
+                            counts = [a + b for a, b in zip(counts, upsert_batch(batch))]
+                            batch = []
+                    if batch:
+                        counts = [a + b for a, b in zip(counts, upsert_batch(batch))]
+
+                rows = sum(counts)
+                elapsed = time.perf_counter() - file_start
+                self.stdout.write(
+                    f'{os.path.basename(path)}: {rows} baris (baru {counts[0]}, diperbarui {counts[1]}, '
+                    f'sama {counts[2]}) dalam {elapsed:.2f} s, {rows / elapsed if elapsed else 0:.0f} baris/s'
+                )
+
+            except FileNotFoundError:
+                self.stdout.write(self.style.ERROR(f'File tidak ditemukan: {path}'))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Terjadi kesalahan pada {path}: {e}'))
+            totals = [a + b for a, b in zip(totals, counts)]
+
+        if totals[0] or totals[1]:
+            sampling.invalidate()
+            sections.invalidate_content()
+            if not options['skip_related']:
+                related.build_all()
+
+        rows = sum(totals)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Berhasil mengimpor {rows} data Artikel: {totals[0]} baru, {totals[1]} diperbarui, '
+            f'{totals[2]} tidak berubah ({rows / elapsed if elapsed else 0:.0f} baris/s).'
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from artikel import search
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang index full-text search Artikel (FTS5 di SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = search.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Index pencarian berisi {total} artikel.'))
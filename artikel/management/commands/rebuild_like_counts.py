@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from artikel.models import Artikel
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang kolom like_count Artikel dari tabel likes (satu UPDATE massal)'
+
+    def handle(self, *args, **options):
+        Through = Artikel.likes.through
+        counts = (Through.objects
+                  .filter(artikel_id=OuterRef('pk'))
+                  .values('artikel_id')
+                  .annotate(c=Count('*'))
+                  .values('c'))
+        updated = Artikel.objects.update(like_count=Coalesce(Subquery(counts), 0))
+        self.stdout.write(self.style.SUCCESS(f'Berhasil menghitung ulang like_count untuk {updated} artikel.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from artikel import sections, trending
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang trending_score semua Artikel (mis. setelah half-life diubah)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = trending.rebuild(batch_size=options['batch_size'])
+        sections.invalidate_counters()
+        self.stdout.write(self.style.SUCCESS(f'Berhasil menghitung ulang trending_score untuk {total} artikel.'))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:01
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_count(apps, schema_editor):
+    Artikel = apps.get_model('artikel', 'Artikel')
+    Through = Artikel.likes.through
+    counts = (Through.objects
+              .filter(artikel_id=OuterRef('pk'))
+              .values('artikel_id')
+              .annotate(c=Count('*'))
+              .values('c'))
+    Artikel.objects.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artikel',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='artikel',
+            index=models.Index(fields=['like_count'], name='artikel_art_like_co_2e373c_idx'),
+        ),
+        migrations.RunPython(backfill_like_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+# ekspresi GIN harus sama persis dengan yang di-query artikel/search.py agar indeksnya terpakai
+FTS_TABLE = "artikel_artikel_fts"
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B'))"
+)
+
+
+def create_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "artikel_id UNINDEXED, title, description, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        Artikel = apps.get_model('artikel', 'Artikel')
+        rows = [
+            (pk.int >> 65, str(pk), title, description)  # rowid dari 63 bit teratas UUID
+            for pk, title, description in Artikel.objects.values_list('id', 'title', 'description').iterator()
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE}(rowid, artikel_id, title, description) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS artikel_artikel_fts_gin "
+            f"ON artikel_artikel USING GIN ({PG_VECTOR})"
+        )
+
+
+def drop_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS artikel_artikel_fts_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0002_artikel_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
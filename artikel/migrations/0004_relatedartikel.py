@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0003_artikel_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArtikel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('artikel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='artikel.artikel')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='artikel.artikel')),
+            ],
+            options={
+                'ordering': ['artikel', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('artikel', 'rank'), name='uniq_related_artikel_rank')],
+            },
+        ),
+    ]
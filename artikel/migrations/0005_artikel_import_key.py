@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:15
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def import_key_for(title):
+    # judul huruf kecil dengan spasi tunggal, di-hash: kunci yang dicari import_csv
+    normalized = " ".join((title or "").lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def backfill_import_key(apps, schema_editor):
+    # artikel lama (hasil import sebelumnya) diberi kunci supaya import ulang
+    # tidak menduplikasi; bila judulnya sudah kembar, hanya yang tertua yang diberi kunci
+    Artikel = apps.get_model('artikel', 'Artikel')
+    seen, batch = set(), []
+    for artikel in Artikel.objects.order_by('created_at').only('id', 'title').iterator(chunk_size=2000):
+        key = import_key_for(artikel.title)
+        if key in seen:
+            continue
+        seen.add(key)
+        artikel.import_key = key
+        batch.append(artikel)
+        if len(batch) >= 2000:
+            Artikel.objects.bulk_update(batch, ['import_key'])
+            batch = []
+    Artikel.objects.bulk_update(batch, ['import_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0004_relatedartikel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artikel',
+            name='import_key',
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_import_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:16
+
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def score(like_count, views, created_at):
+    # skor awal: log2 poin + umur dalam satuan half-life, dengan bobot dari settings
+    points = (like_count * getattr(settings, "ARTIKEL_TRENDING_LIKE_WEIGHT", 5)
+              + views * getattr(settings, "ARTIKEL_TRENDING_VIEW_WEIGHT", 1))
+    half_life = getattr(settings, "ARTIKEL_TRENDING_HALF_LIFE_HOURS", 24) * 3600
+    return math.log2(max(points, 1)) + created_at.timestamp() / half_life
+
+
+def backfill_trending_score(apps, schema_editor):
+    Artikel = apps.get_model('artikel', 'Artikel')
+    batch = []
+    for artikel in Artikel.objects.only('id', 'like_count', 'views', 'created_at').iterator(chunk_size=2000):
+        artikel.trending_score = score(artikel.like_count, artikel.views, artikel.created_at)
+        batch.append(artikel)
+        if len(batch) >= 2000:
+            Artikel.objects.bulk_update(batch, ['trending_score'])
+            batch = []
+    Artikel.objects.bulk_update(batch, ['trending_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0005_artikel_import_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artikel',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_trending_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0006_artikel_trending_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='artikel',
+            name='artikel_art_like_co_2e373c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='artikel',
+            index=models.Index(fields=['created_at', 'id'], name='artikel_art_created_6302ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artikel',
+            index=models.Index(fields=['views', 'id'], name='artikel_art_views_3bf99d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artikel',
+            index=models.Index(fields=['like_count', 'id'], name='artikel_art_like_co_bbe244_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0007_artikel_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtikelViewHit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('artikel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='artikel.artikel')),
+            ],
+        ),
+    ]
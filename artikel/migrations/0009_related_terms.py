@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:56
+
+import math
+import re
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# index awal harus memakai tokenizer & bobot yang sama dengan update inkremental
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+STOPWORDS = {
+    "dan", "yang", "di", "ke", "dari", "untuk", "dengan", "ini", "itu", "atau",
+    "pada", "juga", "dalam", "akan", "ada", "karena", "bisa", "tidak", "lebih",
+    "sangat", "oleh", "para", "saat", "agar", "serta", "namun", "sudah", "masih",
+    "hanya", "kita", "kami", "anda", "mereka", "adalah", "sebagai", "jika", "tapi",
+    "the", "and", "for", "with",
+}
+
+
+def tokenize(title, description):
+    def words(text):
+        return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS and len(t) <= 64]
+
+    return words(title) * 2 + words(description)
+
+
+def backfill_terms(apps, schema_editor):
+    Artikel = apps.get_model('artikel', 'Artikel')
+    RelatedTerm = apps.get_model('artikel', 'RelatedTerm')
+    ArtikelTerm = apps.get_model('artikel', 'ArtikelTerm')
+
+    docs, df = [], Counter()
+    for pk, title, description in Artikel.objects.values_list('id', 'title', 'description').iterator(chunk_size=2000):
+        counts = Counter(tokenize(title, description))
+        docs.append((pk, counts))
+        df.update(counts.keys())
+    n = len(docs)
+    max_df = 0.5 * n if n >= 100 else n
+
+    RelatedTerm.objects.bulk_create([RelatedTerm(term=t, df=d) for t, d in df.items()], batch_size=2000)
+    term_ids = dict(RelatedTerm.objects.values_list('term', 'id'))
+    batch = []
+    for pk, counts in docs:
+        weights = {t: (1 + math.log(tf)) * (math.log((1 + n) / (1 + df[t])) + 1)
+                   for t, tf in counts.items() if df[t] <= max_df}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1
+        batch += [ArtikelTerm(artikel_id=pk, term_id=term_ids[t], tf=tf, weight=weights.get(t, 0) / norm)
+                  for t, tf in counts.items()]
+        if len(batch) >= 5000:
+            ArtikelTerm.objects.bulk_create(batch, batch_size=2000)
+            batch = []
+    ArtikelTerm.objects.bulk_create(batch, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0008_artikel_view_hit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True)),
+                ('df', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArtikelTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tf', models.PositiveIntegerField()),
+                ('weight', models.FloatField(default=0)),
+                ('artikel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='artikel.artikel')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='artikel.relatedterm')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('artikel', 'term'), name='uniq_artikel_term')],
+            },
+        ),
+        migrations.RunPython(backfill_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artikel', '0009_related_terms'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ArtikelViewHit',
+        ),
+    ]
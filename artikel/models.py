@@ -1,7 +1,15 @@
 from django.db import models
+import hashlib
 import uuid
 from django.conf import settings
 
+
+def import_key_for(title):
+    """Kunci stabil untuk upsert import_csv: hash dari judul yang dinormalisasi."""
+    normalized = " ".join((title or "").lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
 # Create your models here.
 class Artikel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  
@@ -13,10 +21,63 @@ class Artikel(models.Model):
     views = models.PositiveIntegerField(default=0) 
 
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="liked_artikels", blank=True)
+    like_count = models.PositiveIntegerField(default=0)  # denormalisasi dari likes, diupdate di like_artikel
+    trending_score = models.FloatField(default=0, db_index=True)  # lihat artikel/trending.py
+    import_key = models.CharField(max_length=40, unique=True, null=True, blank=True, editable=False)  # diisi import_csv
+
+    class Meta:
+        indexes = [
+            # keyset pagination list_artikel_json (gundex/pagination.py)
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["views", "id"]),
+            models.Index(fields=["like_count", "id"]),
+        ]
 
     def total_likes(self):
-        return self.likes.count()
+        return self.like_count
 
     def __str__(self):
         return self.title
-    
\ No newline at end of file
+
+
+class RelatedArtikel(models.Model):
+    """Top-k artikel terkait yang sudah dihitung (lihat artikel/related.py)"""
+    artikel = models.ForeignKey(Artikel, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(Artikel, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["artikel", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["artikel", "rank"], name="uniq_related_artikel_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.artikel_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class RelatedTerm(models.Model):
+    """Term korpus artikel terkait beserta document frequency-nya (lihat artikel/related.py)"""
+    term = models.CharField(max_length=64, unique=True)
+    df = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.term} ({self.df})"
+
+
+class ArtikelTerm(models.Model):
+    """Posting: frekuensi & bobot TF-IDF satu term di satu artikel (lihat artikel/related.py)"""
+    artikel = models.ForeignKey(Artikel, on_delete=models.CASCADE, related_name="+")
+    term = models.ForeignKey(RelatedTerm, on_delete=models.CASCADE, related_name="postings")
+    tf = models.PositiveIntegerField()
+    weight = models.FloatField(default=0)  # dinormalisasi L2 dengan idf saat artikel diindex
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["artikel", "term"], name="uniq_artikel_term"),
+        ]
+
+    def __str__(self):
+        return f"{self.artikel_id} {self.term_id} ({self.weight:.3f})"
+
@@ -0,0 +1,296 @@
+"""
+Index "artikel terkait" berbasis konten (TF-IDF + cosine similarity).
+
+Setiap artikel direpresentasikan sebagai vektor TF-IDF sparse (bobot per
+term, sudah dinormalisasi L2) dari judul + isi. Vektor disimpan sebagai
+posting list di tabel ArtikelTerm dan document frequency per term di
+RelatedTerm, jadi kemiripan satu artikel terhadap seluruh korpus cukup
+satu query agregat atas posting yang berbagi term dengannya: biayanya
+sebanding dengan jumlah dokumen yang berbagi term, bukan N x vocab, dan
+tidak perlu men-tokenize ulang korpus. Top-k tetangga disimpan di tabel
+RelatedArtikel sehingga artikel_detail cukup melakukan satu lookup ber-index.
+
+- build_all(): dipakai command `build_related_artikel` (batch); men-tokenize
+  seluruh korpus di memori (Corpus), menulis ulang posting & df, lalu semua
+  daftar tetangga.
+- update_for(id): dipanggil saat artikel dibuat/diedit; hanya artikel itu
+  yang di-tokenize, df term yang berubah disesuaikan dengan F(), lalu daftar
+  miliknya ditulis ulang dan skornya digabung ke daftar artikel lain.
+- capture(id)/remove(id, captured): dipanggil sekitar penghapusan artikel;
+  df dikurangi dan daftar yang tadinya memuat artikel itu diisi ulang.
+
+Bobot artikel lain tidak dihitung ulang saat N atau df berubah (idf-nya
+tetap yang berlaku ketika artikel itu diindex), jadi skor inkremental bisa
+sedikit bergeser dari hasil build penuh; `build_related_artikel` berkala
+menyamakannya kembali.
+"""
+import math
+import re
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+
+_TOKEN_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+STOPWORDS = {
+    "dan", "yang", "di", "ke", "dari", "untuk", "dengan", "ini", "itu", "atau",
+    "pada", "juga", "dalam", "akan", "ada", "karena", "bisa", "tidak", "lebih",
+    "sangat", "oleh", "para", "saat", "agar", "serta", "namun", "sudah", "masih",
+    "hanya", "kita", "kami", "anda", "mereka", "adalah", "sebagai", "jika", "tapi",
+    "the", "and", "for", "with",
+}
+TITLE_WEIGHT = 2      # term di judul dihitung dua kali
+MAX_DF_RATIO = 0.5    # term yang muncul di >50% artikel dibuang (korpus >= 100)
+MAX_TERM_LENGTH = 64  # token lebih panjang (URL, sampah) diabaikan; = RelatedTerm.term max_length
+
+
+def top_k():
+    return getattr(settings, "ARTIKEL_RELATED_TOP_K", 4)
+
+
+def tokenize(title, description):
+    def words(text):
+        return [t for t in _TOKEN_RE.findall((text or "").lower())
+                if t not in STOPWORDS and len(t) <= MAX_TERM_LENGTH]
+
+    return words(title) * TITLE_WEIGHT + words(description)
+
+
+def max_df(n):
+    return MAX_DF_RATIO * n if n >= 100 else n
+
+
+def weights(counts, df, n):
+    """Bobot TF-IDF (L2) {term: bobot} untuk Counter term sebuah artikel; term di atas max_df dibuang."""
+    kept = [t for t in counts if df[t] <= max_df(n)]
+    tf = np.fromiter((counts[t] for t in kept), dtype=np.float32, count=len(kept))
+    idf = np.fromiter((math.log((1 + n) / (1 + df[t])) + 1 for t in kept), dtype=np.float32, count=len(kept))
+    values = (1 + np.log(tf)) * idf
+    norm = np.linalg.norm(values)
+    if norm:
+        values /= norm
+    return dict(zip(kept, values.tolist()))
+
+
+def _ranked(scores, k):
+    """Top-k (pk, skor) dari iterable (pk, skor): skor menurun, seri diurutkan menurut id."""
+    return sorted(((pk, s) for pk, s in scores if s > 0), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class Corpus:
+    """Vektor TF-IDF seluruh artikel + posting list per term (untuk build_all)."""
+
+    def __init__(self, rows):
+        self.ids = []
+        self.counts = []
+        self.df = Counter()
+        for pk, title, description in rows:
+            c = Counter(tokenize(title, description))
+            self.ids.append(pk)
+            self.counts.append(c)
+            self.df.update(c.keys())
+
+        n = len(self.ids)
+        self.vocab = {t: i for i, t in enumerate(t for t, d in self.df.items() if d <= max_df(n))}
+        self.weights = [weights(c, self.df, n) for c in self.counts]
+        postings = [[] for _ in self.vocab]
+        for doc, w in enumerate(self.weights):
+            for t, value in w.items():
+                postings[self.vocab[t]].append((doc, value))
+        self.postings = [
+            (np.array([d for d, _ in p], dtype=np.int32), np.array([w for _, w in p], dtype=np.float32))
+            for p in postings
+        ]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def similarities(self, doc):
+        """Cosine similarity dokumen `doc` terhadap semua dokumen (array panjang N)."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for t, w in self.weights[doc].items():
+            docs, vals = self.postings[self.vocab[t]]
+            scores[docs] += w * vals  # indeks unik per posting list
+        scores[doc] = 0
+        return scores
+
+    def neighbours(self, doc, k):
+        """Top-k (pk, score) untuk dokumen `doc`, urut dari yang paling mirip."""
+        scores = self.similarities(doc)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            # cukup partisi, tidak perlu sort penuh; kandidat yang seri dengan skor ke-k ikut dipertahankan
+            kth = scores[candidates[np.argpartition(-scores[candidates], k - 1)[k - 1]]]
+            candidates = candidates[scores[candidates] >= kth]
+        # korpus urut id, jadi sort stabil memutus seri menurut id (sama dengan _ranked)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+        return [(self.ids[i], float(scores[i])) for i in candidates.tolist()]
+
+
+def _load_corpus():
+    from artikel.models import Artikel
+    return Corpus(Artikel.objects.order_by("id").values_list("id", "title", "description").iterator(chunk_size=2000))
+
+
+def _replace_lists(lists):
+    """Tulis ulang daftar tetangga untuk artikel di `lists` ({pk: [(pk, score), ...]})."""
+    from artikel.models import RelatedArtikel
+
+    rows = [
+        RelatedArtikel(artikel_id=pk, related_id=other, rank=rank, score=score)
+        for pk, neighbours in lists.items()
+        for rank, (other, score) in enumerate(neighbours, start=1)
+    ]
+    with transaction.atomic():
+        RelatedArtikel.objects.filter(artikel_id__in=list(lists)).delete()
+        RelatedArtikel.objects.bulk_create(rows, batch_size=2000)
+
+
+def _replace_terms(corpus):
+    """Tulis ulang RelatedTerm & ArtikelTerm dari Corpus."""
+    from artikel.models import ArtikelTerm, RelatedTerm
+
+    ArtikelTerm.objects.all().delete()
+    RelatedTerm.objects.all().delete()
+    RelatedTerm.objects.bulk_create([RelatedTerm(term=t, df=d) for t, d in corpus.df.items()], batch_size=2000)
+    term_ids = dict(RelatedTerm.objects.values_list("term", "id"))
+    batch = []
+    for pk, counts, w in zip(corpus.ids, corpus.counts, corpus.weights):
+        batch += [ArtikelTerm(artikel_id=pk, term_id=term_ids[t], tf=tf, weight=w.get(t, 0)) for t, tf in counts.items()]
+        if len(batch) >= 5000:
+            ArtikelTerm.objects.bulk_create(batch, batch_size=2000)
+            batch = []
+    ArtikelTerm.objects.bulk_create(batch, batch_size=2000)
+
+
+def build_all():
+    """Bangun ulang seluruh index. Return jumlah artikel yang diproses."""
+    from artikel.models import RelatedArtikel
+
+    corpus = _load_corpus()
+    k = top_k()
+    with transaction.atomic():
+        _replace_terms(corpus)
+        RelatedArtikel.objects.all().delete()
+        batch = {}
+        for doc, pk in enumerate(corpus.ids):
+            batch[pk] = corpus.neighbours(doc, k)
+            if len(batch) >= 500:
+                _replace_lists(batch)
+                batch = {}
+        _replace_lists(batch)
+    return len(corpus)
+
+
+# =====================================================
+# 🔹 PERAWATAN INKREMENTAL
+# =====================================================
+def _scores(artikel_id, n):
+    """
+    Skor cosine artikel terhadap artikel lain yang berbagi term dengannya,
+    dari posting tersimpan: queryset (artikel_id, score).
+    """
+    from artikel.models import ArtikelTerm
+
+    return (ArtikelTerm.objects
+            .filter(term__postings__artikel_id=artikel_id, term__postings__weight__gt=0,
+                    term__df__lte=max_df(n), weight__gt=0)
+            .exclude(artikel_id=artikel_id)
+            .values("artikel_id")
+            .annotate(score=Sum(F("weight") * F("term__postings__weight")))
+            .values_list("artikel_id", "score"))
+
+
+def _neighbours(artikel_id, n, k):
+    return _ranked(_scores(artikel_id, n).order_by("-score", "artikel_id")[:k], k)
+
+
+def _index(artikel_id, counts):
+    """
+    Simpan posting artikel untuk Counter term `counts` dan sesuaikan df.
+    Return (jumlah artikel, apakah term-nya berubah).
+    """
+    from artikel.models import Artikel, ArtikelTerm, RelatedTerm
+
+    old = dict(ArtikelTerm.objects.filter(artikel_id=artikel_id).values_list("term__term", "tf"))
+    n = Artikel.objects.count()
+    if old == counts:
+        return n, False
+    added, removed = counts.keys() - old.keys(), old.keys() - counts.keys()
+    RelatedTerm.objects.bulk_create([RelatedTerm(term=t) for t in added], ignore_conflicts=True)
+    RelatedTerm.objects.filter(term__in=added).update(df=F("df") + 1)
+    RelatedTerm.objects.filter(term__in=removed).update(df=F("df") - 1)
+
+    terms = {t: (pk, df) for t, pk, df in RelatedTerm.objects.filter(term__in=counts).values_list("term", "id", "df")}
+    w = weights(counts, {t: df for t, (_, df) in terms.items()}, n)
+    ArtikelTerm.objects.filter(artikel_id=artikel_id).delete()
+    ArtikelTerm.objects.bulk_create(
+        [ArtikelTerm(artikel_id=artikel_id, term_id=terms[t][0], tf=tf, weight=w.get(t, 0)) for t, tf in counts.items()],
+        batch_size=2000,
+    )
+    return n, True
+
+
+def update_for(artikel_id):
+    """
+    Perbarui index setelah satu artikel dibuat/diedit: posting & df artikel
+    itu, daftar miliknya sendiri, dan daftar artikel lain yang memuat artikel
+    ini atau yang ambang top-k-nya terlampaui oleh skor barunya. Return jumlah
+    daftar yang ditulis ulang.
+    """
+    from artikel.models import Artikel, RelatedArtikel
+
+    row = Artikel.objects.filter(pk=artikel_id).values_list("title", "description").first()
+    if row is None:
+        return 0
+    k = top_k()
+    with transaction.atomic():
+        n, changed_terms = _index(artikel_id, Counter(tokenize(*row)))
+        if not changed_terms:
+            return 0
+        scores = dict(_scores(artikel_id, n))
+        changed = {artikel_id: _ranked(scores.items(), k)}
+
+        listing = set(RelatedArtikel.objects.filter(related_id=artikel_id).values_list("artikel_id", flat=True))
+        current = {}
+        for pk, other, score in (RelatedArtikel.objects
+                                 .filter(artikel_id__in=listing | scores.keys())
+                                 .order_by("artikel_id", "rank")
+                                 .values_list("artikel_id", "related_id", "score")):
+            current.setdefault(pk, []).append((other, score))
+
+        for pk in listing | scores.keys():
+            existing = current.get(pk, [])
+            others = [(other, s) for other, s in existing if other != artikel_id]
+            score = scores.get(pk, 0)
+            if pk in listing and len(existing) >= k and (not others or score < others[-1][1]):
+                # artikel ini turun dari daftar yang penuh: kandidat ke-(k+1) tidak diketahui, hitung ulang
+                changed[pk] = _neighbours(pk, n, k)
+            elif pk in listing or len(existing) < k or score > existing[-1][1]:
+                changed[pk] = _ranked(others + [(artikel_id, score)], k)
+        _replace_lists(changed)
+    return len(changed)
+
+
+def capture(artikel_id):
+    """Data yang dibutuhkan remove(), diambil sebelum artikel (dan posting/daftarnya) terhapus."""
+    from artikel.models import ArtikelTerm, RelatedArtikel
+
+    listing = list(RelatedArtikel.objects.filter(related_id=artikel_id).values_list("artikel_id", flat=True))
+    terms = list(ArtikelTerm.objects.filter(artikel_id=artikel_id).values_list("term_id", flat=True))
+    return listing, terms
+
+
+def remove(artikel_id, captured):
+    """Setelah artikel dihapus: kurangi df term-nya dan isi ulang daftar yang tadinya memuatnya."""
+    from artikel.models import Artikel, RelatedTerm
+
+    listing, terms = captured
+    RelatedTerm.objects.filter(pk__in=terms).update(df=F("df") - 1)
+    remaining = list(Artikel.objects.filter(pk__in=listing).values_list("pk", flat=True))
+    if remaining:
+        n, k = Artikel.objects.count(), top_k()
+        _replace_lists({pk: _neighbours(pk, n, k) for pk in remaining})
+    return len(remaining)
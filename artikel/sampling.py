@@ -0,0 +1,72 @@
+"""
+Sampling artikel acak tanpa memuat seluruh tabel.
+
+Daftar id artikel disimpan di memori tiap proses sebagai satu array bytes
+yang padat (16 byte per UUID). Untuk mengambil k artikel acak cukup pilih
+k indeks, potong id-nya dari array, lalu ambil hanya k baris tersebut
+dengan kolom yang dibutuhkan saja. Array hanya dimuat ulang bila versi
+bersama di cache berubah (di-bump saat artikel dibuat atau dihapus, lihat
+artikel/signals.py dan import_csv) atau sudah berumur lebih dari
+ARTIKEL_SAMPLING_CACHE_TTL detik, sebagai batas bila invalidasi terlewat
+(mis. perubahan langsung ke database). Request biasa hanya membaca angka
+versi, bukan seluruh array.
+"""
+import random
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from gundex.versioning import SharedVersion
+
+VERSION_CACHE_KEY = "artikel:sampling:version"
+UUID_SIZE = 16
+
+_lock = threading.Lock()
+_version = SharedVersion(VERSION_CACHE_KEY)
+_loaded = (None, 0.0, b"")  # (versi, waktu muat, array id)
+
+
+def _max_age():
+    return getattr(settings, "ARTIKEL_SAMPLING_CACHE_TTL", 300)
+
+
+def _load_id_array():
+    global _loaded
+    from artikel.models import Artikel
+
+    version = _version.get()
+    loaded_version, loaded_at, ids = _loaded
+    if loaded_version == version and time.monotonic() - loaded_at < _max_age():
+        return ids
+    with _lock:
+        if _loaded[0] == version and time.monotonic() - _loaded[1] < _max_age():
+            return _loaded[2]
+        ids = b"".join(
+            pk.bytes for pk in Artikel.objects.values_list("id", flat=True).iterator(chunk_size=2000)
+        )
+        _loaded = (version, time.monotonic(), ids)
+    return ids
+
+
+def invalidate():
+    _version.bump()
+
+
+def sample_ids(k):
+    """Pilih k id artikel secara acak (tanpa pengulangan)."""
+    ids = _load_id_array()
+    total = len(ids) // UUID_SIZE
+    picks = random.sample(range(total), min(k, total))
+    return [uuid.UUID(bytes=ids[i * UUID_SIZE:(i + 1) * UUID_SIZE]) for i in picks]
+
+
+def random_artikels(k, fields=("id", "title", "image")):
+    """Ambil k artikel acak, hanya dengan kolom `fields`, dalam urutan acak."""
+    from artikel.models import Artikel
+
+    chosen = sample_ids(k)
+    by_id = {a.id: a for a in Artikel.objects.filter(id__in=chosen).only(*fields)}
+    # artikel yang terhapus setelah array di-cache dilewati saja
+    return [by_id[pk] for pk in chosen if pk in by_id]
@@ -0,0 +1,205 @@
+"""
+Full-text search untuk Artikel.
+
+- SQLite (development): tabel virtual FTS5 `artikel_artikel_fts`. Rowid FTS
+  diturunkan dari UUID artikel (63 bit teratas) sehingga upsert/delete satu
+  artikel cukup lewat rowid. Index diperbarui dari signal post_save/post_delete
+  (artikel/signals.py) dan oleh import_csv setelah bulk insert.
+- PostgreSQL (production): index GIN di atas ekspresi tsvector title (bobot A)
+  + description (bobot B). Index ekspresi dirawat otomatis oleh database,
+  jadi fungsi index_* di bawah tidak melakukan apa-apa di Postgres.
+- Database lain: fallback ke pencarian LIKE (`search_like`).
+
+Tabel FTS5 dan index GIN dibuat oleh migration 0003_artikel_fts.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+FTS_TABLE = "artikel_artikel_fts"
+# penanda highlight sementara; diganti <mark> setelah teks di-escape
+_START, _STOP = "\x02", "\x03"
+SNIPPET_WORDS = 24
+
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B'))"
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_rowid(artikel_id):
+    """Rowid FTS5 yang stabil untuk sebuah UUID artikel."""
+    return artikel_id.int >> 65
+
+
+def _terms(query):
+    return [t.lower() for t in _TOKEN_RE.findall(query or "")][:16]
+
+
+def _mark(text):
+    return escape(text or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+# ---------------------------------------------------------------------
+# Perawatan index
+# ---------------------------------------------------------------------
+def index_many(artikels):
+    """Tambah/perbarui entri FTS untuk iterable of (id, title, description)."""
+    if connection.vendor != "sqlite":
+        return
+    rows = [(fts_rowid(pk), str(pk), title, description) for pk, title, description in artikels]
+    if rows:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE}(rowid, artikel_id, title, description) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+
+def index_artikel(artikel):
+    index_many([(artikel.pk, artikel.title, artikel.description)])
+
+
+def remove_artikel(artikel_id):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [fts_rowid(artikel_id)])
+
+
+def rebuild(batch_size=2000):
+    """Bangun ulang seluruh index FTS dari tabel artikel. Return jumlah artikel."""
+    from artikel.models import Artikel
+
+    if connection.vendor != "sqlite":
+        return Artikel.objects.count()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    total, batch = 0, []
+    for row in Artikel.objects.values_list("id", "title", "description").iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            index_many(batch)
+            total += len(batch)
+            batch = []
+    index_many(batch)
+    return total + len(batch)
+
+
+# ---------------------------------------------------------------------
+# Query
+# ---------------------------------------------------------------------
+def _search_sqlite(terms, limit, offset):
+    # semua term wajib ada (AND), term terakhir diperlakukan sebagai prefix
+    match = " ".join(f'"{t}"' for t in terms[:-1]) + f' "{terms[-1]}"*'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT artikel_id, bm25({FTS_TABLE}, 0.0, 10.0, 1.0) AS rank, "
+            f"highlight({FTS_TABLE}, 1, %s, %s), "
+            f"snippet({FTS_TABLE}, 2, %s, %s, '…', {SNIPPET_WORDS}) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            "ORDER BY rank LIMIT %s OFFSET %s",
+            [_START, _STOP, _START, _STOP, match, limit, offset],
+        )
+        # bm25 makin kecil makin relevan; dibalik supaya skor positif
+        return [(aid, -rank, title, snippet) for aid, rank, title, snippet in cursor.fetchall()]
+
+
+def _search_postgres(terms, limit, offset):
+    tsquery = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    headline = f"StartSel={_START}, StopSel={_STOP}"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT id, ts_rank({PG_VECTOR}, q) AS rank, "
+            "ts_headline('simple', title, q, %s), "
+            "ts_headline('simple', description, q, %s) "
+            f"FROM artikel_artikel, to_tsquery('simple', %s) q "
+            f"WHERE {PG_VECTOR} @@ q ORDER BY rank DESC, id LIMIT %s OFFSET %s",
+            [headline + ", HighlightAll=true",
+             headline + f", MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}",
+             tsquery, limit, offset],
+        )
+        return [(str(aid), rank, title, snippet) for aid, rank, title, snippet in cursor.fetchall()]
+
+
+def _like_snippet(text, terms):
+    """Snippet sederhana untuk jalur LIKE: potongan di sekitar term pertama yang ketemu."""
+    words = (text or "").split()
+    lowered = [w.lower() for w in words]
+    start = next((i for i, w in enumerate(lowered) if any(t in w for t in terms)), 0)
+    start = max(0, start - SNIPPET_WORDS // 4)
+    piece = words[start:start + SNIPPET_WORDS]
+    marked = [f"{_START}{w}{_STOP}" if any(t in w.lower() for t in terms) else w for w in piece]
+    return ("…" if start else "") + " ".join(marked) + ("…" if start + SNIPPET_WORDS < len(words) else "")
+
+
+def search_like(query, page=1, per_page=10):
+    """Pencarian LIKE '%x%' (jalur lama, juga dipakai sebagai pembanding benchmark)."""
+    from artikel.models import Artikel
+
+    terms = _terms(query)
+    if not terms:
+        return {"results": [], "has_more": False}
+    cond = Q()
+    for t in terms:
+        cond &= Q(title__icontains=t) | Q(description__icontains=t)
+    offset = (page - 1) * per_page
+    rows = list(Artikel.objects.filter(cond)
+                .order_by("-created_at")
+                .values("id", "title", "description", "image")[offset:offset + per_page + 1])
+    results = [
+        {
+            "id": str(r["id"]),
+            "title": escape(r["title"]),
+            "snippet": _mark(_like_snippet(r["description"], terms)),
+            "image": r["image"],
+            "score": None,
+        }
+        for r in rows[:per_page]
+    ]
+    return {"results": results, "has_more": len(rows) > per_page}
+
+
+def search(query, page=1, per_page=10):
+    """
+    Cari artikel berdasarkan relevansi. Return dict berisi `results`
+    (id, title ber-highlight, snippet, image, score) dan `has_more`.
+    """
+    from artikel.models import Artikel
+
+    terms = _terms(query)
+    if not terms:
+        return {"results": [], "has_more": False}
+    if connection.vendor == "sqlite":
+        runner = _search_sqlite
+    elif connection.vendor == "postgresql":
+        runner = _search_postgres
+    else:
+        return search_like(query, page, per_page)
+
+    offset = (page - 1) * per_page
+    hits = runner(terms, per_page + 1, offset)
+    has_more = len(hits) > per_page
+    hits = hits[:per_page]
+
+    images = {
+        str(pk): image
+        for pk, image in Artikel.objects.filter(id__in=[h[0] for h in hits]).values_list("id", "image")
+    }
+    results = [
+        {
+            "id": aid,
+            "title": _mark(title),
+            "snippet": _mark(snippet),
+            "image": images[aid],
+            "score": round(float(rank), 4),
+        }
+        for aid, rank, title, snippet in hits
+        if aid in images  # entri index yang artikelnya sudah terhapus dilewati
+    ]
+    return {"results": results, "has_more": has_more}
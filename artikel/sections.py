@@ -0,0 +1,50 @@
+"""
+Versi cache untuk fragmen halaman show_artikel (latest, popular, hottest).
+
+Fragmen dirender sekali lalu disimpan dengan `{% cache %}`; kuncinya
+memuat nomor versi di bawah ini sehingga invalidasi cukup dengan menaikkan
+versi:
+  - versi "content" naik saat artikel dibuat, diedit, atau dihapus
+    (signal di artikel/signals.py),
+  - versi "counters" naik saat like di-toggle atau view di-flush.
+Popular dan hottest juga diberi TTL pendek sebagai batas staleness, misalnya
+bila cache tidak di-share antar worker.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CONTENT_KEY = "artikel:sections:content"
+COUNTERS_KEY = "artikel:sections:counters"
+
+
+def _version(key):
+    # nilai awal berbasis waktu supaya versi tidak mengulang setelah cache di-evict
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_content():
+    _bump(CONTENT_KEY)
+
+
+def invalidate_counters():
+    _bump(COUNTERS_KEY)
+
+
+def context():
+    """Versi dan TTL yang dipakai tag {% cache %} di full_artikel.html."""
+    return {
+        "content_version": _version(CONTENT_KEY),
+        "counters_version": _version(COUNTERS_KEY),
+        "latest_ttl": getattr(settings, "ARTIKEL_SECTION_CACHE_TTL", 3600),
+        "counters_ttl": getattr(settings, "ARTIKEL_COUNTER_SECTION_CACHE_TTL", 60),
+    }
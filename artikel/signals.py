@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from artikel.models import Artikel
+from artikel import sampling, sections, search, related, trending
+
+
+@receiver(post_save, sender=Artikel)
+def artikel_saved(sender, instance, created, **kwargs):
+    if created:
+        sampling.invalidate()
+        trending.refresh([instance.pk])
+    sections.invalidate_content()
+    search.index_artikel(instance)
+    related.update_for(instance.pk)
+
+
+@receiver(pre_delete, sender=Artikel)
+def artikel_deleting(sender, instance, **kwargs):
+    # posting & daftar terkait ikut terhapus (cascade) sebelum post_delete
+    instance._related_captured = related.capture(instance.pk)
+
+
+@receiver(post_delete, sender=Artikel)
+def artikel_deleted(sender, instance, **kwargs):
+    sampling.invalidate()
+    sections.invalidate_content()
+    search.remove_artikel(instance.pk)
+    captured = getattr(instance, "_related_captured", None)
+    if captured is not None:
+        related.remove(instance.pk, captured)
@@ -9,6 +9,7 @@ from django.db import models
 from django.test import SimpleTestCase
 from django.urls import reverse, resolve
 from artikel import views
+from artikel import view_counter
 
 User = get_user_model()
 
@@ -80,6 +81,7 @@ class ArtikelTestCase(TestCase):
         views_before = self.artikel1.views
         response = self.client.get(reverse("artikel:artikel_detail", args=[self.artikel1.id]))
         self.assertEqual(response.status_code, 200)
+        view_counter.flush()
         self.artikel1.refresh_from_db()
         self.assertEqual(self.artikel1.views, views_before + 1)
 
@@ -428,4 +430,668 @@ class ArtikelTestCase(TestCase):
         self.assertEqual(resolve(reverse('artikel:edit_artikel', args=[fake_id])).func, views.edit_artikel)
         self.assertEqual(resolve(reverse('artikel:delete_artikel', args=[fake_id])).func, views.delete_artikel)
         self.assertEqual(resolve(reverse('artikel:edit_artikel_modal', args=[fake_id])).func, views.edit_artikel_modal)
-        self.assertEqual(resolve(reverse('artikel:create_artikel')).func, views.create_artikel)
\ No newline at end of file
+        self.assertEqual(resolve(reverse('artikel:create_artikel')).func, views.create_artikel)
+
+class ViewCounterTestCase(TestCase):
+    """Test write-behind counter view artikel"""
+
+    def setUp(self):
+        view_counter.flush()
+        self.artikel = Artikel.objects.create(title="Gunung Semeru", description="Puncak Mahameru")
+
+    def test_views_are_buffered_until_flush(self):
+        for _ in range(3):
+            self.client.get(reverse("artikel:artikel_detail", args=[self.artikel.id]))
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 0)
+        self.assertEqual(view_counter.pending_views(self.artikel.pk), 3)
+
+        self.assertEqual(view_counter.flush(), 1)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 3)
+        self.assertEqual(view_counter.pending_views(), 0)
+
+    def test_flush_when_threshold_reached(self):
+        with self.settings(ARTIKEL_VIEW_FLUSH_THRESHOLD=5):
+            for _ in range(5):
+                view_counter.record_view(self.artikel.pk)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 5)
+        self.assertEqual(view_counter.pending_views(), 0)
+
+    def test_flush_uses_atomic_increment(self):
+        view_counter.record_view(self.artikel.pk, 4)
+        # ada update lain di luar buffer sebelum flush
+        Artikel.objects.filter(pk=self.artikel.pk).update(views=models.F("views") + 10)
+        view_counter.flush()
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 14)
+
+    def test_concurrent_hits_are_not_lost(self):
+        import threading
+        threads_count, hits_per_thread = 8, 500
+        barrier = threading.Barrier(threads_count)
+
+        def hit():
+            barrier.wait()
+            for _ in range(hits_per_thread):
+                view_counter.record_view(self.artikel.pk)
+
+        threads = [threading.Thread(target=hit) for _ in range(threads_count)]
+        with self.settings(ARTIKEL_VIEW_FLUSH_THRESHOLD=10**9, ARTIKEL_VIEW_FLUSH_INTERVAL=10**9):
+            for t in threads:
+                t.start()
+            # flush berulang selama thread lain masih menambah hit
+            while any(t.is_alive() for t in threads):
+                view_counter.flush()
+            for t in threads:
+                t.join()
+        view_counter.flush()
+
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, threads_count * hits_per_thread)
+
+    def test_failed_flush_keeps_pending_views(self):
+        from unittest import mock
+        view_counter.record_view(self.artikel.pk, 2)
+        with mock.patch("django.db.models.query.QuerySet.update", side_effect=Exception("DB error")):
+            with self.assertRaises(Exception):
+                view_counter.flush()
+        self.assertEqual(view_counter.pending_views(self.artikel.pk), 2)
+        view_counter.flush()
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 2)
+
+    def test_flush_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+        view_counter.record_view(self.artikel.pk, 7)
+        out = StringIO()
+        requested = view_counter._flush_request.get()
+        call_command("flush_artikel_views", stdout=out)
+        self.assertIn("7 view", out.getvalue())
+        # worker lain melihat versi permintaan flush yang baru
+        self.assertNotEqual(view_counter._flush_request.get(), requested)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.views, 7)
+
+
+class LikeCountTestCase(TestCase):
+    """Test kolom like_count yang didenormalisasi"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="pendaki", password="pendaki123")
+        self.other = User.objects.create_user(username="pendaki2", password="pendaki123")
+        self.artikel = Artikel.objects.create(title="Gunung Kerinci", description="Atap Sumatera")
+        self.client.login(username="pendaki", password="pendaki123")
+
+    def test_toggle_updates_like_count(self):
+        url = reverse("artikel:like_artikel", args=[self.artikel.id])
+        data = self.client.post(url).json()
+        self.assertTrue(data["liked"])
+        self.assertEqual(data["total_likes"], 1)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.like_count, 1)
+
+        data = self.client.post(url).json()
+        self.assertFalse(data["liked"])
+        self.assertEqual(data["total_likes"], 0)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.like_count, 0)
+        self.assertEqual(self.artikel.likes.count(), 0)
+
+    def test_hottest_reads_stored_counter(self):
+        older = Artikel.objects.create(title="Gunung Tambora", description="Letusan 1815", like_count=3)
+        response = self.client.get(reverse("artikel:show_artikel"))
+        hottest = list(response.context["hottest_artikels"])
+        self.assertEqual(hottest[0], older)
+
+    def test_rebuild_like_counts_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+        self.artikel.likes.add(self.user, self.other)
+        Artikel.objects.filter(pk=self.artikel.pk).update(like_count=99)
+        out = StringIO()
+        call_command("rebuild_like_counts", stdout=out)
+        self.artikel.refresh_from_db()
+        self.assertEqual(self.artikel.like_count, 2)
+        self.assertIn("Berhasil", out.getvalue())
+
+
+class RandomSamplingTestCase(TestCase):
+    """Test sampler artikel acak berbasis array id per proses"""
+
+    def setUp(self):
+        from artikel import sampling
+        self.sampling = sampling
+        sampling.invalidate()
+        self.artikels = [
+            Artikel.objects.create(title=f"Artikel {i}", description="isi " * 50)
+            for i in range(10)
+        ]
+
+    def test_sample_returns_k_distinct_artikels(self):
+        result = self.sampling.random_artikels(7)
+        self.assertEqual(len(result), 7)
+        self.assertEqual(len({a.id for a in result}), 7)
+
+    def test_sample_is_capped_at_table_size(self):
+        self.assertEqual(len(self.sampling.random_artikels(50)), 10)
+
+    def test_sample_uses_projection(self):
+        artikel = self.sampling.random_artikels(1)[0]
+        self.assertIn("description", artikel.get_deferred_fields())
+
+    def test_cache_invalidated_on_create_and_delete(self):
+        self.sampling.random_artikels(1)  # isi cache
+        baru = Artikel.objects.create(title="Artikel Baru", description="baru")
+        self.assertIn(baru.id, self.sampling.sample_ids(100))
+
+        baru.delete()
+        self.assertNotIn(baru.id, self.sampling.sample_ids(100))
+
+    def test_id_array_kept_in_process_with_bounded_age(self):
+        self.sampling.sample_ids(1)  # muat array
+        with self.assertNumQueries(0):
+            self.sampling.sample_ids(1)
+        # array yang melewati umur maksimum dimuat ulang walau versinya tidak berubah
+        with self.settings(ARTIKEL_SAMPLING_CACHE_TTL=0), self.assertNumQueries(1):
+            self.sampling.sample_ids(1)
+
+    def test_invalidate_from_other_worker_reloads_array(self):
+        from django.core.cache import cache
+        self.sampling.sample_ids(1)
+        # bulk_create tidak mengirim signal, jadi versi proses ini tidak ikut di-bump
+        baru, = Artikel.objects.bulk_create([Artikel(title="Artikel Baru", description="baru")])
+        self.assertNotIn(baru.id, self.sampling.sample_ids(100))
+        # worker lain mem-bump versi; proses ini melihatnya setelah interval cek versi
+        cache.set(self.sampling.VERSION_CACHE_KEY, 1, None)
+        with self.settings(SHARED_VERSION_CHECK_INTERVAL=0):
+            self.assertIn(baru.id, self.sampling.sample_ids(100))
+
+    def test_fetch_only_k_rows(self):
+        self.sampling.random_artikels(1)  # isi cache
+        with self.assertNumQueries(1):
+            self.sampling.random_artikels(6)
+
+    def test_refresh_endpoint_uses_sampler(self):
+        data = self.client.get(reverse("artikel:get_random_recommendations")).json()
+        self.assertEqual(len(data["artikels"]), 6)
+
+
+class SectionCacheTestCase(TestCase):
+    """Test cache fragmen latest/popular/hottest di show_artikel"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        view_counter.flush()
+        self.user = User.objects.create_user(username="pembaca", password="pembaca123")
+        self.admin = User.objects.create_user(username="admin2", password="admin123", is_admin=True)
+        self.artikel = Artikel.objects.create(title="Gunung Sindoro", description="Kembaran Sumbing")
+        self.url = reverse("artikel:show_artikel")
+
+    def _count_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        return response, len(ctx.captured_queries)
+
+    def test_sections_are_served_from_cache(self):
+        from artikel import sections
+        self.client.get(self.url)  # isi cache id sampler
+        sections.invalidate_content()
+        _, cold = self._count_queries()
+        response, warm = self._count_queries()
+        self.assertEqual(cold - warm, 3)  # latest, popular, hottest tidak di-query lagi
+        self.assertContains(response, "Gunung Sindoro")
+
+    def test_create_edit_delete_invalidate_sections(self):
+        self.client.get(self.url)
+        baru = Artikel.objects.create(title="Gunung Sumbing", description="Kembaran Sindoro")
+        self.assertContains(self.client.get(self.url), "Gunung Sumbing")
+
+        baru.title = "Gunung Sumbing Baru"
+        baru.save()
+        self.assertContains(self.client.get(self.url), "Gunung Sumbing Baru")
+
+        baru.delete()
+        self.assertNotContains(self.client.get(self.url), "Gunung Sumbing")
+
+    def test_like_invalidates_hottest(self):
+        lain = Artikel.objects.create(title="Gunung Prau", description="Golden sunrise")
+        self.client.get(self.url)
+        self.client.login(username="pembaca", password="pembaca123")
+        self.client.post(reverse("artikel:like_artikel", args=[lain.id]))
+        response = self.client.get(self.url)
+        content = response.content.decode()
+        hottest = content[content.index("Artikel Terhangat"):]
+        self.assertLess(hottest.index("Gunung Prau"), hottest.index("Gunung Sindoro"))
+
+    def test_view_flush_invalidates_popular(self):
+        lain = Artikel.objects.create(title="Gunung Prau", description="Golden sunrise")
+        self.client.get(self.url)
+        view_counter.record_view(lain.pk, 5)
+        view_counter.flush()
+        content = self.client.get(self.url).content.decode()
+        popular = content[content.index("Artikel Terpopuler"):]
+        self.assertLess(popular.index("Gunung Prau"), popular.index("Gunung Sindoro"))
+
+    def test_admin_button_not_shared_through_cache(self):
+        tombol_buat = 'class="fixed bottom-8 right-8"'
+        self.client.login(username="admin2", password="admin123")
+        self.assertContains(self.client.get(self.url), tombol_buat)
+        self.client.logout()
+        self.client.login(username="pembaca", password="pembaca123")
+        self.assertNotContains(self.client.get(self.url), tombol_buat)
+
+
+class SearchArtikelTestCase(TestCase):
+    """Test endpoint full-text search artikel"""
+
+    def setUp(self):
+        self.rinjani = Artikel.objects.create(
+            title="Pendakian Rinjani via Sembalun",
+            description="Savana luas, Danau Segara Anak dan puncak Rinjani 3726 mdpl.",
+            image="https://example.com/rinjani.jpg",
+        )
+        self.semeru = Artikel.objects.create(
+            title="Catatan Semeru",
+            description="Dari Ranu Kumbolo ke Kalimati, lalu summit attack ke Mahameru. Rinjani masih dalam daftar.",
+        )
+        self.url = reverse("artikel:search_artikel")
+
+    def test_search_ranks_title_match_first(self):
+        data = self.client.get(self.url, {"q": "rinjani"}).json()
+        ids = [r["id"] for r in data["results"]]
+        self.assertEqual(ids, [str(self.rinjani.id), str(self.semeru.id)])
+        self.assertIn("<mark>Rinjani</mark>", data["results"][0]["title"])
+        self.assertIn("<mark>", data["results"][1]["snippet"])
+        self.assertEqual(data["results"][0]["image"], "https://example.com/rinjani.jpg")
+
+    def test_search_prefix_and_all_terms(self):
+        data = self.client.get(self.url, {"q": "ranu kumb"}).json()
+        self.assertEqual([r["id"] for r in data["results"]], [str(self.semeru.id)])
+
+    def test_search_escapes_html(self):
+        Artikel.objects.create(title="<b>Tips</b> Lawu", description="Cemoro Sewu")
+        data = self.client.get(self.url, {"q": "lawu"}).json()
+        self.assertIn("&lt;b&gt;", data["results"][0]["title"])
+
+    def test_index_follows_edit_and_delete(self):
+        self.semeru.title = "Catatan Mahameru"
+        self.semeru.description = "Ranu Kumbolo"
+        self.semeru.save()
+        data = self.client.get(self.url, {"q": "rinjani"}).json()
+        self.assertEqual(len(data["results"]), 1)
+
+        self.rinjani.delete()
+        data = self.client.get(self.url, {"q": "rinjani"}).json()
+        self.assertEqual(data["results"], [])
+
+    def test_search_pagination(self):
+        for i in range(5):
+            Artikel.objects.create(title=f"Kabut Gede {i}", description="kabut tebal di Gede")
+        first = self.client.get(self.url, {"q": "kabut", "per_page": 3}).json()
+        second = self.client.get(self.url, {"q": "kabut", "per_page": 3, "page": 2}).json()
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        ids = [r["id"] for r in first["results"] + second["results"]]
+        self.assertEqual(len(set(ids)), 5)
+
+    def test_empty_or_symbol_query(self):
+        self.assertEqual(self.client.get(self.url, {"q": "\"*:()"}).json()["results"], [])
+
+    def test_like_path_matches_fts(self):
+        from artikel import search
+        like = search.search_like("rinjani")
+        self.assertEqual({r["id"] for r in like["results"]}, {str(self.rinjani.id), str(self.semeru.id)})
+
+    def test_rebuild_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+        out = StringIO()
+        call_command("rebuild_artikel_search", stdout=out)
+        self.assertIn("2 artikel", out.getvalue())
+        self.assertEqual(len(self.client.get(self.url, {"q": "rinjani"}).json()["results"]), 2)
+
+
+class RelatedArtikelTestCase(TestCase):
+    """Test index artikel terkait berbasis TF-IDF"""
+
+    def setUp(self):
+        self.rinjani = Artikel.objects.create(
+            title="Pendakian Rinjani via Sembalun",
+            description="Savana Sembalun, danau Segara Anak dan puncak Rinjani di Lombok.",
+        )
+        self.rinjani2 = Artikel.objects.create(
+            title="Segara Anak, danau di kaldera Rinjani",
+            description="Berkemah di tepi Segara Anak setelah turun dari Plawangan Sembalun.",
+        )
+        self.semeru = Artikel.objects.create(
+            title="Ranu Kumbolo dan Mahameru",
+            description="Jalur Semeru dari Ranu Pani menuju Kalimati lalu puncak Mahameru.",
+        )
+        self.bromo = Artikel.objects.create(
+            title="Sunrise Penanjakan Bromo",
+            description="Lautan pasir Bromo dan kawah yang masih aktif.",
+        )
+
+    def _related_ids(self, artikel):
+        from artikel.models import RelatedArtikel
+        return list(RelatedArtikel.objects.filter(artikel=artikel).values_list("related_id", flat=True))
+
+    def test_most_similar_is_ranked_first(self):
+        self.assertEqual(self._related_ids(self.rinjani)[0], self.rinjani2.id)
+        self.assertEqual(self._related_ids(self.rinjani2)[0], self.rinjani.id)
+        self.assertNotIn(self.rinjani.id, self._related_ids(self.bromo))
+
+    def test_create_updates_existing_lists(self):
+        baru = Artikel.objects.create(
+            title="Kawah Bromo dari dekat",
+            description="Menaiki tangga menuju bibir kawah Bromo dari lautan pasir.",
+        )
+        self.assertEqual(self._related_ids(self.bromo)[0], baru.id)
+        self.assertEqual(self._related_ids(baru)[0], self.bromo.id)
+
+    def test_edit_updates_lists(self):
+        self.semeru.title = "Rinjani dan Segara Anak"
+        self.semeru.description = "Danau Segara Anak di kaldera Rinjani, Sembalun."
+        self.semeru.save()
+        self.assertIn(self.semeru.id, self._related_ids(self.rinjani))
+
+    def test_save_tokenizes_only_the_saved_artikel(self):
+        from unittest import mock
+        from artikel import related
+        self.semeru.description += " Ranu Kumbolo."
+        with mock.patch.object(related, "tokenize", wraps=related.tokenize) as tokenize:
+            self.semeru.save()
+        self.assertEqual(tokenize.call_count, 1)
+        with mock.patch.object(related, "_replace_lists") as replace:
+            self.semeru.save()  # teks tidak berubah: index tidak disentuh
+        replace.assert_not_called()
+
+    def test_delete_refills_lists(self):
+        from artikel import related
+        from artikel.models import RelatedArtikel, RelatedTerm
+        with self.settings(ARTIKEL_RELATED_TOP_K=1):
+            related.build_all()
+            self.assertEqual(self._related_ids(self.rinjani), [self.rinjani2.id])
+            self.rinjani2.delete()
+            # daftar Rinjani diisi ulang dengan tetangga berikutnya, bukan dibiarkan kosong
+            self.assertEqual(RelatedArtikel.objects.filter(artikel=self.rinjani).count(), 1)
+            self.assertNotEqual(self._related_ids(self.rinjani), [self.rinjani2.id])
+        self.assertEqual(RelatedTerm.objects.get(term="segara").df, 1)
+
+    def test_corpus_partial_top_k_matches_full_ranking(self):
+        import uuid
+        from artikel import related
+        words = ["rinjani", "semeru", "bromo", "merapi", "lawu", "sindoro"]
+        # banyak dokumen kembar supaya ada skor yang seri di batas ke-k
+        rows = sorted(
+            (uuid.uuid4(), f"{words[i % 6]} {words[(i * 7) % 6]}", words[(i // 3) % 6])
+            for i in range(60)
+        )
+        corpus = related.Corpus(rows)
+        for doc in range(len(corpus)):
+            scores = corpus.similarities(doc)
+            full = related._ranked(((corpus.ids[i], float(s)) for i, s in enumerate(scores.tolist())), 4)
+            self.assertEqual(corpus.neighbours(doc, 4), full)
+
+    def test_build_command_matches_incremental(self):
+        from artikel.models import RelatedArtikel
+        from django.core.management import call_command
+        from io import StringIO
+        before = list(RelatedArtikel.objects.order_by("artikel_id", "rank").values_list("artikel_id", "related_id"))
+        RelatedArtikel.objects.all().delete()
+        call_command("build_related_artikel", stdout=StringIO())
+        after = list(RelatedArtikel.objects.order_by("artikel_id", "rank").values_list("artikel_id", "related_id"))
+        self.assertEqual(before, after)
+
+    def test_detail_page_shows_related_with_single_lookup(self):
+        url = reverse("artikel:artikel_detail", args=[self.rinjani.id])
+        response = self.client.get(url)
+        self.assertContains(response, "Artikel Terkait")
+        self.assertEqual(response.context["related_artikels"][0], self.rinjani2)
+        with self.settings(ARTIKEL_VIEW_FLUSH_INTERVAL=10**9), self.assertNumQueries(2):  # artikel + daftar terkait
+            self.client.get(url)
+
+
+class ImportCsvTestCase(TestCase):
+    """Test command import_csv (streaming, batch, upsert)"""
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, name, rows, delimiter=";"):
+        import csv as csv_module
+        import os
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="latin-1", newline="") as f:
+            writer = csv_module.writer(f, delimiter=delimiter)
+            writer.writerow(["judul", "isi", "thumbnail", "source"])
+            writer.writerows(rows)
+        return path
+
+    def _import(self, *paths, **options):
+        from django.core.management import call_command
+        from io import StringIO
+        out = StringIO()
+        call_command("import_csv", *paths, stdout=out, skip_related=True, **options)
+        return out.getvalue()
+
+    def test_import_with_small_batches(self):
+        rows = [[f"Artikel {i}", f"Isi artikel {i};\nbaris kedua", "", "x"] for i in range(25)]
+        output = self._import(self._write("a.csv", rows), batch_size=4)
+        self.assertEqual(Artikel.objects.count(), 25)
+        self.assertIn("25 baru", output)
+        self.assertIn("baris/s", output)
+        self.assertEqual(Artikel.objects.get(title="Artikel 3").description, "Isi artikel 3;\nbaris kedua")
+
+    def test_reimport_is_noop(self):
+        path = self._write("a.csv", [["Gunung Gede", "Cibodas", "https://example.com/gede.jpg", ""]])
+        self._import(path)
+        before = Artikel.objects.get()
+        output = self._import(path)
+        self.assertEqual(Artikel.objects.count(), 1)
+        self.assertIn("0 baru, 0 diperbarui, 1 tidak berubah", output)
+        self.assertEqual(Artikel.objects.get().updated_at, before.updated_at)
+
+    def test_reimport_updates_changed_rows(self):
+        self._import(self._write("a.csv", [["Gunung Gede", "Cibodas", "", ""]]))
+        self._import(self._write("b.csv", [["Gunung  GEDE", "Via Gunung Putri", "", ""]]))
+        artikel = Artikel.objects.get()
+        self.assertEqual(artikel.description, "Via Gunung Putri")
+
+    def test_import_matches_artikel_without_key_by_title(self):
+        manual = Artikel.objects.create(title="Gunung Gede", description="Ditulis lewat form")
+        self.assertIsNone(manual.import_key)
+        self._import(self._write("a.csv", [["Gunung Gede", "Cibodas", "", ""]]))
+        artikel = Artikel.objects.get()
+        self.assertEqual(artikel.pk, manual.pk)
+        self.assertEqual(artikel.description, "Cibodas")
+        self.assertIsNotNone(artikel.import_key)
+
+    def test_failed_file_still_invalidates_written_batches(self):
+        from unittest import mock
+        from artikel import sampling
+        from artikel.management.commands import import_csv
+        rows = [[f"Artikel {i}", "isi", "", ""] for i in range(6)]
+        path = self._write("a.csv", rows)
+        real_upsert = import_csv.upsert_batch
+        calls = []
+
+        def flaky_upsert(batch):
+            calls.append(len(batch))
+            if len(calls) == 2:
+                raise RuntimeError("koneksi putus")
+            return real_upsert(batch)
+
+        with mock.patch.object(import_csv, "upsert_batch", flaky_upsert), \
+                mock.patch.object(sampling, "invalidate") as invalidate:
+            output = self._import(path, batch_size=3)
+        self.assertIn("Terjadi kesalahan", output)
+        self.assertIn("3 baru", output)
+        self.assertEqual(Artikel.objects.count(), 3)
+        invalidate.assert_called_once()
+
+    def test_multiple_files_and_delimiters(self):
+        a = self._write("a.csv", [["Gunung Salak", "Bogor", "", ""]], delimiter=",")
+        b = self._write("b.tsv", [["Gunung Ciremai", "Kuningan, Jawa Barat", "", ""]], delimiter="\t")
+        self._import(a, b)
+        self.assertEqual(Artikel.objects.get(title="Gunung Ciremai").description, "Kuningan, Jawa Barat")
+        self.assertTrue(Artikel.objects.filter(title="Gunung Salak").exists())
+
+    def test_imported_rows_are_searchable(self):
+        self._import(self._write("a.csv", [["Gunung Papandayan", "Kawah dan Tegal Alun", "", ""]]))
+        data = self.client.get(reverse("artikel:search_artikel"), {"q": "tegal alun"}).json()
+        self.assertEqual(len(data["results"]), 1)
+
+    def test_missing_file(self):
+        self.assertIn("File tidak ditemukan", self._import("/tidak/ada.csv"))
+
+    def test_bundled_csv(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command("import_csv", stdout=StringIO())
+        total = Artikel.objects.count()
+        self.assertGreater(total, 0)
+        call_command("import_csv", stdout=StringIO())
+        self.assertEqual(Artikel.objects.count(), total)
+
+
+class TrendingScoreTestCase(TestCase):
+    """Test skor trending dengan peluruhan waktu"""
+
+    def setUp(self):
+        view_counter.flush()
+        self.user = User.objects.create_user(username="penyuka", password="penyuka123")
+
+    def _artikel(self, title, hours_ago=0, **counters):
+        from datetime import timedelta
+        from django.utils import timezone
+        from artikel import trending
+        artikel = Artikel.objects.create(title=title, description="isi", **counters)
+        created_at = timezone.now() - timedelta(hours=hours_ago)
+        Artikel.objects.filter(pk=artikel.pk).update(created_at=created_at)
+        trending.refresh([artikel.pk])
+        artikel.refresh_from_db()
+        return artikel
+
+    def test_old_popular_artikel_decays(self):
+        from artikel import trending
+        old = self._artikel("Lama", hours_ago=24 * 7, like_count=100)
+        new = self._artikel("Baru", like_count=3)
+        self.assertGreater(new.trending_score, old.trending_score)
+
+        with self.settings(ARTIKEL_TRENDING_HALF_LIFE_HOURS=24 * 365):
+            trending.rebuild()
+        old.refresh_from_db()
+        new.refresh_from_db()
+        self.assertGreater(old.trending_score, new.trending_score)
+
+    def test_one_half_life_equals_double_points(self):
+        from artikel import trending
+        a = self._artikel("A", hours_ago=24, like_count=20)
+        b = self._artikel("B", like_count=10)
+        self.assertAlmostEqual(a.trending_score, b.trending_score, places=2)
+
+    def test_like_and_view_flush_refresh_score(self):
+        artikel = self._artikel("Gunung Arjuno")
+        before = artikel.trending_score
+
+        self.client.login(username="penyuka", password="penyuka123")
+        self.client.post(reverse("artikel:like_artikel", args=[artikel.id]))
+        artikel.refresh_from_db()
+        after_like = artikel.trending_score
+        self.assertGreater(after_like, before)
+
+        view_counter.record_view(artikel.pk, 20)
+        view_counter.flush()
+        artikel.refresh_from_db()
+        self.assertGreater(artikel.trending_score, after_like)
+
+    def test_hottest_reads_trending_index(self):
+        self._artikel("Lama", hours_ago=24 * 30, like_count=50)
+        fresh = self._artikel("Segar", like_count=2)
+        hottest = list(self.client.get(reverse("artikel:show_artikel")).context["hottest_artikels"])
+        self.assertEqual(hottest[0], fresh)
+
+    def test_new_artikel_gets_score(self):
+        artikel = Artikel.objects.create(title="Baru", description="isi")
+        artikel.refresh_from_db()
+        self.assertGreater(artikel.trending_score, 0)
+
+    def test_rebuild_trending_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+        artikel = self._artikel("Gunung Welirang")
+        Artikel.objects.filter(pk=artikel.pk).update(trending_score=0)
+        out = StringIO()
+        call_command("rebuild_trending", stdout=out)
+        artikel.refresh_from_db()
+        self.assertGreater(artikel.trending_score, 0)
+
+
+class ListArtikelJsonTestCase(TestCase):
+    """Test endpoint daftar artikel dengan keyset pagination"""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        now = timezone.now()
+        self.artikels = []
+        for i in range(7):
+            a = Artikel.objects.create(title=f"Artikel {i}", description="isi", image="https://example.com/a.jpg")
+            # views & like_count sengaja kembar supaya tiebreaker id ikut diuji
+            Artikel.objects.filter(pk=a.pk).update(
+                created_at=now - timedelta(minutes=i), views=i % 3, like_count=i % 2
+            )
+            self.artikels.append(a)
+        self.url = reverse("artikel:list_artikel_json")
+
+    def _walk(self, sort, limit):
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"sort": sort, "limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get(self.url, params).json()
+            ids += [r["id"] for r in data["results"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            self.assertEqual(data["has_more"], cursor is not None)
+            if not cursor:
+                return ids, pages
+
+    def test_latest_pages_cover_all_rows_in_order(self):
+        ids, pages = self._walk("latest", 3)
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, [str(a.id) for a in self.artikels])
+
+    def test_sorts_with_ties_have_no_duplicates(self):
+        for sort, field in (("popular", "views"), ("liked", "like_count")):
+            ids, _ = self._walk(sort, 2)
+            self.assertEqual(len(ids), 7)
+            self.assertEqual(len(set(ids)), 7)
+            expected = [str(pk) for pk in Artikel.objects.order_by(f"-{field}", "-id").values_list("id", flat=True)]
+            self.assertEqual(ids, expected)
+
+    def test_new_rows_do_not_shift_pages(self):
+        first = self.client.get(self.url, {"limit": 3}).json()
+        Artikel.objects.create(title="Artikel paling baru", description="isi")
+        second = self.client.get(self.url, {"limit": 3, "cursor": first["next_cursor"]}).json()
+        self.assertEqual(second["results"][0]["id"], str(self.artikels[3].id))
+
+    def test_page_is_single_query(self):
+        first = self.client.get(self.url, {"limit": 3}).json()
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"limit": 3, "cursor": first["next_cursor"]})
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url, {"cursor": "bukan-cursor"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"sort": "acak"}).status_code, 400)
+        self.assertEqual(self.client.post(self.url).status_code, 405)
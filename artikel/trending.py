@@ -0,0 +1,54 @@
+"""
+Skor trending artikel dengan peluruhan waktu (gaya Reddit "hot").
+
+    skor = log2(max(poin, 1)) + created_at_epoch / half_life
+    poin = like_count * LIKE_WEIGHT + views * VIEW_WEIGHT
+
+Artikel yang lebih baru satu half-life butuh poin setengahnya untuk
+menyamai artikel lama, jadi efeknya sama dengan meluruhkan poin secara
+eksponensial, tetapi skornya tidak berubah seiring waktu. Karena itu skor
+bisa disimpan di kolom ber-index dan cukup dihitung ulang untuk artikel
+yang counternya berubah (like di-toggle atau view di-flush).
+Mengubah half-life butuh `python manage.py rebuild_trending`.
+"""
+import math
+
+from django.conf import settings
+
+
+def _half_life_seconds():
+    return getattr(settings, "ARTIKEL_TRENDING_HALF_LIFE_HOURS", 24) * 3600
+
+
+def score(like_count, views, created_at):
+    points = (like_count * getattr(settings, "ARTIKEL_TRENDING_LIKE_WEIGHT", 5)
+              + views * getattr(settings, "ARTIKEL_TRENDING_VIEW_WEIGHT", 1))
+    return math.log2(max(points, 1)) + created_at.timestamp() / _half_life_seconds()
+
+
+def refresh(artikel_ids):
+    """Hitung ulang trending_score untuk artikel tertentu. Return jumlah baris."""
+    from artikel.models import Artikel
+
+    artikels = list(Artikel.objects.filter(pk__in=list(artikel_ids))
+                    .only("id", "like_count", "views", "created_at"))
+    for a in artikels:
+        a.trending_score = score(a.like_count, a.views, a.created_at)
+    Artikel.objects.bulk_update(artikels, ["trending_score"])
+    return len(artikels)
+
+
+def rebuild(batch_size=2000):
+    """Hitung ulang skor seluruh artikel secara batch. Return jumlah artikel."""
+    from artikel.models import Artikel
+
+    total, batch = 0, []
+    for a in Artikel.objects.only("id", "like_count", "views", "created_at").iterator(chunk_size=batch_size):
+        a.trending_score = score(a.like_count, a.views, a.created_at)
+        batch.append(a)
+        if len(batch) >= batch_size:
+            Artikel.objects.bulk_update(batch, ["trending_score"])
+            total += len(batch)
+            batch = []
+    Artikel.objects.bulk_update(batch, ["trending_score"])
+    return total + len(batch)
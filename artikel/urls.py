@@ -16,6 +16,8 @@ urlpatterns = [
     path('edit-artikel-modal/<uuid:id>/', edit_artikel_modal, name='edit_artikel_modal'),
     path('like-artikel/<uuid:id>/', views.like_artikel, name='like_artikel'),
     path("get-random-recommendations/", views.get_random_recommendations, name="get_random_recommendations"),
+    path("search/", views.search_artikel, name="search_artikel"),
+    path("api/list/", views.list_artikel_json, name="list_artikel_json"),
 ]
 
 if settings.DEBUG:
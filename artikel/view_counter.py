@@ -0,0 +1,148 @@
+"""
+Write-behind counter untuk jumlah view Artikel.
+
+Setiap hit di `artikel_detail` hanya menambah angka di buffer dalam proses
+(di-coalesce per artikel, tanpa query). Buffer di-flush ke database dengan
+satu `UPDATE ... SET views = views + n` per artikel ketika:
+  - total hit yang tertunda mencapai ARTIKEL_VIEW_FLUSH_THRESHOLD, atau
+  - timer di proses web berdetak setelah ARTIKEL_VIEW_FLUSH_INTERVAL detik, atau
+  - command `flush_artikel_views` meminta flush (timer tiap worker melihat
+    permintaan itu lewat versi bersama di cache), atau
+  - proses berhenti (atexit).
+
+Timer diaktifkan dari gundex/wsgi.py dan gundex/asgi.py lewat start_timer(),
+dan dibuat ulang di proses hasil fork pada hit pertamanya.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+
+from artikel import sections, trending
+from gundex.versioning import SharedVersion, check_interval
+
+logger = logging.getLogger(__name__)
+
+FLUSH_REQUEST_KEY = "artikel:views:flush"
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+_flush_request = SharedVersion(FLUSH_REQUEST_KEY)
+_timer_enabled = False
+_timer_pid = None
+
+
+def _threshold():
+    return getattr(settings, "ARTIKEL_VIEW_FLUSH_THRESHOLD", 100)
+
+
+def _interval():
+    return getattr(settings, "ARTIKEL_VIEW_FLUSH_INTERVAL", 10)
+
+
+def record_view(artikel_id, n=1):
+    """Catat `n` view untuk artikel; flush otomatis jika batas tercapai."""
+    if _timer_enabled and _timer_pid != os.getpid():
+        _start_thread()
+    with _lock:
+        _pending[artikel_id] += n
+        due = (
+            sum(_pending.values()) >= _threshold()
+            or time.monotonic() - _last_flush >= _interval()
+        )
+    if due:
+        flush()
+
+
+def pending_views(artikel_id=None):
+    """Jumlah view yang belum ditulis ke database (per artikel atau total)."""
+    with _lock:
+        if artikel_id is None:
+            return sum(_pending.values())
+        return _pending.get(artikel_id, 0)
+
+
+def flush():
+    """Tulis semua view yang tertunda ke database. Return jumlah artikel yang di-update."""
+    global _pending, _last_flush
+    from artikel.models import Artikel
+
+    # Tukar buffer di bawah lock supaya hit baru langsung masuk ke buffer kosong
+    with _lock:
+        batch, _pending = _pending, Counter()
+        _last_flush = time.monotonic()
+
+    if not batch:
+        return 0
+
+    written = []
+    try:
+        for artikel_id in list(batch):
+            Artikel.objects.filter(pk=artikel_id).update(views=F("views") + batch[artikel_id])
+            del batch[artikel_id]
+            written.append(artikel_id)
+        trending.refresh(written)
+    except Exception:
+        # Kembalikan sisa yang belum tertulis supaya tidak ada increment yang hilang
+        with _lock:
+            _pending.update(batch)
+        raise
+    finally:
+        if written:
+            sections.invalidate_counters()
+    return len(written)
+
+
+def request_flush():
+    """Minta semua worker mem-flush buffernya pada detak timer berikutnya."""
+    return _flush_request.bump()
+
+
+def start_timer():
+    """Aktifkan flush berkala di proses ini (dan di proses hasil fork-nya)."""
+    global _timer_enabled
+    _timer_enabled = True
+    _start_thread()
+
+
+def _start_thread():
+    global _timer_pid
+    with _lock:
+        if _timer_pid == os.getpid():
+            return
+        _timer_pid = os.getpid()
+    threading.Thread(target=_run_timer, name="artikel-view-flush", daemon=True).start()
+
+
+def _run_timer():
+    seen = _flush_request.get()
+    while True:
+        # detak secepat interval cek versi supaya permintaan flush tidak menunggu satu interval penuh
+        time.sleep(min(_interval(), check_interval()))
+        requested = _flush_request.get()
+        if requested == seen and time.monotonic() - _last_flush < _interval():
+            continue
+        seen = requested
+        try:
+            flush()
+        except Exception:
+            logger.exception("Flush view artikel gagal; dicoba lagi pada detak berikutnya")
+        finally:
+            connection.close()
+
+
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
@@ -5,10 +5,14 @@ from artikel.models import Artikel
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-import random as py_random
 from django.views.decorators.http import require_POST
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.templatetags.static import static
+from artikel import view_counter, sampling, sections, search, trending
+from gundex import serializers
+from gundex.pagination import paginate, InvalidCursor
+from main import thumbnails
 
 # =========================================================
 # 🔹 HALAMAN UTAMA ARTIKEL
@@ -16,22 +20,23 @@ from django.templatetags.static import static
 def show_artikel(request):
     latest_artikels = Artikel.objects.order_by('-created_at')[:5]
     popular_artikels = Artikel.objects.order_by('-views')[:9]
-    hottest_artikels = Artikel.objects.annotate(like_count=models.Count('likes')).order_by('-like_count', '-created_at')[:5]
-    recommended_artikels = list(Artikel.objects.all())
-    py_random.shuffle(recommended_artikels)
-    recommended_artikels = recommended_artikels[:7]
+    hottest_artikels = Artikel.objects.order_by('-trending_score')[:5]
+    recommended_artikels = sampling.random_artikels(7)
 
     is_admin = False
     if request.user.is_authenticated:
         # cek jika pakai userprofile atau fallback ke is_staff bawaan
         if hasattr(request.user, 'is_admin'):
             is_admin = request.user.is_admin
+    # latest/popular/hottest masih lazy; query hanya jalan bila fragmen
+    # {% cache %} di template belum ada (lihat artikel/sections.py)
     return render(request, 'full_artikel.html', {
         'latest_artikels': latest_artikels,
         'recommended_artikels': recommended_artikels,
         'popular_artikels': popular_artikels,
         'hottest_artikels': hottest_artikels,
         'is_admin': is_admin,
+        'sections': sections.context(),
     })
 
 
@@ -42,15 +47,92 @@ def index(request):
     return render(request, 'full_artikel.html')
 
 
+# =========================================================
+# 🔹 DAFTAR ARTIKEL (JSON, keyset pagination)
+# =========================================================
+LIST_SORTS = {
+    'latest': ('-created_at', '-id'),
+    'popular': ('-views', '-id'),
+    'liked': ('-like_count', '-id'),
+}
+
+
+def list_artikel_json(request):
+    """Daftar artikel per halaman dengan cursor opaque (untuk "muat lebih banyak")"""
+    if request.method != "GET":
+        return JsonResponse({"error": "Gunakan method GET"}, status=405)
+
+    sort = request.GET.get("sort", "latest")
+    if sort not in LIST_SORTS:
+        return JsonResponse({"error": f"sort harus salah satu dari: {', '.join(LIST_SORTS)}"}, status=400)
+    try:
+        limit = min(max(int(request.GET.get("limit", 12)), 1), 50)
+    except ValueError:
+        return JsonResponse({"error": "Parameter limit tidak valid"}, status=400)
+
+    queryset = Artikel.objects.only("id", "title", "image", "views", "like_count", "created_at")
+    try:
+        artikels, next_cursor = paginate(queryset, LIST_SORTS[sort], request.GET.get("cursor"), limit)
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    return JsonResponse({
+        "results": [
+            {
+                "id": str(a.id),
+                "title": a.title,
+                "image": a.image or static('image/no-artikel.png'),
+                "thumb": thumbnails.thumbnail_url(a.image, 320) or static('image/no-artikel.png'),
+                "image_srcset": thumbnails.srcset(a.image),
+                "views": a.views,
+                "like_count": a.like_count,
+                "created_at": a.created_at.isoformat(),
+            }
+            for a in artikels
+        ],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    })
+
+
+# =========================================================
+# 🔹 PENCARIAN ARTIKEL (JSON)
+# =========================================================
+def search_artikel(request):
+    """Full-text search artikel, hasil diurutkan berdasarkan relevansi"""
+    if request.method != "GET":
+        return JsonResponse({"error": "Gunakan method GET"}, status=405)
+
+    query = request.GET.get("q", "").strip()
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        per_page = min(max(int(request.GET.get("per_page", 10)), 1), 50)
+    except ValueError:
+        return JsonResponse({"error": "Parameter page/per_page tidak valid"}, status=400)
+
+    result = search.search(query, page=page, per_page=per_page)
+    return JsonResponse({
+        "query": query,
+        "page": page,
+        "results": result["results"],
+        "has_more": result["has_more"],
+    })
+
+
 # =========================================================
 # 🔹 DETAIL ARTIKEL
 # =========================================================
 def artikel_detail(request, id):
     artikel = get_object_or_404(Artikel, id=id)
-    artikel.views += 1
-    artikel.save(update_fields=['views'])
+    # view dicatat di buffer lalu di-flush berkala (lihat artikel/view_counter.py)
+    view_counter.record_view(artikel.pk)
+    # artikel terkait sudah dihitung sebelumnya (artikel/related.py), cukup satu lookup
+    related_links = (artikel.related_links
+                     .select_related('related')
+                     .only('rank', 'artikel', 'related__id', 'related__title', 'related__image'))
     return render(request, 'artikel_detail.html', {
         'artikel': artikel,
+        'related_artikels': [link.related for link in related_links],
         'is_admin': getattr(request.user, "is_admin", False),
     })
 
@@ -174,36 +256,43 @@ def edit_artikel_modal(request, id):
 def get_random_recommendations(request):
     """Return new random recommended artikels (AJAX refresh)"""
     if request.method == "GET":
-        artikels = list(Artikel.objects.all())
-        py_random.shuffle(artikels)
-        artikels = artikels[:6]  # ambil 6 acak
+        artikels = sampling.random_artikels(6)  # ambil 6 acak
         data = [
             {
                 "id": str(a.id),
                 "title": a.title,
                 "image": a.image or static('image/no-artikel.png'), 
+                "thumb": thumbnails.thumbnail_url(a.image, 160) or static('image/no-artikel.png'),
+                "image_srcset": thumbnails.srcset(a.image),
             }
             for a in artikels
         ]
-        return JsonResponse({"artikels": data})
+        return serializers.render(request, {"artikels": data}, rows_key="artikels")
     return JsonResponse({"error": "Gunakan method GET"}, status=405)
 
 @login_required
 @require_POST
 @csrf_exempt
 def like_artikel(request, id):
-    artikel = get_object_or_404(Artikel, pk=id)
     user = request.user
 
-    if artikel.likes.filter(id=user.id).exists():
-        artikel.likes.remove(user)
-        liked = False
-    else:
-        artikel.likes.add(user)
-        liked = True
+    # Toggle like + update like_count dalam satu transaksi; baris artikel di-lock
+    # supaya toggle yang bersamaan tidak membuat counter melenceng
+    with transaction.atomic():
+        artikel = get_object_or_404(Artikel.objects.select_for_update(), pk=id)
+        if artikel.likes.filter(id=user.id).exists():
+            artikel.likes.remove(user)
+            liked, delta = False, -1
+        else:
+            artikel.likes.add(user)
+            liked, delta = True, 1
+        Artikel.objects.filter(pk=artikel.pk).update(like_count=F('like_count') + delta)
+        artikel.refresh_from_db(fields=['like_count'])
+        trending.refresh([artikel.pk])
+    sections.invalidate_counters()
 
     return JsonResponse({
         "status": "success",
         "liked": liked,
-        "total_likes": artikel.total_likes()
+        "total_likes": artikel.like_count
     })
\ No newline at end of file
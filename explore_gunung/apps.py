@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ExploreGunungConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'explore_gunung'
+
+    def ready(self):
+        from explore_gunung import signals  # noqa: F401
@@ -0,0 +1,191 @@
+"""
+Index autocomplete nama gunung di memori proses.
+
+- Prefix: array terurut berisi nama ternormalisasi beserta setiap akhiran
+  yang dimulai di awal kata ("gunung semeru", "semeru"), dicari dengan
+  bisect. Provinsi ikut diindex dengan bobot lebih rendah.
+- Fuzzy: index trigram per kata nama. Kandidat yang berbagi trigram dengan
+  kata query diurutkan berdasarkan jumlah trigram yang sama, lalu dicek
+  dengan jarak edit (Damerau-Levenshtein terbatas), jadi "smeru" tetap
+  menemukan "Semeru".
+
+Index dibangun lazy dari snapshot katalog (explore_gunung/catalog.py) dan
+dibangun ulang hanya bila versi snapshot berubah.
+"""
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from explore_gunung import catalog
+
+# kata umum di depan nama gunung yang tidak membantu membedakan
+STOPWORDS = {"gunung", "gn", "g", "mount", "mt", "puncak"}
+MAX_PREFIX_SCAN = 500      # batas entri prefix yang diperiksa per query
+MAX_FUZZY_CANDIDATES = 64  # kandidat per kata yang dihitung jarak editnya
+
+# tingkatan skor (makin kecil makin relevan)
+NAME_START, WORD_START, PROVINSI, FUZZY = range(4)
+
+_lock = threading.Lock()
+_built = None  # (versi snapshot, AutocompleteIndex), dibaca & diganti sebagai satu pasangan
+
+
+def normalize(text):
+    """Huruf kecil tanpa diakritik; selain huruf/angka menjadi spasi."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c if c.isalnum() else " " for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit, prefix=False):
+    """
+    Jarak Damerau-Levenshtein (transposisi bersebelahan) antara `a` dan `b`,
+    atau antara `a` dan awalan terbaik dari `b` bila prefix=True. Hanya pita
+    |i - j| <= limit yang dihitung; hasil > limit dikembalikan sebagai limit + 1.
+    """
+    if prefix:
+        b = b[:len(a) + limit]
+    elif abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    prev2, prev = None, [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len(b) + 1)
+        if i <= limit:
+            cur[0] = i
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+        if min(cur[lo - 1:hi + 1]) > limit:
+            return over
+        prev2, prev = prev, cur
+    if prefix:
+        result = min(prev[max(0, len(a) - limit):])
+    else:
+        result = prev[-1]
+    return min(result, over)
+
+
+def max_typos(token):
+    return 0 if len(token) < 3 else 1 if len(token) <= 5 else 2
+
+
+class AutocompleteIndex:
+    def __init__(self, rows):
+        """rows: iterable of (id, nama, provinsi, ketinggian)."""
+        self.entries = []
+        keys = []
+        self.words = []                       # (kata, indeks entri)
+        self.grams = defaultdict(list)        # trigram -> indeks di self.words
+        for pk, nama, provinsi, ketinggian in rows:
+            idx = len(self.entries)
+            self.entries.append({"id": str(pk), "nama": nama, "provinsi": provinsi, "ketinggian": ketinggian})
+            name = normalize(nama)
+            tokens = name.split()
+            for pos in range(len(tokens)):
+                keys.append((" ".join(tokens[pos:]), NAME_START if pos == 0 else WORD_START, idx))
+            for token in tokens:
+                if token in STOPWORDS:
+                    continue
+                w = len(self.words)
+                self.words.append((token, idx))
+                for g in trigrams(token):
+                    self.grams[g].append(w)
+            keys.append((normalize(provinsi), PROVINSI, idx))
+        keys.sort()
+        self.keys = [k for k, _, _ in keys]
+        self.owners = [(tier, idx) for _, tier, idx in keys]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _rank(self, idx):
+        entry = self.entries[idx]
+        return len(entry["nama"]), entry["nama"]
+
+    def prefix(self, query):
+        """{indeks entri: tier} untuk entri yang nama/kata/provinsinya diawali `query`."""
+        found = {}
+        i = bisect_left(self.keys, query)
+        end = min(len(self.keys), i + MAX_PREFIX_SCAN)
+        while i < end and self.keys[i].startswith(query):
+            tier, idx = self.owners[i]
+            if tier < found.get(idx, FUZZY):
+                found[idx] = tier
+            i += 1
+        return found
+
+    def _fuzzy_token(self, token, is_last):
+        """{indeks entri: jarak edit terkecil} untuk satu kata query."""
+        limit = max_typos(token)
+        if not limit:
+            return {}
+        shared = Counter()
+        for g in trigrams(token):
+            shared.update(self.grams.get(g, ()))
+        best = {}
+        for w, _ in heapq.nlargest(MAX_FUZZY_CANDIDATES, shared.items(), key=lambda item: item[1]):
+            word, idx = self.words[w]
+            # kata terakhir mungkin belum selesai diketik: cocokkan dengan awalan kata
+            dist = edit_distance(token, word, limit, prefix=is_last)
+            if dist <= limit and dist < best.get(idx, limit + 1):
+                best[idx] = dist
+        return best
+
+    def fuzzy(self, query):
+        """{indeks entri: total jarak edit}; semua kata query (selain stopword) harus cocok."""
+        tokens = [t for t in query.split() if t not in STOPWORDS]
+        result = None
+        for pos, token in enumerate(tokens):
+            matches = self._fuzzy_token(token, pos == len(tokens) - 1)
+            if result is None:
+                result = matches
+            else:
+                result = {idx: result[idx] + d for idx, d in matches.items() if idx in result}
+            if not result:
+                return {}
+        return result or {}
+
+    def suggest(self, query, k=8):
+        query = normalize(query)
+        if not query or not self.entries:
+            return []
+        scored = {idx: (tier, 0) for idx, tier in self.prefix(query).items()}
+        if len(scored) < k:
+            for idx, dist in self.fuzzy(query).items():
+                scored.setdefault(idx, (FUZZY, dist))
+        best = heapq.nsmallest(k, scored.items(), key=lambda item: (item[1], self._rank(item[0])))
+        return [
+            {**self.entries[idx], "match": "fuzzy" if tier == FUZZY else "prefix"}
+            for idx, (tier, _) in best
+        ]
+
+
+def get_index():
+    """Index milik proses ini; dibangun ulang bila snapshot katalog berganti versi."""
+    global _built
+    snapshot = catalog.get()
+    built = _built
+    if built is None or built[0] != snapshot.version:
+        with _lock:
+            built = _built
+            if built is None or built[0] != snapshot.version:
+                built = _built = (snapshot.version, AutocompleteIndex(
+                    (r.id, r.nama, r.provinsi, r.ketinggian) for r in snapshot.rows
+                ))
+    return built[1]
+
+
+def suggest(query, k=8):
+    return get_index().suggest(query, k)
+
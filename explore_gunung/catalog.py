@@ -0,0 +1,328 @@
+"""
+Snapshot katalog Gunung di memori proses.
+
+Katalog kecil (~160 baris), sering dibaca dan jarang ditulis, jadi setiap
+worker menyimpan seluruh isinya sebagai tuple ringkas beserta JSON tiap baris
+yang sudah di-encode, urutan per sort, dan JSON halaman default yang sudah
+jadi. show_json/get_gunung_json cukup merangkai bytes tanpa query database.
+Hitungan facet (provinsi x rentang ketinggian) juga dihitung sekali per
+snapshot sebagai matriks. Statistik pendakian (logpendakian.GunungStats)
+tidak termasuk snapshot: get() menggabungkan snapshot dengan peta statistik
+(logpendakian.stats.current(), versi terpisah) dan hanya menyusun ulang
+bagian yang bergantung padanya (JSON baris, sort populer, halaman jadi)
+bila versi statistik berubah. Snapshot hasil gabungan tetap memakai versi
+katalog, jadi autocomplete/geo/cluster tidak dibangun ulang karena log baru.
+
+Versi snapshot disimpan di cache bersama (VERSION_CACHE_KEY, lewat
+gundex/versioning.py; CACHES harus di-share antar worker). Setiap
+perubahan Gunung (signal post_save/post_delete, termasuk dari edit_gunung dan
+delete_gunung) serta import_gunung_data menaikkan versi lewat invalidate();
+worker memuat ulang snapshot hanya bila versinya berbeda dengan miliknya,
+dan memeriksa versi tersebut paling sering sekali per
+SHARED_VERSION_CHECK_INTERVAL detik.
+"""
+import copy
+import json
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import islice
+
+from django.db import transaction
+
+from gundex.versioning import SharedVersion
+
+from logpendakian import stats as gunung_stats
+from main import thumbnails
+
+VERSION_CACHE_KEY = "gunung:catalog:version"
+_version = SharedVersion(VERSION_CACHE_KEY)
+DEFAULT_LIMIT = 6  # ukuran halaman explore; halamannya di-encode sekali per snapshot
+BATCH_LIMIT = 300  # id maksimum per permintaan batch
+
+# urutan yang didukung; field terakhir (id) membuat urutan stabil untuk cursor
+SORTS = {
+    "nama": ("nama", "id"),
+    "ketinggian": ("-ketinggian", "id"),
+    "populer": ("-stats__total_logs", "nama", "id"),
+}
+
+# rentang ketinggian untuk facet: (min, max) mdpl, max inklusif, None = tanpa batas
+HEIGHT_BANDS = ((0, 999), (1000, 1999), (2000, 2999), (3000, None))
+
+Row = namedtuple("Row", "id nama ketinggian provinsi foto deskripsi "
+                         "latitude longitude basecamp_latitude basecamp_longitude")
+
+
+class Filters(namedtuple("Filters", "query provinsi min_ketinggian max_ketinggian")):
+    """Filter explore: teks bebas, himpunan provinsi (OR), dan batas ketinggian (inklusif)."""
+
+    def __new__(cls, query="", provinsi=(), min_ketinggian=None, max_ketinggian=None):
+        return super().__new__(cls, (query or "").lower(), frozenset(provinsi), min_ketinggian, max_ketinggian)
+
+    @property
+    def empty(self):
+        return not self.query and not self.provinsi and self.min_ketinggian is None and self.max_ketinggian is None
+
+    def height_ok(self, ketinggian):
+        return ((self.min_ketinggian is None or ketinggian >= self.min_ketinggian)
+                and (self.max_ketinggian is None or ketinggian <= self.max_ketinggian))
+
+    def bands(self):
+        """Indeks HEIGHT_BANDS yang persis menutup batas ketinggian, atau None bila tidak sejajar."""
+        low = self.min_ketinggian or 0
+        if low not in {lo for lo, _ in HEIGHT_BANDS}:
+            return None
+        if self.max_ketinggian is not None and self.max_ketinggian not in {hi for _, hi in HEIGHT_BANDS}:
+            return None
+        return [
+            b for b, (lo, hi) in enumerate(HEIGHT_BANDS)
+            if lo >= low and (self.max_ketinggian is None or (hi is not None and hi <= self.max_ketinggian))
+        ]
+
+
+NO_FILTERS = Filters()
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def sort_key(fields, values):
+    return tuple(-v if name.startswith("-") else v for name, v in zip(fields, values))
+
+
+def band_of(ketinggian):
+    for b, (_, hi) in enumerate(HEIGHT_BANDS):
+        if hi is None or ketinggian <= hi:
+            return b
+
+
+# kunci JSON setiap baris (untuk pemilihan field di endpoint batch)
+ROW_FIELDS = ("id", "nama", "ketinggian", "foto", "foto_thumb", "foto_srcset", "provinsi", "deskripsi",
+              "latitude", "longitude", "basecamp_latitude", "basecamp_longitude", "stats")
+
+
+def row_dict(row, stats=None):
+    return {
+        "id": str(row.id),
+        "nama": row.nama,
+        "ketinggian": row.ketinggian,
+        "foto": row.foto,
+        "foto_thumb": thumbnails.thumbnail_url(row.foto, 320),
+        "foto_srcset": thumbnails.srcset(row.foto),
+        "provinsi": row.provinsi,
+        "deskripsi": row.deskripsi,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "basecamp_latitude": row.basecamp_latitude,
+        "basecamp_longitude": row.basecamp_longitude,
+        "stats": stats,
+    }
+
+
+class Snapshot:
+    def __init__(self, version, rows, stats):
+        self.version = version
+        self.rows = tuple(rows)
+        self.by_id = {str(row.id): i for i, row in enumerate(self.rows)}
+        self.base_data = tuple(row_dict(row) for row in self.rows)
+        self.search_text = tuple(f"{row.nama}\x00{row.provinsi}".lower() for row in self.rows)
+
+        # facet: provinsi terurut, provinsi & band per baris, matriks hitungan provinsi x band
+        self.provinsi = sorted({row.provinsi for row in self.rows})
+        position = {name: p for p, name in enumerate(self.provinsi)}
+        self.row_provinsi = tuple(position[row.provinsi] for row in self.rows)
+        self.row_band = tuple(band_of(row.ketinggian) for row in self.rows)
+        self.facet_matrix = [[0] * len(HEIGHT_BANDS) for _ in self.provinsi]
+        for p, b in zip(self.row_provinsi, self.row_band):
+            self.facet_matrix[p][b] += 1
+        self.facets_json = json.dumps(self.facets(NO_FILTERS), separators=(",", ":")).encode()
+
+        self.orders, self.keys = {}, {}
+        self._attach(stats)
+
+    def with_stats(self, stats):
+        """Salinan snapshot dengan peta statistik lain; data katalog dipakai bersama."""
+        view = copy.copy(self)
+        view.orders, view.keys = dict(self.orders), dict(self.keys)
+        view._attach(stats)
+        return view
+
+    def _attach(self, stats):
+        # bagian yang bergantung pada statistik: JSON baris, urutan sort yang memakai stats__*, halaman jadi
+        self.stats = stats
+        self.row_data = tuple({**data, "stats": stats.get(row.id)} for row, data in zip(self.rows, self.base_data))
+        self.row_json = tuple(json.dumps(data, separators=(",", ":")).encode() for data in self.row_data)
+        self.pages = {}
+        for sort, fields in SORTS.items():
+            if sort not in self.orders or any(name.lstrip("-").startswith("stats__") for name in fields):
+                order = sorted(range(len(self.rows)), key=lambda i: sort_key(fields, self.values(i, fields)))
+                self.orders[sort] = tuple(order)
+                self.keys[sort] = [sort_key(fields, self.values(i, fields)) for i in order]
+            order = self.orders[sort]
+            for start in range(0, len(order), DEFAULT_LIMIT):
+                self.pages[sort, start] = self.join(order[start:start + DEFAULT_LIMIT])
+
+    def values(self, i, fields):
+        """Nilai field sort untuk baris `i`; "stats__total_logs" dibaca dari peta statistik."""
+        values = []
+        for name in fields:
+            name = name.lstrip("-")
+            if name.startswith("stats__"):
+                values.append(self.stats.get(self.rows[i].id)[name[len("stats__"):]])
+            else:
+                values.append(getattr(self.rows[i], name))
+        return values
+
+    def __len__(self):
+        return len(self.rows)
+
+    def join(self, indices):
+        return b",".join(self.row_json[i] for i in indices)
+
+    def get(self, pk):
+        """Baris untuk id (string), atau None."""
+        i = self.by_id.get(str(pk))
+        return None if i is None else self.rows[i]
+
+    def get_json(self, pk):
+        i = self.by_id.get(str(pk))
+        return None if i is None else self.row_json[i]
+
+    def get_many(self, ids, fields=None):
+        """
+        Beberapa baris sekaligus sesuai urutan `ids` (duplikat diabaikan).
+        `fields`: subset kunci JSON baris ("id" selalu ikut), None = semua.
+        Return (bytes isi array, list id yang tidak ditemukan).
+        """
+        found, missing, seen = [], [], set()
+        for pk in ids:
+            key = str(pk).lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            i = self.by_id.get(key)
+            if i is None:
+                missing.append(str(pk))
+            elif fields is None:
+                found.append(self.row_json[i])
+            else:
+                data = self.row_data[i]
+                found.append(json.dumps({name: data[name] for name in ("id", *fields)},
+                                        separators=(",", ":")).encode())
+        return b",".join(found), missing
+
+    def matches(self, i, filters, provinsi=True, height=True):
+        """Apakah baris `i` lolos `filters` (filter provinsi/ketinggian bisa diabaikan untuk facet)."""
+        return ((not filters.query or filters.query in self.search_text[i])
+                and (not provinsi or not filters.provinsi or self.rows[i].provinsi in filters.provinsi)
+                and (not height or filters.height_ok(self.rows[i].ketinggian)))
+
+    def facets(self, filters):
+        """
+        Hitungan per provinsi (dengan filter selain provinsi) dan per rentang
+        ketinggian (dengan filter selain ketinggian). Tanpa `query` dan dengan
+        batas ketinggian yang sejajar HEIGHT_BANDS, cukup menjumlah matriks.
+        """
+        bands = filters.bands() if not filters.query else None
+        if bands is not None:
+            selected = [p for p, name in enumerate(self.provinsi)
+                        if not filters.provinsi or name in filters.provinsi]
+            provinsi_counts = [sum(row[b] for b in bands) for row in self.facet_matrix]
+            band_counts = [sum(self.facet_matrix[p][b] for p in selected) for b in range(len(HEIGHT_BANDS))]
+        else:
+            provinsi_counts = [0] * len(self.provinsi)
+            band_counts = [0] * len(HEIGHT_BANDS)
+            for i in range(len(self.rows)):
+                if self.matches(i, filters, provinsi=False):
+                    provinsi_counts[self.row_provinsi[i]] += 1
+                if self.matches(i, filters, height=False):
+                    band_counts[self.row_band[i]] += 1
+        return {
+            "provinsi": [{"value": name, "count": c} for name, c in zip(self.provinsi, provinsi_counts)],
+            "ketinggian": [{"min": lo, "max": hi, "count": c} for (lo, hi), c in zip(HEIGHT_BANDS, band_counts)],
+        }
+
+    def facets_bytes(self, filters):
+        if filters.empty:
+            return self.facets_json
+        return json.dumps(self.facets(filters), separators=(",", ":")).encode()
+
+    def select(self, sort="nama", filters=NO_FILTERS, after=None, offset=0, limit=DEFAULT_LIMIT):
+        """
+        Indeks baris satu halaman katalog: baris setelah nilai cursor `after`
+        (list nilai field SORTS[sort], sudah di-decode) atau mulai dari
+        `offset`, yang lolos `filters`.
+
+        Return (list indeks baris, posisi awal di urutan bila tanpa filter
+        atau None, next_cursor_values).
+        """
+        fields = SORTS[sort]
+        order = self.orders[sort]
+        pos = bisect_right(self.keys[sort], sort_key(fields, after)) if after is not None else 0
+
+        if not filters.empty:
+            matches = (i for i in order[pos:] if self.matches(i, filters))
+            picked = list(islice(matches, offset, offset + limit + 1))
+            start = None
+        else:
+            start = pos + offset
+            picked = order[start:start + limit + 1]
+
+        rows = picked[:limit]
+        next_values = self.values(rows[-1], fields) if len(picked) > limit else None
+        return rows, start, next_values
+
+    def page(self, sort="nama", filters=NO_FILTERS, after=None, offset=0, limit=DEFAULT_LIMIT):
+        """
+        Seperti select(), tetapi isi halaman sudah berupa JSON.
+        Return (bytes isi array results, jumlah baris, next_cursor_values).
+        """
+        rows, start, next_values = self.select(sort, filters, after, offset, limit)
+        body = self.pages.get((sort, start)) if start is not None and limit == DEFAULT_LIMIT else None
+        if body is None:
+            body = self.join(rows)
+        return body, len(rows), next_values
+
+
+def _load(version, stats):
+    from explore_gunung.models import Gunung
+
+    rows = Gunung.objects.values_list("id", "nama", "ketinggian", "provinsi", "foto", "deksripsi",
+                                      "latitude", "longitude", "basecamp_latitude", "basecamp_longitude")
+    return Snapshot(version, (Row(*values) for values in rows), stats)
+
+
+def current_version():
+    return _version.get()
+
+
+def get():
+    """
+    Snapshot milik proses ini; dimuat ulang bila versi katalog di cache sudah
+    berubah, atau hanya digabung ulang dengan statistik bila versi statistik
+    yang berubah.
+    """
+    global _snapshot
+    version = current_version()
+    stats = gunung_stats.current()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version and snapshot.stats is stats:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _load(version, stats)
+        elif _snapshot.stats is not stats:
+            _snapshot = _snapshot.with_stats(stats)
+        return _snapshot
+
+
+def invalidate(on_commit=False):
+    """
+    Tandai snapshot usang di semua worker. on_commit=True: sekali lagi setelah
+    transaksi commit, supaya worker yang sempat memuat ulang sebelum commit
+    tidak tertinggal dengan data lama.
+    """
+    _version.bump()
+    if on_commit:
+        transaction.on_commit(invalidate)
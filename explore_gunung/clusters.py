@@ -0,0 +1,139 @@
+"""
+Clustering marker peta di sisi server.
+
+Koordinat gunung diproyeksikan ke Web Mercator [0, 1) lalu dikelompokkan
+dengan quadtree: cluster pada zoom z adalah node quadtree pada kedalaman
+z + CELL_DEPTH (sel kira-kira CELL_PX piksel di layar). Level paling halus
+dibangun dari titik, level di atasnya dengan menggabungkan empat anak
+(jumlah & centroid berbobot), jadi seluruh level dihitung sekali per versi
+snapshot katalog (explore_gunung/catalog.py) dan ikut dibangun ulang saat
+katalog berubah (edit_gunung, import_gunung_data, dsb).
+
+Query per bounding box hanya membaca cluster di level zoom tersebut yang
+kolom selnya masuk rentang (bisect), bukan seluruh katalog.
+"""
+import math
+import threading
+from bisect import bisect_left, bisect_right
+
+from explore_gunung import catalog
+
+MAX_ZOOM = 16
+CELL_DEPTH = 2           # sel = 256 / 2**CELL_DEPTH = 64 piksel per tile
+MAX_LATITUDE = 85.05112878
+
+_lock = threading.Lock()
+_built = None  # (versi snapshot, level cluster), dibaca & diganti sebagai satu pasangan
+
+
+def project(latitude, longitude):
+    """(lat, lon) -> (x, y) Web Mercator dalam [0, 1)."""
+    lat = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude)))
+    x = (longitude + 180) / 360
+    y = (1 - math.log(math.tan(lat) + 1 / math.cos(lat)) / math.pi) / 2
+    return min(max(x, 0.0), 1 - 1e-12), min(max(y, 0.0), 1 - 1e-12)
+
+
+def unproject(x, y):
+    longitude = x * 360 - 180
+    latitude = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return latitude, longitude
+
+
+class Level:
+    """Cluster satu level zoom, terurut per (kolom, baris) sel."""
+
+    def __init__(self, zoom, nodes):
+        self.zoom = zoom
+        self.cells = sorted(nodes)
+        self.columns = [cell[0] for cell in self.cells]
+        self.nodes = [nodes[cell] for cell in self.cells]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def query(self, x0, y0, x1, y1):
+        """Node yang centroidnya berada di kotak [x0, x1] x [y0, y1] (koordinat ter-normalisasi)."""
+        scale = 1 << (self.zoom + CELL_DEPTH)
+        lo = bisect_left(self.columns, int(x0 * scale))
+        hi = bisect_right(self.columns, int(x1 * scale))
+        return [node for node in self.nodes[lo:hi]
+                if x0 <= node["x"] <= x1 and y0 <= node["y"] <= y1]
+
+
+def build(points, max_zoom=MAX_ZOOM):
+    """
+    points: iterable of (lat, lon, indeks baris). Return list Level untuk
+    zoom 0..max_zoom. Node: x, y (centroid), count, row (bila count == 1),
+    expansion_zoom (zoom pertama di mana cluster ini terpecah).
+    """
+    depth = max_zoom + CELL_DEPTH
+    scale = 1 << depth
+    nodes = {}
+    for lat, lon, row in points:
+        x, y = project(lat, lon)
+        cell = (int(x * scale), int(y * scale))
+        node = nodes.get(cell)
+        if node is None:
+            nodes[cell] = {"x": x, "y": y, "count": 1, "row": row, "children": 0,
+                           "expansion_zoom": None}
+        else:
+            # titik berhimpit di level terhalus: gabungkan
+            total = node["count"] + 1
+            node["x"] += (x - node["x"]) / total
+            node["y"] += (y - node["y"]) / total
+            node["count"], node["row"] = total, None
+
+    levels = [Level(max_zoom, nodes)]
+    for zoom in range(max_zoom - 1, -1, -1):
+        parents = {}
+        for (cx, cy), child in nodes.items():
+            cell = (cx >> 1, cy >> 1)
+            parent = parents.get(cell)
+            if parent is None:
+                parents[cell] = {**child, "children": 1,
+                                 "expansion_zoom": child["expansion_zoom"]}
+            else:
+                total = parent["count"] + child["count"]
+                parent["x"] = (parent["x"] * parent["count"] + child["x"] * child["count"]) / total
+                parent["y"] = (parent["y"] * parent["count"] + child["y"] * child["count"]) / total
+                parent["count"], parent["row"] = total, None
+                parent["children"] += 1
+                parent["expansion_zoom"] = zoom + 1
+        nodes = parents
+        levels.append(Level(zoom, nodes))
+    levels.reverse()
+    return levels
+
+
+def get_levels():
+    """Level cluster milik proses ini; dibangun ulang bila snapshot katalog berganti versi."""
+    global _built
+    snapshot = catalog.get()
+    built = _built
+    if built is None or built[0] != snapshot.version:
+        with _lock:
+            built = _built
+            if built is None or built[0] != snapshot.version:
+                built = _built = (snapshot.version, build(
+                    (row.latitude, row.longitude, i)
+                    for i, row in enumerate(snapshot.rows)
+                    if row.latitude is not None and row.longitude is not None
+                ))
+    return snapshot, built[1]
+
+
+def clusters(west, south, east, north, zoom):
+    """
+    Cluster untuk bounding box (derajat) pada `zoom`. Bila west > east,
+    kotak dianggap melintasi garis bujur 180°. Return (snapshot, list node).
+    """
+    snapshot, levels = get_levels()
+    level = levels[max(0, min(MAX_ZOOM, zoom))]
+    x0, y1 = project(south, west)
+    x1, y0 = project(north, east)
+    if west <= east:
+        found = level.query(x0, y0, x1, y1)
+    else:
+        found = level.query(x0, y0, 1.0, y1) + level.query(0.0, y0, x1, y1)
+    return snapshot, found
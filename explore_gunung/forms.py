@@ -13,4 +13,5 @@ class GunungForm(ModelForm):
     
     class Meta:
         model = Gunung
-        fields = ["nama", "ketinggian", "provinsi", "foto", "deksripsi"]
\ No newline at end of file
+        fields = ["nama", "ketinggian", "provinsi", "foto", "deksripsi",
+                  "latitude", "longitude", "basecamp_latitude", "basecamp_longitude"]
\ No newline at end of file
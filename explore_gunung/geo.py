@@ -0,0 +1,145 @@
+"""
+Query geospasial "gunung terdekat" di atas snapshot katalog.
+
+Koordinat (lat, lon) diubah menjadi vektor satuan 3D sehingga jarak lurus
+(chord) antar titik naik monoton terhadap jarak great-circle, dan KD-tree
+3D biasa bisa dipakai tanpa masalah di garis bujur 180° atau kutub.
+k-nearest dan radius query memangkas subtree yang bidang pemisahnya lebih
+jauh dari kandidat terburuk, jadi rata-rata sub-linear.
+
+Tree dibangun lazy per versi snapshot (explore_gunung/catalog.py); gunung
+tanpa koordinat dilewati.
+"""
+import heapq
+import math
+import threading
+
+from explore_gunung import catalog
+
+EARTH_RADIUS_KM = 6371.0088
+
+_lock = threading.Lock()
+_built = None  # (versi snapshot, KDTree), dibaca & diganti sebagai satu pasangan
+
+
+def to_xyz(latitude, longitude):
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def _dist2(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class KDTree:
+    """KD-tree 3D statis. Node: (titik, payload, axis, kiri, kanan)."""
+
+    def __init__(self, points):
+        """points: list of (xyz, payload)."""
+        self.size = len(points)
+        self.root = self._build(list(points), 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        xyz, payload = points[mid]
+        return (xyz, payload, axis,
+                self._build(points[:mid], depth + 1),
+                self._build(points[mid + 1:], depth + 1))
+
+    def nearest(self, target, k, exclude=None):
+        """k titik terdekat: list of (chord, payload), urut dari yang terdekat."""
+        heap = []  # max-heap via jarak negatif
+
+        def visit(node):
+            if node is None:
+                return
+            xyz, payload, axis, left, right = node
+            if payload != exclude:
+                d2 = _dist2(xyz, target)
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d2, payload))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, payload))
+            diff = target[axis] - xyz[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        if k > 0:
+            visit(self.root)
+        return [(math.sqrt(-d2), payload) for d2, payload in sorted(heap, reverse=True)]
+
+    def within(self, target, chord, exclude=None):
+        """Semua titik dengan jarak chord <= `chord`, urut dari yang terdekat."""
+        limit = chord * chord
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            xyz, payload, axis, left, right = node
+            if payload != exclude:
+                d2 = _dist2(xyz, target)
+                if d2 <= limit:
+                    found.append((math.sqrt(d2), payload))
+            diff = target[axis] - xyz[axis]
+            stack.append(left if diff < 0 else right)
+            if diff * diff <= limit:
+                stack.append(right if diff < 0 else left)
+        found.sort()
+        return found
+
+
+def get_tree():
+    """KD-tree milik proses ini (payload = indeks baris snapshot)."""
+    global _built
+    snapshot = catalog.get()
+    built = _built
+    if built is None or built[0] != snapshot.version:
+        with _lock:
+            built = _built
+            if built is None or built[0] != snapshot.version:
+                built = _built = (snapshot.version, KDTree([
+                    (to_xyz(row.latitude, row.longitude), i)
+                    for i, row in enumerate(snapshot.rows)
+                    if row.latitude is not None and row.longitude is not None
+                ]))
+    return snapshot, built[1]
+
+
+def nearby(latitude=None, longitude=None, gunung_id=None, k=5, radius_km=None):
+    """
+    Gunung terdekat dari sebuah titik atau dari gunung lain (`gunung_id`,
+    dirinya sendiri tidak ikut). Dengan `radius_km` hanya yang berada dalam
+    radius itu (maksimal k). Return (snapshot, [(jarak_km, indeks baris)]);
+    list kosong bila gunung_id tidak dikenal atau tidak punya koordinat.
+    """
+    snapshot, tree = get_tree()
+    exclude = None
+    if gunung_id is not None:
+        exclude = snapshot.by_id.get(str(gunung_id))
+        row = snapshot.rows[exclude] if exclude is not None else None
+        if row is None or row.latitude is None or row.longitude is None:
+            return snapshot, []
+        latitude, longitude = row.latitude, row.longitude
+
+    target = to_xyz(latitude, longitude)
+    if radius_km is not None:
+        hits = tree.within(target, km_to_chord(radius_km), exclude)[:k]
+    else:
+        hits = tree.nearest(target, k, exclude)
+    return snapshot, [(chord_to_km(chord), i) for chord, i in hits]
@@ -0,0 +1,60 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from explore_gunung import catalog
+from gundex import serializers
+
+PROVINSI = ["Jawa Barat", "Jawa Tengah", "Jawa Timur", "Bali", "NTB", "Sumatera Barat", "Sulawesi Selatan"]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ukuran payload & waktu encode format json/columnar/msgpack pada N baris katalog sintetis'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        self.stdout.write(f'{"baris":>7}  {"format":<9}{"bytes":>12}{"rasio":>8}{"encode (ms)":>14}')
+        for count in options['rows']:
+            rows = [catalog.row_dict(self._row(rng, n), self._stats(rng)) for n in range(count)]
+            payload = {'results': rows, 'has_more': False, 'next_cursor': None}
+            baseline = None
+            for fmt in serializers.FORMATS:
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    body = serializers.encode(payload, fmt)
+                    timings.append((time.perf_counter() - start) * 1000)
+                baseline = baseline or len(body)
+                self.stdout.write(f'{count:>7}  {fmt:<9}{len(body):>12,}{len(body) / baseline:>8.2f}{statistics.median(timings):>14.2f}')
+
+    @staticmethod
+    def _row(rng, n):
+        has_coordinates = rng.random() < 0.7
+        return catalog.Row(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            nama=f"Gunung Sintetis {n}",
+            ketinggian=rng.randint(500, 3800),
+            provinsi=rng.choice(PROVINSI),
+            foto=f"https://example.com/foto/{n}.jpg" if rng.random() < 0.8 else "",
+            deskripsi="Jalur pendakian melewati hutan lumut dan savana. " * rng.randint(1, 6),
+            latitude=rng.uniform(-10, 5) if has_coordinates else None,
+            longitude=rng.uniform(95, 140) if has_coordinates else None,
+            basecamp_latitude=None,
+            basecamp_longitude=None,
+        )
+
+    @staticmethod
+    def _stats(rng):
+        return {
+            "total_logs": rng.randint(0, 200),
+            "summit_rate": round(rng.random(), 2),
+            "avg_rating": round(rng.uniform(1, 5), 2),
+            "avg_team_size": None,
+            "avg_duration_days": round(rng.uniform(1, 4), 2),
+        }
@@ -1,25 +1,128 @@
 import csv
+import hashlib
 import os
+import time
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import ProtectedError
 from explore_gunung.models import Gunung
+from explore_gunung import catalog
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 CSV_PATH = os.path.join(BASE_DIR, 'MastersheetsGunung-Sheet1.csv')
 
+# Kolom koordinat bersifat opsional; baris tanpa nilai dibiarkan kosong (None)
+COORDINATE_COLUMNS = {
+    'latitude': 'Latitude',
+    'longitude': 'Longitude',
+    'basecamp_latitude': 'Basecamp Latitude',
+    'basecamp_longitude': 'Basecamp Longitude',
+}
+BASE_FIELDS = ['nama', 'provinsi', 'ketinggian', 'deksripsi', 'foto']
+
+
+def parse_coordinate(value):
+    value = (value or '').strip().replace(',', '.')
+    if not value or value.lower() == 'nan':
+        return None
+    return float(value)
+
+
+def natural_key(nama, provinsi):
+    """Kunci alami gunung: nama + provinsi, tanpa beda huruf besar/spasi."""
+    return (' '.join((nama or '').split()).casefold(), ' '.join((provinsi or '').split()).casefold())
+
+
+def content_hash(values, fields):
+    raw = '\x1f'.join('' if values[f] is None else str(values[f]) for f in fields)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def read_sheet(path):
+    """
+    Baca CSV menjadi {natural_key: dict field}. Return (rows, fields, warnings);
+    `fields` hanya memuat kolom koordinat yang memang ada di header, supaya
+    sheet tanpa koordinat tidak menghapus koordinat yang sudah diisi.
+    """
+    rows, warnings = {}, []
+    with open(path, mode='r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        header = set(reader.fieldnames or [])
+        coordinates = {f: c for f, c in COORDINATE_COLUMNS.items() if c in header}
+        for line, row in enumerate(reader, start=2):
+            try:
+                values = {
+                    'nama': row['Nama Gunung'].strip(),
+                    'provinsi': row['Provinsi Gunung'].strip(),
+                    'ketinggian': int(row['Tinggi (mdpl)'].strip()),
+                    'deksripsi': row['Deskripsi'],
+                    'foto': row['Foto (url)'] if row['Foto (url)'] != 'nan' else '',  # Menangani nilai 'nan' pada kolom url
+                    **{f: parse_coordinate(row.get(c)) for f, c in coordinates.items()},
+                }
+            except (KeyError, ValueError, AttributeError) as e:
+                warnings.append(f'Baris {line} dilewati: {e!r}')
+                continue
+            key = natural_key(values['nama'], values['provinsi'])
+            if key in rows:
+                warnings.append(f'Baris {line}: duplikat "{values["nama"]}" ({values["provinsi"]}), baris terakhir dipakai')
+            rows[key] = values
+    return rows, BASE_FIELDS + list(coordinates), warnings
+
+
+def plan_sync(sheet, fields, existing):
+    """
+    Bandingkan sheet dengan isi database dalam satu lintasan.
+    `existing`: iterable of Gunung. Return dict create/update/delete/unchanged;
+    gunung ganda dengan kunci yang sama di database ikut masuk `delete`.
+    """
+    create, update, delete, unchanged = [], [], [], 0
+    seen = set()
+    for gunung in existing:
+        key = natural_key(gunung.nama, gunung.provinsi)
+        values = sheet.get(key)
+        if values is None or key in seen:
+            delete.append(gunung)
+            continue
+        seen.add(key)
+        current = {f: getattr(gunung, f) for f in fields}
+        if content_hash(current, fields) == content_hash(values, fields):
+            unchanged += 1
+            continue
+        for f in fields:
+            setattr(gunung, f, values[f])
+        update.append(gunung)
+    create = [Gunung(**values) for key, values in sheet.items() if key not in seen]
+    return {'create': create, 'update': update, 'delete': delete, 'unchanged': unchanged}
+
+
 class Command(BaseCommand):
     help = 'Mengimpor data Gunung dari file Mastersheets Gunung - Sheet1.csv'
 
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=CSV_PATH, help='File CSV (default: MastersheetsGunung-Sheet1.csv)')
+        parser.add_argument('--sync', action='store_true',
+                            help='Samakan database dengan sheet (tambah/ubah/hapus per nama + provinsi) alih-alih menambah semua baris')
+        parser.add_argument('--dry-run', action='store_true', help='Tampilkan rencana sync tanpa menulis ke database')
+        parser.add_argument('--batch-size', type=int, default=500)
+
     def handle(self, *args, **options):
         # 1. Pastikan tabel model Gunung sudah ada
         if not Gunung._meta.db_table:
             self.stdout.write(self.style.ERROR('Tabel Gunung belum ada. Jalankan: python manage.py migrate'))
             return
 
+        if options['sync'] or options['dry_run']:
+            try:
+                self.sync(options['path'], options['batch_size'], options['dry_run'])
+            except FileNotFoundError:
+                self.stdout.write(self.style.ERROR(f'File tidak ditemukan: {options["path"]}'))
+            return
+
         # 2. Buka file CSV
         try:
-            with open(CSV_PATH, mode='r', encoding='utf-8') as file:
+            with open(options['path'], mode='r', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
-                
+
                 gunung_list = []
                 for row in reader:
                     # 3. Mapping data CSV ke field model Django
@@ -30,15 +133,91 @@ class Command(BaseCommand):
                             provinsi=row['Provinsi Gunung'],
                             deksripsi=row['Deskripsi'],
                             foto=row['Foto (url)'] if row['Foto (url)'] != 'nan' else '', # Menangani nilai 'nan' pada kolom url
+                            **{field: parse_coordinate(row.get(column)) for field, column in COORDINATE_COLUMNS.items()},
                         )
                     )
-                
+
                 # 4. Melakukan bulk creation (memasukkan semua data sekaligus)
                 Gunung.objects.bulk_create(gunung_list)
-                
+                catalog.invalidate()  # bulk_create tidak memicu signal post_save
+
                 self.stdout.write(self.style.SUCCESS(f'Berhasil mengimpor {len(gunung_list)} data Gunung.'))
 
         except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f'File tidak ditemukan: {CSV_PATH}'))
+            self.stdout.write(self.style.ERROR(f'File tidak ditemukan: {options["path"]}'))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Terjadi kesalahan: {e}'))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f'Terjadi kesalahan: {e}'))
+
+    # =====================================================
+    # 🔹 MODE SYNC
+    # =====================================================
+    def sync(self, path, batch_size, dry_run):
+        timings = {}
+
+        def phase(name, start):
+            timings[name] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sheet, fields, warnings = read_sheet(path)
+        phase('baca sheet', start)
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(warning))
+
+        start = time.perf_counter()
+        existing = list(Gunung.objects.only('id', *fields).order_by('id'))
+        phase('muat database', start)
+
+        start = time.perf_counter()
+        plan = plan_sync(sheet, fields, existing)
+        phase('diff', start)
+
+        if dry_run:
+            self.stdout.write('Rencana sync (dry run, tidak ada yang ditulis):')
+            for label, key in (('tambah', 'create'), ('ubah', 'update'), ('hapus', 'delete')):
+                names = ', '.join(g.nama for g in plan[key][:10])
+                more = f' … (+{len(plan[key]) - 10})' if len(plan[key]) > 10 else ''
+                self.stdout.write(f'  {label}: {len(plan[key])}' + (f' — {names}{more}' if names else ''))
+            self.stdout.write(f'  tidak berubah: {plan["unchanged"]}')
+            self.write_timings(timings)
+            return
+
+        protected = []
+        if plan['create'] or plan['update'] or plan['delete']:
+            with transaction.atomic():
+                start = time.perf_counter()
+                Gunung.objects.bulk_create(plan['create'], batch_size=batch_size)
+                phase('tambah', start)
+
+                start = time.perf_counter()
+                Gunung.objects.bulk_update(plan['update'], fields, batch_size=batch_size)
+                phase('ubah', start)
+
+                start = time.perf_counter()
+                for i in range(0, len(plan['delete']), batch_size):
+                    batch = plan['delete'][i:i + batch_size]
+                    try:
+                        with transaction.atomic():
+                            Gunung.objects.filter(pk__in=[g.pk for g in batch]).delete()
+                    except ProtectedError:
+                        # ada gunung yang masih dipakai log pendakian: hapus satu per satu
+                        for gunung in batch:
+                            try:
+                                with transaction.atomic():
+                                    gunung.delete()
+                            except ProtectedError:
+                                protected.append(gunung)
+                phase('hapus', start)
+
+        deleted = len(plan['delete']) - len(protected)
+        if plan['create'] or plan['update'] or deleted:
+            catalog.invalidate()  # operasi bulk tidak memicu signal post_save
+        for gunung in protected:
+            self.stdout.write(self.style.WARNING(f'Tidak dihapus (masih dipakai log pendakian): {gunung.nama}'))
+        self.write_timings(timings)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Sync selesai: {len(plan["create"])} ditambah, {len(plan["update"])} diubah, '
+            f'{deleted} dihapus, {plan["unchanged"]} tidak berubah.'
+        ))
+
+    def write_timings(self, timings):
+        self.stdout.write('Waktu per fase: ' + ', '.join(f'{name} {secs * 1000:.1f} ms' for name, secs in timings.items()))
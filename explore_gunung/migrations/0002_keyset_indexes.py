@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explore_gunung', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gunung',
+            index=models.Index(fields=['nama', 'id'], name='explore_gun_nama_1c8afa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gunung',
+            index=models.Index(fields=['-ketinggian', 'id'], name='explore_gun_ketingg_9385b0_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explore_gunung', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gunung',
+            index=models.Index(fields=['provinsi', 'ketinggian'], name='explore_gun_provins_d8bc17_idx'),
+        ),
+    ]
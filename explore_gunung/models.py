@@ -1,4 +1,5 @@
 import uuid
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 
 class Gunung(models.Model):
@@ -9,3 +10,17 @@ class Gunung(models.Model):
     provinsi = models.CharField(max_length=255)
     foto = models.URLField(blank=True, null=True)
     deksripsi = models.TextField()
+    # koordinat puncak & basecamp (derajat desimal, WGS84); kosong bila belum diketahui
+    latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    basecamp_latitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    basecamp_longitude = models.FloatField(null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+
+    class Meta:
+        indexes = [
+            # urutan keyset (lihat catalog.SORTS)
+            models.Index(fields=['nama', 'id']),
+            models.Index(fields=['-ketinggian', 'id']),
+            # filter facet provinsi + rentang ketinggian
+            models.Index(fields=['provinsi', 'ketinggian']),
+        ]
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from explore_gunung.models import Gunung
+from explore_gunung import catalog
+
+
+@receiver(post_save, sender=Gunung)
+def gunung_saved(sender, instance, **kwargs):
+    catalog.invalidate(on_commit=True)
+
+
+@receiver(post_delete, sender=Gunung)
+def gunung_deleted(sender, instance, **kwargs):
+    catalog.invalidate(on_commit=True)
@@ -277,4 +277,597 @@ class GunungFormTests(TestCase):
         })
         self.assertFalse(form.is_valid())
         self.assertIn("nama", form.errors)
-        self.assertIn("provinsi", form.errors)
\ No newline at end of file
+        self.assertIn("provinsi", form.errors)
+
+class GunungKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.url = reverse('explore_gunung:show_json')
+        for i in range(13):
+            Gunung.objects.create(
+                nama=f"Gunung {i:02d}",
+                ketinggian=1000 + (i % 4) * 100,  # banyak ketinggian kembar
+                provinsi="Jawa Barat",
+                deksripsi="Gunung uji",
+            )
+
+    def _walk(self, params):
+        names, cursor, pages = [], '', 0
+        while True:
+            data = self.client.get(self.url, {**params, 'cursor': cursor, 'limit': 5}).json()
+            names += [g['nama'] for g in data['results']]
+            pages += 1
+            if not data['has_more']:
+                self.assertIsNone(data['next_cursor'])
+                return names, pages
+            cursor = data['next_cursor']
+
+    def test_cursor_walks_every_row_once(self):
+        names, pages = self._walk({})
+        self.assertEqual(names, sorted(f"Gunung {i:02d}" for i in range(13)))
+        self.assertEqual(pages, 3)
+
+    def test_cursor_sort_by_height_with_ties(self):
+        names, _ = self._walk({'sort': 'ketinggian'})
+        self.assertEqual(len(names), 13)
+        self.assertEqual(len(set(names)), 13)
+        heights = {g.nama: g.ketinggian for g in Gunung.objects.all()}
+        self.assertEqual([heights[n] for n in names], sorted(heights.values(), reverse=True))
+
+    def test_cursor_stable_when_rows_inserted(self):
+        first = self.client.get(self.url, {'cursor': '', 'limit': 5}).json()
+        Gunung.objects.create(nama="Gunung 00a", ketinggian=1, provinsi="X", deksripsi="baru")
+        second = self.client.get(self.url, {'cursor': first['next_cursor'], 'limit': 5}).json()
+        self.assertEqual(second['results'][0]['nama'], "Gunung 05")
+
+    def test_no_count_query(self):
+        from logpendakian import stats as gunung_stats
+        gunung_stats.current()
+        with self.assertNumQueries(1):  # memuat snapshot katalog (peta statistik sudah dimuat)
+            self.client.get(self.url, {'cursor': '', 'limit': 5})
+        with self.assertNumQueries(0):
+            data = self.client.get(self.url, {'page': 3, 'limit': 5}).json()
+        self.assertEqual(len(data['results']), 3)
+        self.assertFalse(data['has_more'])
+
+    def test_page_mode_is_ordered_and_returns_cursor(self):
+        data = self.client.get(self.url, {'page': 2, 'limit': 5}).json()
+        self.assertEqual(data['results'][0]['nama'], "Gunung 05")
+        cont = self.client.get(self.url, {'cursor': data['next_cursor'], 'limit': 5}).json()
+        self.assertEqual(cont['results'][0]['nama'], "Gunung 10")
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'rusak!!'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'sort': 'acak'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'page': 'dua'}).status_code, 400)
+
+
+class GunungAutocompleteTests(TestCase):
+    def setUp(self):
+        self.url = reverse('explore_gunung:autocomplete_gunung')
+        for nama, provinsi, tinggi in [
+            ("Gunung Semeru", "Jawa Timur", 3676),
+            ("Gunung Sembung", "Jawa Barat", 1500),
+            ("Gunung Rinjani", "Nusa Tenggara Barat", 3726),
+            ("Gunung Slamet", "Jawa Tengah", 3428),
+            ("Gunung Kerinci", "Jambi", 3805),
+        ]:
+            Gunung.objects.create(nama=nama, ketinggian=tinggi, provinsi=provinsi, deksripsi="-")
+
+    def names(self, q, k=8):
+        return [g['nama'] for g in self.client.get(self.url, {'q': q, 'k': k}).json()['results']]
+
+    def test_prefix_on_any_word(self):
+        self.assertEqual(self.names("sem"), ["Gunung Semeru", "Gunung Sembung"])
+        self.assertEqual(self.names("Gunung Rin"), ["Gunung Rinjani"])
+        self.assertEqual(len(self.names("gunung", k=3)), 3)
+
+    def test_typo_tolerant(self):
+        self.assertEqual(self.names("Smeru")[0], "Gunung Semeru")
+        self.assertEqual(self.names("kerinic")[0], "Gunung Kerinci")  # transposisi
+        self.assertEqual(self.names("gunung rinjnai")[0], "Gunung Rinjani")
+        self.assertEqual(self.names("xyzzy"), [])
+
+    def test_provinsi_ranked_after_name(self):
+        # "jam" cocok dengan provinsi Jambi
+        self.assertEqual(self.names("jam"), ["Gunung Kerinci"])
+
+    def test_index_rebuilt_after_edit_and_delete(self):
+        self.assertEqual(self.names("merbabu"), [])
+        g = Gunung.objects.create(nama="Gunung Merbabu", ketinggian=3145, provinsi="Jawa Tengah", deksripsi="-")
+        self.assertEqual(self.names("merbabu"), ["Gunung Merbabu"])
+        g.nama = "Gunung Lawu"
+        g.save()
+        self.assertEqual(self.names("merbabu"), [])
+        g.delete()
+        self.assertEqual(self.names("lawu"), [])
+
+    def test_served_from_memory(self):
+        self.names("sem")  # bangun index
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("slam"), ["Gunung Slamet"])
+
+    def test_invalid_method_and_k(self):
+        self.assertEqual(self.client.post(self.url).status_code, 405)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'k': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).json()['results'], [])
+
+    def test_suggest_is_fast(self):
+        from explore_gunung.autocomplete import AutocompleteIndex
+        import time
+        rows = [(uuid.uuid4(), f"Gunung Puncak{i} Raya{i % 97}", f"Provinsi {i % 34}", i) for i in range(3000)]
+        index = AutocompleteIndex(rows)
+        start = time.perf_counter()
+        for q in ["puncak12", "raya4", "pucnak77", "provinsi 3"] * 25:
+            index.suggest(q, 8)
+        self.assertLess((time.perf_counter() - start) / 100, 0.005)
+
+
+class GunungCatalogSnapshotTests(TestCase):
+    def setUp(self):
+        self.url = reverse('explore_gunung:show_json')
+        self.gunung = [
+            Gunung.objects.create(nama=f"Gunung {i:02d}", ketinggian=2000 + i, provinsi="Bali",
+                                  foto="https://example.com/g.jpg", deksripsi=f"Deskripsi {i}")
+            for i in range(8)
+        ]
+        self.client.get(self.url)  # muat snapshot
+
+    def test_reads_served_without_queries(self):
+        with self.assertNumQueries(0):
+            first = self.client.get(self.url).json()
+            second = self.client.get(self.url, {'cursor': first['next_cursor']}).json()
+            detail = self.client.get(reverse('explore_gunung:get_gunung_json', args=[self.gunung[3].id])).json()
+            self.client.get(self.url, {'q': 'gunung 0', 'limit': 3})
+        self.assertEqual([g['nama'] for g in first['results'] + second['results']],
+                         [g.nama for g in self.gunung])
+        self.assertEqual(detail['deskripsi'], "Deskripsi 3")
+        self.assertEqual(detail['provinsi'], "Bali")
+
+    def test_matches_database_rows(self):
+        data = self.client.get(self.url, {'limit': 50}).json()['results']
+        expected = list(Gunung.objects.order_by('nama', 'id').values_list('id', 'nama', 'ketinggian', 'deksripsi'))
+        self.assertEqual([(g['id'], g['nama'], g['ketinggian'], g['deskripsi']) for g in data],
+                         [(str(pk), n, k, d) for pk, n, k, d in expected])
+
+    def test_edit_and_delete_bump_version(self):
+        from explore_gunung import catalog
+        version = catalog.get().version
+        admin = UserProfile.objects.create_user(username="adm", password="x", is_admin=True)
+        self.client.force_login(admin)
+        self.client.post(reverse('explore_gunung:edit_gunung', args=[self.gunung[0].id]),
+                         data=json.dumps({'nama': 'Gunung Zz'}), content_type='application/json')
+        self.assertNotEqual(catalog.get().version, version)
+        names = [g['nama'] for g in self.client.get(self.url, {'limit': 50}).json()['results']]
+        self.assertEqual(names[-1], 'Gunung Zz')
+
+        self.client.post(reverse('explore_gunung:delete_gunung', args=[self.gunung[1].id]))
+        detail = self.client.get(reverse('explore_gunung:get_gunung_json', args=[self.gunung[1].id]))
+        self.assertEqual(detail.status_code, 404)
+        self.assertEqual(len(self.client.get(self.url, {'limit': 50}).json()['results']), 7)
+
+    def test_import_bumps_version(self):
+        from django.core.management import call_command
+        from explore_gunung import catalog
+        from io import StringIO
+        version = catalog.get().version
+        call_command('import_gunung_data', stdout=StringIO())
+        self.assertNotEqual(catalog.get().version, version)
+        self.assertEqual(len(catalog.get()), Gunung.objects.count())
+
+    def test_change_from_other_worker_seen_after_check_interval(self):
+        from django.core.cache import cache
+        from explore_gunung import catalog
+        # worker lain: mengubah data lalu menaikkan versi di cache bersama
+        Gunung.objects.filter(pk=self.gunung[0].pk).update(nama="Gunung Baru")
+        cache.set(catalog.VERSION_CACHE_KEY, 1, None)
+        with self.settings(SHARED_VERSION_CHECK_INTERVAL=60):
+            self.assertEqual(catalog.get().get(self.gunung[0].pk).nama, "Gunung 00")
+        with self.settings(SHARED_VERSION_CHECK_INTERVAL=0):
+            self.assertEqual(catalog.get().get(self.gunung[0].pk).nama, "Gunung Baru")
+
+    def test_version_shared_through_database_cache(self):
+        from django.core.management import call_command
+        from gundex.versioning import SharedVersion
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'uji_cache'}}
+        with self.settings(CACHES=shared, SHARED_VERSION_CHECK_INTERVAL=0):
+            call_command('createcachetable', verbosity=0)
+            worker_a, worker_b = SharedVersion('uji:versi'), SharedVersion('uji:versi')
+            first = worker_a.get()
+            self.assertEqual(worker_b.get(), first)
+            worker_b.bump()
+            self.assertNotEqual(worker_a.get(), first)
+            self.assertEqual(worker_a.get(), worker_b.get())
+
+    def test_default_pages_pre_encoded(self):
+        from explore_gunung import catalog
+        snapshot = catalog.get()
+        self.assertEqual(len(snapshot.pages), 6)  # 3 sort x 2 halaman (8 baris / 6)
+        body, count, next_values = snapshot.page('nama')
+        self.assertIs(body, snapshot.pages['nama', 0])
+        self.assertEqual((count, next_values[0]), (6, "Gunung 05"))
+
+    def test_invalid_id(self):
+        response = self.client.get(reverse('explore_gunung:get_gunung_json', args=['bukan-uuid']))
+        self.assertEqual(response.status_code, 404)
+
+
+class GunungFacetTests(TestCase):
+    def setUp(self):
+        self.url = reverse('explore_gunung:show_json')
+        for nama, provinsi, tinggi in [
+            ("Gunung Semeru", "Jawa Timur", 3676),
+            ("Gunung Arjuno", "Jawa Timur", 3339),
+            ("Gunung Bromo", "Jawa Timur", 2329),
+            ("Gunung Slamet", "Jawa Tengah", 3428),
+            ("Gunung Ungaran", "Jawa Tengah", 2050),
+            ("Gunung Batur", "Bali", 1717),
+            ("Bukit Kelam", "Kalimantan Barat", 1002),
+            ("Bukit Sulap", "Sumatera Selatan", 760),
+        ]:
+            Gunung.objects.create(nama=nama, ketinggian=tinggi, provinsi=provinsi, deksripsi="-")
+
+    def get(self, **params):
+        return self.client.get(self.url, {'limit': 50, **params}).json()
+
+    def counts(self, data):
+        return ({p['value']: p['count'] for p in data['facets']['provinsi']},
+                [b['count'] for b in data['facets']['ketinggian']])
+
+    def test_unfiltered_facets(self):
+        provinsi, bands = self.counts(self.get())
+        self.assertEqual(provinsi['Jawa Timur'], 3)
+        self.assertEqual(sum(provinsi.values()), 8)
+        self.assertEqual(bands, [1, 2, 2, 3])
+
+    def test_filter_provinsi_multi_and_height(self):
+        data = self.get(provinsi=['Jawa Timur', 'Jawa Tengah'], min_ketinggian=3000)
+        self.assertEqual({g['nama'] for g in data['results']}, {"Gunung Semeru", "Gunung Arjuno", "Gunung Slamet"})
+        provinsi, bands = self.counts(data)
+        # facet provinsi mengabaikan filter provinsi, facet ketinggian mengabaikan filter ketinggian
+        self.assertEqual((provinsi['Jawa Timur'], provinsi['Jawa Tengah'], provinsi['Bali']), (2, 1, 0))
+        self.assertEqual(bands, [0, 0, 2, 3])
+
+    def test_sort_by_height(self):
+        data = self.get(sort='ketinggian', provinsi='Jawa Timur')
+        self.assertEqual([g['ketinggian'] for g in data['results']], [3676, 3339, 2329])
+
+    def test_unaligned_range_and_query_match_scan(self):
+        from explore_gunung import catalog
+        snapshot = catalog.get()
+        for filters in [
+            catalog.Filters(min_ketinggian=1500, max_ketinggian=3400),
+            catalog.Filters(query="bukit"),
+            catalog.Filters(provinsi=["Bali"], min_ketinggian=1000, max_ketinggian=1999),
+        ]:
+            rows = range(len(snapshot))
+            expected_provinsi = [sum(1 for i in rows if snapshot.matches(i, filters, provinsi=False)
+                                     and snapshot.rows[i].provinsi == name) for name in snapshot.provinsi]
+            facets = snapshot.facets(filters)
+            self.assertEqual([p['count'] for p in facets['provinsi']], expected_provinsi)
+        data = self.get(min_ketinggian=1500, max_ketinggian=3400)
+        self.assertEqual({g['nama'] for g in data['results']},
+                         {"Gunung Arjuno", "Gunung Bromo", "Gunung Ungaran", "Gunung Batur"})
+
+    def test_cursor_with_filters(self):
+        first = self.client.get(self.url, {'limit': 2, 'provinsi': 'Jawa Timur'}).json()
+        second = self.client.get(self.url, {'limit': 2, 'provinsi': 'Jawa Timur', 'cursor': first['next_cursor']}).json()
+        self.assertEqual([g['nama'] for g in first['results'] + second['results']],
+                         ["Gunung Arjuno", "Gunung Bromo", "Gunung Semeru"])
+        self.assertFalse(second['has_more'])
+
+    def test_facets_refresh_after_write(self):
+        self.get()
+        Gunung.objects.create(nama="Gunung Agung", ketinggian=3031, provinsi="Bali", deksripsi="-")
+        provinsi, bands = self.counts(self.get())
+        self.assertEqual(provinsi['Bali'], 2)
+        self.assertEqual(bands[3], 4)
+
+    def test_invalid_height(self):
+        self.assertEqual(self.client.get(self.url, {'min_ketinggian': 'tinggi'}).status_code, 400)
+
+
+class GunungNearbyTests(TestCase):
+    # koordinat perkiraan puncak
+    PEAKS = [
+        ("Gunung Semeru", -8.108, 112.922),
+        ("Gunung Arjuno", -7.765, 112.589),
+        ("Gunung Bromo", -7.942, 112.953),
+        ("Gunung Merapi", -7.541, 110.446),
+        ("Gunung Rinjani", -8.411, 116.457),
+        ("Gunung Kerinci", -1.697, 101.264),
+    ]
+
+    def setUp(self):
+        self.url = reverse('explore_gunung:nearby_gunung')
+        self.gunung = {
+            nama: Gunung.objects.create(nama=nama, ketinggian=3000, provinsi="-", deksripsi="-",
+                                        latitude=lat, longitude=lon)
+            for nama, lat, lon in self.PEAKS
+        }
+        Gunung.objects.create(nama="Gunung Tanpa Koordinat", ketinggian=1000, provinsi="-", deksripsi="-")
+
+    def test_nearest_to_point(self):
+        data = self.client.get(self.url, {'lat': -7.95, 'lon': 112.9, 'k': 3}).json()
+        self.assertEqual([g['nama'] for g in data['results']], ["Gunung Bromo", "Gunung Semeru", "Gunung Arjuno"])
+        self.assertLess(data['results'][0]['distance_km'], 10)
+
+    def test_nearest_to_mountain_excludes_itself(self):
+        data = self.client.get(self.url, {'id': self.gunung["Gunung Semeru"].id, 'k': 2}).json()
+        self.assertEqual([g['nama'] for g in data['results']], ["Gunung Bromo", "Gunung Arjuno"])
+        self.assertAlmostEqual(data['results'][0]['distance_km'], 18.5, delta=1.5)
+
+    def test_radius(self):
+        data = self.client.get(self.url, {'lat': -7.942, 'lon': 112.953, 'radius_km': 50, 'k': 50}).json()
+        self.assertEqual({g['nama'] for g in data['results']}, {"Gunung Bromo", "Gunung Semeru", "Gunung Arjuno"})
+
+    def test_invalid_radius_rejected(self):
+        for radius in ("0", "-5", "nan", "inf", "abc"):
+            response = self.client.get(self.url, {'lat': -7.942, 'lon': 112.953, 'radius_km': radius})
+            self.assertEqual(response.status_code, 400, radius)
+            self.assertIn("radius_km", response.json()['error'])
+
+    def test_kdtree_matches_brute_force(self):
+        import random
+        from explore_gunung import geo
+        rng = random.Random(7)
+        points = [(rng.uniform(-11, 6), rng.uniform(95, 141)) for _ in range(500)]
+        tree = geo.KDTree([(geo.to_xyz(lat, lon), i) for i, (lat, lon) in enumerate(points)])
+        for _ in range(20):
+            target = geo.to_xyz(rng.uniform(-11, 6), rng.uniform(95, 141))
+            brute = sorted((geo._dist2(geo.to_xyz(*p), target) ** 0.5, i) for i, p in enumerate(points))
+            self.assertEqual([i for _, i in tree.nearest(target, 7)], [i for _, i in brute[:7]])
+            chord = geo.km_to_chord(300)
+            self.assertEqual([i for _, i in tree.within(target, chord)], [i for d, i in brute if d <= chord])
+
+    def test_details_page_block(self):
+        UserProfile.objects.create_user(username="pendaki", password="x")
+        self.client.login(username="pendaki", password="x")
+        response = self.client.get(reverse('explore_gunung:show_gunung', args=[self.gunung["Gunung Semeru"].id]))
+        self.assertContains(response, "Gunung Terdekat")
+        self.assertEqual(response.context['nearby_gunung'][0]['gunung'].nama, "Gunung Bromo")
+
+    def test_without_coordinates_or_bad_input(self):
+        tanpa = Gunung.objects.get(nama="Gunung Tanpa Koordinat")
+        self.assertEqual(self.client.get(self.url, {'id': tanpa.id}).json()['results'], [])
+        self.assertEqual(self.client.get(self.url, {'lat': 100, 'lon': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'id': 'x'}).status_code, 400)
+
+    def test_edit_coordinates(self):
+        admin = UserProfile.objects.create_user(username="adm", password="x", is_admin=True)
+        self.client.force_login(admin)
+        url = reverse('explore_gunung:edit_gunung', args=[self.gunung["Gunung Kerinci"].id])
+        response = self.client.post(url, data=json.dumps({'latitude': 95}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.client.post(url, data=json.dumps({'latitude': -7.9, 'longitude': 112.95}), content_type='application/json')
+        data = self.client.get(self.url, {'lat': -7.9, 'lon': 112.95, 'k': 1}).json()
+        self.assertEqual(data['results'][0]['nama'], "Gunung Kerinci")
+
+
+class GunungClusterTests(TestCase):
+    def setUp(self):
+        self.url = reverse('explore_gunung:cluster_gunung')
+        # tiga gunung berdekatan di Jawa Timur, satu di Lombok, satu di Sumatra
+        for nama, lat, lon in [
+            ("Gunung Semeru", -8.108, 112.922),
+            ("Gunung Bromo", -7.942, 112.953),
+            ("Gunung Arjuno", -7.765, 112.589),
+            ("Gunung Rinjani", -8.411, 116.457),
+            ("Gunung Kerinci", -1.697, 101.264),
+        ]:
+            Gunung.objects.create(nama=nama, ketinggian=3000, provinsi="-", deksripsi="-", latitude=lat, longitude=lon)
+        Gunung.objects.create(nama="Gunung Tanpa Koordinat", ketinggian=1000, provinsi="-", deksripsi="-")
+        self.indonesia = {'bbox': '95,-11,141,6'}
+
+    def get(self, **params):
+        return self.client.get(self.url, params).json()['clusters']
+
+    def test_low_zoom_groups_nearby_mountains(self):
+        clusters = self.get(zoom=6, **self.indonesia)
+        self.assertEqual(sum(c['count'] for c in clusters), 5)
+        java = max(clusters, key=lambda c: c['count'])
+        self.assertEqual(java['count'], 3)
+        self.assertGreater(java["expansion_zoom"], 6)
+        self.assertNotIn('gunung', java)
+
+    def test_high_zoom_returns_single_markers(self):
+        clusters = self.get(zoom=12, **self.indonesia)
+        self.assertEqual(len(clusters), 5)
+        self.assertEqual({c['gunung']['nama'] for c in clusters} - {"Gunung Tanpa Koordinat"},
+                         {c['gunung']['nama'] for c in clusters})
+
+    def test_bbox_limits_result(self):
+        clusters = self.get(zoom=10, bbox='112,-8.5,113.5,-7.5')
+        self.assertEqual(sorted(c['gunung']['nama'] for c in clusters),
+                         ["Gunung Arjuno", "Gunung Bromo", "Gunung Semeru"])
+        self.assertEqual(self.get(zoom=10, bbox='0,0,10,10'), [])
+
+    def test_counts_consistent_across_levels(self):
+        from explore_gunung import clusters
+        _, levels = clusters.get_levels()
+        for level in levels:
+            self.assertEqual(sum(node['count'] for node in level.nodes), 5)
+        self.assertEqual(len(levels[0]), 1)
+
+    def test_rebuilt_after_catalog_change(self):
+        self.assertEqual(len(self.get(zoom=10, bbox='110,-8,111,-7')), 0)
+        Gunung.objects.create(nama="Gunung Merapi", ketinggian=2930, provinsi="-", deksripsi="-",
+                              latitude=-7.541, longitude=110.446)
+        self.assertEqual(len(self.get(zoom=10, bbox='110,-8,111,-7')), 1)
+
+    def test_antimeridian_and_invalid(self):
+        Gunung.objects.create(nama="Gunung Pasifik", ketinggian=100, provinsi="-", deksripsi="-",
+                              latitude=-17.0, longitude=179.5)
+        clusters = self.get(zoom=8, bbox='170,-20,-170,-10')
+        self.assertEqual([c['gunung']['nama'] for c in clusters], ["Gunung Pasifik"])
+        self.assertEqual(self.client.get(self.url, {'bbox': '1,2,3'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'bbox': '0,10,1,5'}).status_code, 400)
+
+
+class ImportGunungSyncTests(TestCase):
+    HEADER = "Nama Pencari,Provinsi Gunung,Nama Gunung,Tinggi (mdpl),Deskripsi,Foto (url)\n"
+
+    def setUp(self):
+        import tempfile
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def sheet(self, rows, header=None):
+        import os
+        path = os.path.join(self.dir, f"sheet{len(os.listdir(self.dir))}.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header or self.HEADER)
+            for row in rows:
+                f.write(",".join(row) + "\n")
+        return path
+
+    def sync(self, path, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('import_gunung_data', path, '--sync', *args, stdout=out)
+        return out.getvalue()
+
+    ROWS = [
+        ("A", "Jawa Timur", "Semeru", "3676", "Tertinggi di Jawa", "nan"),
+        ("A", "Jawa Timur", "Arjuno", "3339", "Arjuno-Welirang", "https://example.com/a.jpg"),
+        ("B", "Bali", "Agung", "3031", "Tertinggi di Bali", "nan"),
+    ]
+
+    def test_initial_sync_and_rerun_is_noop(self):
+        path = self.sheet(self.ROWS)
+        output = self.sync(path)
+        self.assertIn("3 ditambah", output)
+        self.assertIn("Waktu per fase", output)
+        self.assertEqual(Gunung.objects.count(), 3)
+
+        with self.assertNumQueries(1):  # hanya SELECT untuk diff
+            output = self.sync(path)
+        self.assertIn("0 ditambah, 0 diubah, 0 dihapus, 3 tidak berubah", output)
+        self.assertEqual(Gunung.objects.count(), 3)
+
+    def test_updates_and_deletes_by_natural_key(self):
+        self.sync(self.sheet(self.ROWS))
+        semeru_id = Gunung.objects.get(nama="Semeru").id
+        changed = [
+            ("A", "Jawa Timur", "SEMERU", "3676", "Deskripsi baru", "nan"),  # kunci sama, isi berubah
+            ("A", "Jawa Timur", "Arjuno", "3339", "Arjuno-Welirang", "https://example.com/a.jpg"),
+            ("C", "NTB", "Rinjani", "3726", "Lombok", "nan"),
+        ]
+        output = self.sync(self.sheet(changed))
+        self.assertIn("1 ditambah, 1 diubah, 1 dihapus, 1 tidak berubah", output)
+        semeru = Gunung.objects.get(id=semeru_id)  # id tetap, tidak dibuat ulang
+        self.assertEqual((semeru.nama, semeru.deksripsi), ("SEMERU", "Deskripsi baru"))
+        self.assertFalse(Gunung.objects.filter(nama="Agung").exists())
+
+    def test_dry_run_writes_nothing(self):
+        output = self.sync(self.sheet(self.ROWS), '--dry-run')
+        self.assertIn("tambah: 3", output)
+        self.assertEqual(Gunung.objects.count(), 0)
+
+    def test_removes_duplicates_but_keeps_protected(self):
+        from datetime import date
+        from logpendakian.models import LogPendakian
+        path = self.sheet(self.ROWS[:1])
+        self.sync(path)
+        Gunung.objects.create(nama="Semeru", provinsi="Jawa Timur", ketinggian=3676, deksripsi="x")
+        dipakai = Gunung.objects.create(nama="Lawu", provinsi="Jawa Tengah", ketinggian=3265, deksripsi="x")
+        user = UserProfile.objects.create_user(username="pendaki", password="x")
+        LogPendakian.objects.create(user=user, gunung=dipakai, start_date=date(2024, 1, 1))
+
+        output = self.sync(path, '--batch-size', '1')
+        self.assertIn("Tidak dihapus (masih dipakai log pendakian): Lawu", output)
+        self.assertEqual(Gunung.objects.filter(nama="Semeru").count(), 1)
+        self.assertTrue(Gunung.objects.filter(id=dipakai.id).exists())
+
+    def test_sheet_without_coordinates_keeps_existing(self):
+        self.sync(self.sheet(self.ROWS))
+        Gunung.objects.filter(nama="Agung").update(latitude=-8.34, longitude=115.5)
+        self.assertIn("3 tidak berubah", self.sync(self.sheet(self.ROWS)))
+        header = self.HEADER.strip() + ",Latitude,Longitude\n"
+        rows = [r + ("-8.342", "115.508") if r[2] == "Agung" else r + ("", "") for r in self.ROWS]
+        self.assertIn("1 diubah", self.sync(self.sheet(rows, header)))
+        self.assertEqual(Gunung.objects.get(nama="Agung").latitude, -8.342)
+
+
+class GunungBatchTests(TestCase):
+    def setUp(self):
+        self.gunung = [
+            Gunung.objects.create(nama=nama, provinsi="Jawa Barat", ketinggian=tinggi, deksripsi="panjang " * 50)
+            for nama, tinggi in (("Gede", 2958), ("Pangrango", 3019), ("Ciremai", 3078))
+        ]
+        self.url = reverse("explore_gunung:batch_gunung_json")
+
+    def test_preserves_order_and_reports_missing(self):
+        unknown = str(uuid.uuid4())
+        ids = [self.gunung[2].id, unknown, self.gunung[0].id, self.gunung[2].id, "bukan-uuid"]
+        from logpendakian import stats as gunung_stats
+        gunung_stats.current()
+        with self.assertNumQueries(1):  # memuat snapshot (peta statistik sudah dimuat)
+            data = self.client.get(self.url, {"ids": ",".join(map(str, ids))}).json()
+        self.assertEqual([g["nama"] for g in data["results"]], ["Ciremai", "Gede"])
+        self.assertEqual(data["missing"], [unknown, "bukan-uuid"])
+        self.assertIn("deskripsi", data["results"][0])
+
+    def test_post_with_field_selection(self):
+        body = {"ids": [str(g.id) for g in reversed(self.gunung)], "fields": ["nama", "foto_thumb"]}
+        data = self.client.post(self.url, json.dumps(body), content_type="application/json").json()
+        self.assertEqual([g["nama"] for g in data["results"]], ["Ciremai", "Pangrango", "Gede"])
+        self.assertEqual(set(data["results"][0]), {"id", "nama", "foto_thumb"})
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(self.url, {"ids": str(self.gunung[0].id), "fields": "rahasia"}).status_code, 400)
+        too_many = ",".join(str(uuid.uuid4()) for _ in range(301))
+        self.assertEqual(self.client.get(self.url, {"ids": too_many}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, "bukan json", content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.delete(self.url).status_code, 405)
+
+
+class ResponseFormatTests(TestCase):
+    def setUp(self):
+        for nama, tinggi in (("Sindoro", 3136), ("Sumbing", 3371)):
+            Gunung.objects.create(nama=nama, provinsi="Jawa Tengah", ketinggian=tinggi, deksripsi="-")
+
+    def test_packb_roundtrip(self):
+        from gundex import serializers
+        value = {
+            "kecil": [0, 127, -1, -32, None, True, False],
+            "besar": [128, 255, 65535, 2 ** 32, 2 ** 63, -33, -129, -40000, -(2 ** 40)],
+            "float": [1.5, -0.25],
+            "teks": ["", "é" * 20, "x" * 300, "y" * 70000],
+            "bin": b"\x00\x01",
+            "list": list(range(20)),
+            "map": {str(i): i for i in range(20)},
+            "uuid": uuid.UUID(int=1),
+        }
+        expected = {**value, "bin": b"\x00\x01", "uuid": str(uuid.UUID(int=1))}
+        self.assertEqual(serializers.unpackb(serializers.packb(value)), expected)
+        # encoding sesuai spesifikasi MessagePack
+        self.assertEqual(serializers.packb({"a": [1, -1, None]}), b"\x81\xa1a\x93\x01\xff\xc0")
+
+    def test_negotiation(self):
+        from django.test import RequestFactory
+        from gundex import serializers
+        factory = RequestFactory()
+        accept = lambda value: serializers.negotiate(factory.get("/", HTTP_ACCEPT=value))
+        self.assertEqual(accept("text/html,*/*;q=0.8"), "json")
+        self.assertEqual(accept("application/json;q=0.5, application/x-msgpack"), "msgpack")
+        self.assertEqual(accept("application/x-msgpack;q=0.2, application/json"), "json")
+        self.assertEqual(serializers.negotiate(factory.get("/", {"format": "columnar"})), "columnar")
+        self.assertIsNone(serializers.negotiate(factory.get("/", {"format": "xml"})))
+
+    def test_show_json_formats_carry_same_data(self):
+        from gundex import serializers
+        url = reverse("explore_gunung:show_json")
+        plain = self.client.get(url, {"cursor": "", "limit": 1}).json()
+        columnar = self.client.get(url, {"cursor": "", "limit": 1, "format": "columnar"}).json()
+        packed = serializers.unpackb(self.client.get(url, {"cursor": "", "limit": 1}, HTTP_ACCEPT="application/x-msgpack").content)
+        for data in (columnar, packed):
+            rows = [dict(zip(data["results"]["keys"], row)) for row in data["results"]["rows"]]
+            self.assertEqual(rows, plain["results"])
+            self.assertEqual(data["facets"], plain["facets"])
+            self.assertEqual(data["next_cursor"], plain["next_cursor"])
+        self.assertEqual(self.client.get(url, {"format": "xml"}).status_code, 406)
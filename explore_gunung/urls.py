@@ -1,10 +1,14 @@
 from django.urls import path
-from explore_gunung.views import show_json, show_gunung, edit_gunung, get_gunung_json, delete_gunung
+from explore_gunung.views import show_json, show_gunung, edit_gunung, get_gunung_json, delete_gunung, autocomplete_gunung, nearby_gunung, cluster_gunung, batch_gunung_json
 
 app_name = 'explore_gunung'
 
 urlpatterns = [
     path('json/', show_json, name='show_json'),
+    path('gunung/autocomplete/', autocomplete_gunung, name='autocomplete_gunung'),
+    path('gunung/nearby/', nearby_gunung, name='nearby_gunung'),
+    path('gunung/clusters/', cluster_gunung, name='cluster_gunung'),
+    path('gunung/batch/', batch_gunung_json, name='batch_gunung_json'),
     path('gunung/<str:id>/', show_gunung, name='show_gunung'),
     path('gunung/<str:id>/edit', edit_gunung, name='edit_gunung'),
     path('gunung/<str:id>/json/', get_gunung_json, name='get_gunung_json'),
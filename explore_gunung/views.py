@@ -1,53 +1,164 @@
-from django.http import JsonResponse, HttpResponseRedirect
+from django.http import JsonResponse, HttpResponse, HttpResponseRedirect, Http404
 from django.urls import reverse
+from django.core.exceptions import ValidationError
 from explore_gunung.models import Gunung
-from django.db.models import Q
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.csrf import csrf_exempt
 from explore_gunung.forms import GunungForm
 import json
+import math
+import uuid
+from explore_gunung import autocomplete, catalog, clusters, geo
+from gundex import serializers
+from gundex.pagination import decode_cursor, encode_cursor, InvalidCursor
 
 def show_json(request):
-    query = request.GET.get('q', '')
-    page = int(request.GET.get('page', 1))
-    limit = int(request.GET.get('limit', 6))  # default 6 item per page
+    """
+    Daftar gunung untuk halaman explore, dilayani dari snapshot katalog
+    (explore_gunung/catalog.py) tanpa query database.
+
+    - Mode cursor (disarankan): kirim `cursor` (kosong untuk halaman pertama),
+      lalu pakai `next_cursor` dari respons untuk halaman berikutnya.
+    - Mode lama: `page` + `limit` (OFFSET), tetap didukung.
 
-    gunung_list = Gunung.objects.all()
+    Filter facet: `provinsi` (boleh berulang), `min_ketinggian`,
+    `max_ketinggian`, dan `sort` (nama/ketinggian/populer). Respons menyertakan
+    `facets` berisi jumlah gunung per provinsi dan per rentang ketinggian.
 
-    if query:
-        gunung_list = gunung_list.filter(
-            Q(nama__icontains=query) |
-            Q(provinsi__icontains=query)
+    Format respons mengikuti `format`/header Accept (json, columnar, msgpack;
+    lihat gundex/serializers.py).
+    """
+    query = request.GET.get('q', '')
+    sort = request.GET.get('sort', 'nama')
+    if sort not in catalog.SORTS:
+        return JsonResponse({'error': f"sort harus salah satu dari: {', '.join(catalog.SORTS)}"}, status=400)
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        limit = min(max(int(request.GET.get('limit', 6)), 1), 50)  # default 6 item per page
+    except ValueError:
+        return JsonResponse({'error': 'Parameter page/limit tidak valid'}, status=400)
+    try:
+        min_ketinggian, max_ketinggian = (
+            int(request.GET[name]) if request.GET.get(name) else None
+            for name in ('min_ketinggian', 'max_ketinggian')
         )
+    except ValueError:
+        return JsonResponse({'error': 'Parameter min_ketinggian/max_ketinggian tidak valid'}, status=400)
+    filters = catalog.Filters(query, [p for p in request.GET.getlist('provinsi') if p], min_ketinggian, max_ketinggian)
+
+    fields = catalog.SORTS[sort]
+    after, offset = None, 0
+    if request.GET.get('cursor'):
+        try:
+            after = decode_cursor(request.GET['cursor'], Gunung, fields)
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    elif 'cursor' not in request.GET:
+        offset = (page - 1) * limit
+
+    fmt = serializers.negotiate(request)
+    if fmt is None:
+        return serializers.not_acceptable()
+
+    snapshot = catalog.get()
+    if fmt != 'json':
+        # format columnar/msgpack dibangun dari dict baris di snapshot
+        rows, _, next_values = snapshot.select(sort, filters, after, offset, limit)
+        next_cursor = encode_cursor(next_values) if next_values else None
+        payload = {'results': [snapshot.row_data[i] for i in rows], 'facets': snapshot.facets(filters),
+                   'has_more': next_cursor is not None, 'next_cursor': next_cursor,
+                   'is_admin': getattr(request.user, 'is_admin', False), 'is_authenticated': request.user.is_authenticated}
+        return serializers.respond(fmt, serializers.encode(payload, fmt))
+
+    results, _, next_values = snapshot.page(sort, filters, after, offset, limit)
+    next_cursor = encode_cursor(next_values) if next_values else None
+
+    # `results` & `facets` sudah berupa JSON dari snapshot; sisanya di-encode per request
+    tail = json.dumps({'has_more': next_cursor is not None, 'next_cursor': next_cursor, 'is_admin': getattr(request.user, 'is_admin', False), 'is_authenticated': request.user.is_authenticated, })
+    return serializers.respond(
+        fmt, b'{"results":[' + results + b'],"facets":' + snapshot.facets_bytes(filters) + b',' + tail[1:].encode()
+    )
+
+def autocomplete_gunung(request):
+    """Saran nama gunung (prefix + toleran salah ketik) dari index di memori."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Gunakan method GET'}, status=405)
+    try:
+        k = min(max(int(request.GET.get('k', 8)), 1), 20)
+    except ValueError:
+        return JsonResponse({'error': 'Parameter k tidak valid'}, status=400)
+    return JsonResponse({'results': autocomplete.suggest(request.GET.get('q', ''), k)})
 
-    # Pagination: ambil data sesuai halaman
-    start = (page - 1) * limit
-    end = start + limit
-    paginated_gunung = gunung_list[start:end]
+def nearby_gunung(request):
+    """
+    Gunung terdekat dari titik (`lat` & `lon`) atau dari gunung lain (`id`).
+    `k` (default 5, maks 50) membatasi jumlah hasil; `radius_km` opsional
+    membatasi jarak. Setiap hasil memuat `distance_km`.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Gunakan method GET'}, status=405)
+    try:
+        radius_km = float(request.GET['radius_km']) if request.GET.get('radius_km') else None
+    except ValueError:
+        radius_km = math.nan
+    if radius_km is not None and not (math.isfinite(radius_km) and radius_km > 0):
+        return JsonResponse({'error': 'radius_km harus berupa angka positif'}, status=400)
+    try:
+        k = min(max(int(request.GET.get('k', 5)), 1), 50)
+        if 'id' in request.GET:
+            snapshot, hits = geo.nearby(gunung_id=uuid.UUID(request.GET['id']), k=k, radius_km=radius_km)
+        else:
+            lat, lon = float(request.GET['lat']), float(request.GET['lon'])
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError
+            snapshot, hits = geo.nearby(lat, lon, k=k, radius_km=radius_km)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Kirim id gunung atau lat & lon yang valid'}, status=400)
 
-    data = [
-        {
-            'id': str(g.id),
-            'nama': g.nama,
-            'ketinggian': g.ketinggian,
-            'foto': g.foto,
-            'provinsi': g.provinsi,
-            'deskripsi': g.deksripsi,
-        }
-        for g in paginated_gunung
-    ]
+    # sisipkan jarak ke JSON baris yang sudah di-encode di snapshot
+    results = b",".join(
+        snapshot.row_json[i][:-1] + f',"distance_km":{distance:.2f}}}'.encode()
+        for distance, i in hits
+    )
+    return HttpResponse(b'{"results":[' + results + b']}', content_type='application/json')
 
-    # Kirim juga apakah masih ada halaman berikutnya
-    has_more = end < gunung_list.count()
+def cluster_gunung(request):
+    """
+    Cluster marker peta untuk `bbox=west,south,east,north` (derajat) pada
+    `zoom` (0-16). Cluster berisi satu gunung menyertakan data gunungnya.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Gunakan method GET'}, status=405)
+    try:
+        west, south, east, north = (float(v) for v in request.GET['bbox'].split(','))
+        zoom = int(request.GET.get('zoom', 5))
+        if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise ValueError
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'bbox harus berupa west,south,east,north dan zoom berupa angka'}, status=400)
 
-    return JsonResponse({'results': data, 'has_more': has_more, 'is_admin': getattr(request.user, 'is_admin', False), 'is_authenticated': request.user.is_authenticated, })
+    snapshot, nodes = clusters.clusters(west, south, east, north, zoom)
+    items = []
+    for node in nodes:
+        lat, lon = clusters.unproject(node['x'], node['y'])
+        item = json.dumps({'lat': round(lat, 6), 'lon': round(lon, 6), 'count': node['count'],
+                           'expansion_zoom': node['expansion_zoom']}).encode()
+        if node['count'] == 1:
+            item = item[:-1] + b', "gunung": ' + snapshot.row_json[node['row']] + b'}'
+        items.append(item)
+    zoom = max(0, min(clusters.MAX_ZOOM, zoom))
+    return HttpResponse(b'{"zoom": %d, "clusters": [' % zoom + b', '.join(items) + b']}', content_type='application/json')
 
 @login_required(login_url='/userprofile/login/')
 def show_gunung(request, id):
     gunung = get_object_or_404(Gunung, pk=id)
 
+    snapshot, hits = geo.nearby(gunung_id=gunung.id, k=4)
     context = {
-        'gunung': gunung
+        'gunung': gunung,
+        'stats': snapshot.stats.get(gunung.id),  # statistik pendakian dari peta per proses, tanpa query tambahan
+        'nearby_gunung': [{'gunung': snapshot.rows[i], 'distance_km': distance} for distance, i in hits],
     }
 
     return render(request, "gunung_details.html", context)
@@ -71,6 +182,14 @@ def edit_gunung(request, id):
         gunung.ketinggian = data.get('ketinggian', gunung.ketinggian)
         gunung.deksripsi = data.get('deskripsi', gunung.deksripsi)
         gunung.foto = data.get('foto', gunung.foto)
+        try:
+            for field in ('latitude', 'longitude', 'basecamp_latitude', 'basecamp_longitude'):
+                if field in data:
+                    value = float(data[field]) if data[field] not in (None, '') else None
+                    Gunung._meta.get_field(field).run_validators(value)
+                    setattr(gunung, field, value)
+        except (TypeError, ValueError, ValidationError):
+            return JsonResponse({'success': False, 'message': 'Koordinat tidak valid'}, status=400)
         
         if not gunung.nama or not gunung.provinsi:
              return JsonResponse({'success': False, 'message': 'Nama dan Provinsi tidak boleh kosong'}, status=400)
@@ -90,17 +209,50 @@ def edit_gunung(request, id):
     }
     return render(request, "edit_gunung.html", context)
     
+@csrf_exempt  # hanya membaca; POST dipakai agar ratusan id tidak melebihi batas panjang URL
+def batch_gunung_json(request):
+    """
+    Beberapa gunung sekaligus dari snapshot katalog, sesuai urutan id.
+
+    - GET: `ids=a,b,c` (atau `ids` berulang), `fields=nama,foto_thumb` opsional.
+    - POST: body JSON `{"ids": [...], "fields": [...]}`.
+
+    Maksimal catalog.BATCH_LIMIT id. `missing` berisi id yang tidak ditemukan.
+    """
+    if request.method == 'GET':
+        ids = [v for value in request.GET.getlist('ids') for v in value.split(',') if v]
+        fields = [v for value in request.GET.getlist('fields') for v in value.split(',') if v] or None
+    elif request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            ids, fields = data.get('ids', []), data.get('fields')
+            if not isinstance(ids, list) or not (fields is None or isinstance(fields, list)):
+                raise ValueError
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': 'Body harus berupa JSON {"ids": [...], "fields": [...]}'}, status=400)
+    else:
+        return JsonResponse({'error': 'Gunakan method GET atau POST'}, status=405)
+
+    if len(ids) > catalog.BATCH_LIMIT:
+        return JsonResponse({'error': f'Maksimal {catalog.BATCH_LIMIT} id per permintaan'}, status=400)
+    if fields is not None:
+        unknown = [f for f in fields if f not in catalog.ROW_FIELDS]
+        if unknown:
+            return JsonResponse({'error': f"Field tidak dikenal: {', '.join(map(str, unknown))}. "
+                                          f"Pilihan: {', '.join(catalog.ROW_FIELDS)}"}, status=400)
+
+    results, missing = catalog.get().get_many(ids, fields)
+    return HttpResponse(b'{"results":[' + results + b'],"missing":' + json.dumps(missing).encode() + b'}',
+                        content_type='application/json')
+
 def get_gunung_json(request, id):
-    gunung = get_object_or_404(Gunung, pk=id)
-    data = {
-        'id': str(gunung.id),
-        'nama': gunung.nama,
-        'provinsi': gunung.provinsi,
-        'ketinggian': gunung.ketinggian,
-        'deskripsi': gunung.deksripsi,
-        'foto': gunung.foto,
-    }
-    return JsonResponse(data)
+    try:
+        data = catalog.get().get_json(uuid.UUID(id))
+    except ValueError:
+        data = None
+    if data is None:
+        raise Http404("Gunung tidak ditemukan")
+    return HttpResponse(data, content_type='application/json')
 
 def delete_gunung(request, id):
     gunung = get_object_or_404(Gunung, pk=id)
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gundex.settings')
 
 application = get_asgi_application()
+
+# flush berkala view artikel hanya perlu di proses web (lihat artikel/view_counter.py)
+from artikel import view_counter  # noqa: E402
+
+view_counter.start_timer()
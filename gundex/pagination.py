@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination yang dipakai bersama oleh endpoint JSON.
+
+Alih-alih OFFSET, halaman berikutnya dicari dengan kondisi "setelah baris
+terakhir" pada kolom urutan (mis. `(created_at, id)`), sehingga biaya tiap
+halaman O(limit) berapa pun dalamnya posisi scroll, dan baris tidak
+terlewat/terduplikasi saat data bertambah. Cursor dikirim ke klien sebagai
+string base64 yang tidak perlu dipahami klien.
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(v) if v is not None else None for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _field(model, path):
+    """Field model untuk nama field, boleh melintasi relasi (mis. `stats__total_logs`)."""
+    *relations, name = path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def decode_cursor(token, model, fields):
+    """Ubah cursor kembali menjadi nilai Python sesuai tipe field `fields`."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Cursor tidak valid")
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor("Cursor tidak valid")
+    try:
+        return [
+            _field(model, name.lstrip("-")).to_python(v)
+            for name, v in zip(fields, values)
+        ]
+    except Exception:
+        raise InvalidCursor("Cursor tidak valid")
+
+
+def _after(fields, values):
+    """Q untuk baris yang urutannya setelah `values` pada urutan `fields`."""
+    cond = Q()
+    for i, name in enumerate(fields):
+        column = name.lstrip("-")
+        op = "lt" if name.startswith("-") else "gt"
+        step = Q(**{f"{column}__{op}": values[i]})
+        for prev, value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev.lstrip("-"): value})
+        cond |= step
+    return cond
+
+
+def paginate(queryset, fields, cursor=None, limit=20):
+    """
+    Ambil satu halaman dari `queryset` yang diurutkan menurut `fields`
+    (field terakhir harus unik, biasanya `id` / `-id`). Mengambil limit+1
+    baris untuk mengetahui `has_more` tanpa COUNT.
+
+    Return (items, next_cursor); next_cursor None bila sudah halaman terakhir.
+    Bisa raise InvalidCursor.
+    """
+    queryset = queryset.order_by(*fields)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, fields)
+        queryset = queryset.filter(_after(fields, values))
+
+    items = list(queryset[:limit + 1])
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    get = (lambda obj, name: obj[name]) if isinstance(last, dict) else getattr
+    return items, encode_cursor([get(last, name.lstrip("-")) for name in fields])
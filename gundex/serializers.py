@@ -0,0 +1,253 @@
+"""
+Format respons alternatif untuk endpoint JSON berisi banyak baris.
+
+Klien memilih format lewat query `?format=` atau header Accept:
+
+- json      (application/json): seperti biasa, satu objek per baris.
+- columnar  (application/vnd.gundex.columnar+json): daftar kunci dikirim
+  sekali, lalu setiap baris berupa array nilai. {"keys": [...], "rows": [[...], ...]}
+- msgpack   (application/x-msgpack): layout columnar yang sama dalam
+  encoding biner MessagePack (https://msgpack.org), tanpa dependency tambahan.
+
+Bagian payload selain daftar baris (mis. `facets`, `next_cursor`) dikirim
+apa adanya di semua format.
+"""
+import json
+import struct
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+FORMATS = {
+    "json": "application/json",
+    "columnar": "application/vnd.gundex.columnar+json",
+    "msgpack": "application/x-msgpack",
+}
+_BY_MEDIA_TYPE = {media_type: name for name, media_type in FORMATS.items()}
+_to_primitive = DjangoJSONEncoder().default  # UUID, datetime, Decimal -> str
+
+
+def negotiate(request):
+    """Nama format untuk request ini, atau None bila `?format=` tidak dikenal."""
+    name = request.GET.get("format")
+    if name:
+        return name if name in FORMATS else None
+    best, best_q = "json", 0.0
+    for media_range in request.headers.get("Accept", "").split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        name = _BY_MEDIA_TYPE.get(media_type.lower())
+        if name and q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def columnar(rows):
+    """List dict -> {"keys": [...], "rows": [[...], ...]}; kunci diambil sesuai urutan kemunculan."""
+    keys = {}
+    for row in rows:
+        for key in row:
+            keys.setdefault(key, None)
+    keys = list(keys)
+    return {"keys": keys, "rows": [[row.get(key) for key in keys] for row in rows]}
+
+
+# =====================================================
+# 🔹 MESSAGEPACK
+# =====================================================
+_B, _H, _I, _Q = (struct.Struct(fmt).pack for fmt in (">B", ">H", ">I", ">Q"))
+_b, _h, _i, _q = (struct.Struct(fmt).pack for fmt in (">b", ">h", ">i", ">q"))
+_d = struct.Struct(">d").pack
+
+
+def _pack_int(n, buf):
+    if 0 <= n < 0x80:
+        buf.append(n)
+    elif -32 <= n < 0:
+        buf.append(n & 0xff)
+    elif n >= 0:
+        if n < 1 << 8:
+            buf += b"\xcc" + _B(n)
+        elif n < 1 << 16:
+            buf += b"\xcd" + _H(n)
+        elif n < 1 << 32:
+            buf += b"\xce" + _I(n)
+        elif n < 1 << 64:
+            buf += b"\xcf" + _Q(n)
+        else:
+            raise OverflowError("Integer terlalu besar untuk MessagePack")
+    elif n >= -(1 << 7):
+        buf += b"\xd0" + _b(n)
+    elif n >= -(1 << 15):
+        buf += b"\xd1" + _h(n)
+    elif n >= -(1 << 31):
+        buf += b"\xd2" + _i(n)
+    elif n >= -(1 << 63):
+        buf += b"\xd3" + _q(n)
+    else:
+        raise OverflowError("Integer terlalu kecil untuk MessagePack")
+
+
+def _pack_header(size, buf, fix=None, fix_limit=0, m8=None, m16=None, m32=None):
+    """Header str/bin/array/map: fix-format bila muat, selain itu marker + panjang 8/16/32 bit."""
+    if fix is not None and size < fix_limit:
+        buf.append(fix | size)
+    elif m8 is not None and size < 1 << 8:
+        buf.append(m8)
+        buf.append(size)
+    elif size < 1 << 16:
+        buf.append(m16)
+        buf += _H(size)
+    elif size < 1 << 32:
+        buf.append(m32)
+        buf += _I(size)
+    else:
+        raise ValueError("Objek terlalu besar untuk MessagePack")
+
+
+def _pack(obj, buf):
+    # tipe yang paling sering muncul dicek lebih dulu
+    if obj.__class__ is str:
+        data = obj.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            buf.append(0xa0 | size)
+        else:
+            _pack_header(size, buf, m8=0xd9, m16=0xda, m32=0xdb)
+        buf += data
+    elif obj is None:
+        buf.append(0xc0)
+    elif obj is True:
+        buf.append(0xc3)
+    elif obj is False:
+        buf.append(0xc2)
+    elif isinstance(obj, int):
+        _pack_int(obj, buf)
+    elif isinstance(obj, float):
+        buf += b"\xcb" + _d(obj)
+    elif isinstance(obj, str):
+        _pack(str(obj), buf)
+    elif isinstance(obj, (list, tuple)):
+        _pack_header(len(obj), buf, 0x90, 16, m16=0xdc, m32=0xdd)
+        for item in obj:
+            _pack(item, buf)
+    elif isinstance(obj, dict):
+        _pack_header(len(obj), buf, 0x80, 16, m16=0xde, m32=0xdf)
+        for key, value in obj.items():
+            _pack(key, buf)
+            _pack(value, buf)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        _pack_header(len(data), buf, m8=0xc4, m16=0xc5, m32=0xc6)
+        buf += data
+    else:
+        _pack(_to_primitive(obj), buf)
+
+
+def packb(obj):
+    """Encode objek Python (dict/list/str/int/float/bool/None/bytes, plus UUID/datetime sebagai str) ke MessagePack."""
+    buf = bytearray()
+    _pack(obj, buf)
+    return bytes(buf)
+
+
+def unpackb(data):
+    """Decode MessagePack hasil packb() (dipakai test dan klien Python)."""
+    view = memoryview(data)
+
+    def take(fmt, pos):
+        return struct.unpack_from(fmt, view, pos)[0], pos + struct.calcsize(fmt)
+
+    def read(pos):
+        marker = view[pos]
+        pos += 1
+        if marker < 0x80:
+            return marker, pos
+        if marker >= 0xe0:
+            return marker - 0x100, pos
+        if 0xa0 <= marker <= 0xbf:
+            size = marker & 0x1f
+            return str(view[pos:pos + size], "utf-8"), pos + size
+        if 0x90 <= marker <= 0x9f:
+            return read_array(marker & 0x0f, pos)
+        if 0x80 <= marker <= 0x8f:
+            return read_map(marker & 0x0f, pos)
+        if marker in (0xc0, 0xc2, 0xc3):
+            return {0xc0: None, 0xc2: False, 0xc3: True}[marker], pos
+        simple = {0xcc: ">B", 0xcd: ">H", 0xce: ">I", 0xcf: ">Q",
+                  0xd0: ">b", 0xd1: ">h", 0xd2: ">i", 0xd3: ">q", 0xca: ">f", 0xcb: ">d"}
+        if marker in simple:
+            return take(simple[marker], pos)
+        sized = {0xd9: ">B", 0xda: ">H", 0xdb: ">I", 0xc4: ">B", 0xc5: ">H", 0xc6: ">I",
+                 0xdc: ">H", 0xdd: ">I", 0xde: ">H", 0xdf: ">I"}
+        if marker not in sized:
+            raise ValueError(f"Marker MessagePack tidak didukung: {marker:#x}")
+        size, pos = take(sized[marker], pos)
+        if marker in (0xd9, 0xda, 0xdb):
+            return str(view[pos:pos + size], "utf-8"), pos + size
+        if marker in (0xc4, 0xc5, 0xc6):
+            return bytes(view[pos:pos + size]), pos + size
+        if marker in (0xdc, 0xdd):
+            return read_array(size, pos)
+        return read_map(size, pos)
+
+    def read_array(size, pos):
+        items = []
+        for _ in range(size):
+            item, pos = read(pos)
+            items.append(item)
+        return items, pos
+
+    def read_map(size, pos):
+        result = {}
+        for _ in range(size):
+            key, pos = read(pos)
+            result[key], pos = read(pos)
+        return result, pos
+
+    obj, _ = read(0)
+    return obj
+
+
+# =====================================================
+# 🔹 RESPONSE
+# =====================================================
+def encode(payload, fmt, rows_key="results"):
+    """
+    Bytes payload dalam format `fmt`. Daftar baris ada di payload[rows_key],
+    atau payload itu sendiri bila rows_key=None.
+    """
+    if fmt == "json":
+        return json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    if rows_key is None:
+        payload = columnar(payload)
+    else:
+        payload = {**payload, rows_key: columnar(payload[rows_key])}
+    if fmt == "columnar":
+        return json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    return packb(payload)
+
+
+def not_acceptable():
+    return JsonResponse({"error": f"format harus salah satu dari: {', '.join(FORMATS)}"}, status=406)
+
+
+def respond(fmt, body, status=200):
+    response = HttpResponse(body, content_type=FORMATS[fmt], status=status)
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+def render(request, payload, rows_key="results", status=200):
+    """Response untuk `payload` dalam format yang diminta klien (lihat negotiate)."""
+    fmt = negotiate(request)
+    if fmt is None:
+        return not_acceptable()
+    return respond(fmt, encode(payload, fmt, rows_key), status)
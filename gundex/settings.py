@@ -164,6 +164,77 @@ if DEBUG:
 else:
     STATIC_ROOT = BASE_DIR / 'static' # merujuk ke /static root project pada mode production
 
+# Cache bersama antar worker: versi snapshot katalog & statistik gunung
+# (gundex/versioning.py), fragmen artikel, versi array id sampling, dll. Worker
+# gunicorn di production harus berbagi cache yang sama: Redis bila REDIS_URL
+# di-set, selain itu tabel database (dibuat oleh migrasi main 0001).
+# Development (satu proses runserver) cukup memakai LocMemCache.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+elif PRODUCTION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'gundex_cache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seberapa sering (detik) setiap worker membaca ulang versi data bersama dari
+# cache; perubahan dari worker lain terlihat paling lambat selama ini.
+SHARED_VERSION_CHECK_INTERVAL = 2
+
+# Write-behind counter view artikel (artikel/view_counter.py)
+ARTIKEL_VIEW_FLUSH_INTERVAL = 10    # detik
+ARTIKEL_VIEW_FLUSH_THRESHOLD = 100  # total hit tertunda per worker sebelum flush
+
+# Cache fragmen halaman artikel (artikel/sections.py), disimpan di CACHES.
+ARTIKEL_SECTION_CACHE_TTL = 3600         # latest, di-invalidate saat artikel berubah
+ARTIKEL_COUNTER_SECTION_CACHE_TTL = 60   # popular & hottest, batas staleness counter
+
+# Umur maksimum array id per proses untuk sampling artikel acak (artikel/sampling.py)
+ARTIKEL_SAMPLING_CACHE_TTL = 300  # detik
+
+# Jumlah artikel terkait per artikel (artikel/related.py)
+ARTIKEL_RELATED_TOP_K = 4
+
+# Skor trending "Artikel Terhangat" (artikel/trending.py). Setelah mengubah
+# nilai-nilai ini jalankan: python manage.py rebuild_trending
+ARTIKEL_TRENDING_HALF_LIFE_HOURS = 24
+ARTIKEL_TRENDING_LIKE_WEIGHT = 5
+ARTIKEL_TRENDING_VIEW_WEIGHT = 1
+
+# Cache thumbnail WebP untuk gambar eksternal (main/thumbnails.py). File hasil
+# disimpan di THUMBNAIL_CACHE_DIR/thumbs/ dan dilayani whitenoise di /thumbs/.
+# Nama file memuat revisi yang naik tiap THUMBNAIL_REFRESH_INTERVAL detik, jadi
+# gambar yang berubah di origin ikut diperbarui; browser menyimpan selama itu.
+THUMBNAIL_CACHE_DIR = BASE_DIR / 'media_cache'
+THUMBNAIL_REFRESH_INTERVAL = 7 * 24 * 3600     # detik
+THUMBNAIL_WIDTHS = (160, 320, 640)
+THUMBNAIL_WEBP_QUALITY = 80
+THUMBNAIL_FETCH_TIMEOUT = 5                    # detik
+THUMBNAIL_MAX_SOURCE_BYTES = 15 * 1024 * 1024
+THUMBNAIL_FAILURE_TTL = 600                    # jeda sebelum mencoba ulang origin yang gagal
+WHITENOISE_ROOT = THUMBNAIL_CACHE_DIR
+
+
+def _thumbnail_headers(headers, path, url):
+    if url.startswith('/thumbs/'):
+        headers['Cache-Control'] = f'public, max-age={THUMBNAIL_REFRESH_INTERVAL}'
+
+
+WHITENOISE_ADD_HEADERS_FUNCTION = _thumbnail_headers
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,49 @@
+"""
+Versi data bersama untuk cache per proses (snapshot katalog Gunung, peta
+statistik pendakian).
+
+Nilai versi disimpan di cache default, yang di production di-share antar
+worker (lihat CACHES di settings.py). Agar tidak membaca cache di setiap
+request, tiap proses memakai nilai versi terakhirnya selama
+SHARED_VERSION_CHECK_INTERVAL detik: perubahan dari worker lain terlihat
+paling lambat setelah itu, perubahan dari proses sendiri langsung terlihat.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def check_interval():
+    return getattr(settings, "SHARED_VERSION_CHECK_INTERVAL", 2)
+
+
+class SharedVersion:
+    def __init__(self, key):
+        self.key = key
+        self._lock = threading.Lock()
+        self._value = None
+        self._checked = 0.0
+
+    def get(self):
+        """Versi saat ini (dibaca ulang dari cache paling sering sekali per interval)."""
+        now = time.monotonic()
+        if self._value is not None and now - self._checked < check_interval():
+            return self._value
+        version = cache.get(self.key)
+        if version is None:
+            # nilai awal berbasis waktu supaya versi tidak mengulang setelah cache di-evict
+            cache.add(self.key, time.time_ns(), None)
+            version = cache.get(self.key)
+        with self._lock:
+            self._value, self._checked = version, now
+        return version
+
+    def bump(self):
+        """Versi baru untuk semua worker; proses ini langsung memakainya."""
+        version = time.time_ns()
+        cache.set(self.key, version, None)
+        with self._lock:
+            self._value, self._checked = version, time.monotonic()
+        return version
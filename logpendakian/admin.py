@@ -1,4 +1,16 @@
 from django.contrib import admin
-from .models import LogPendakian
+from .models import GunungStats, LogPendakian, LogTrack
 
-admin.site.register(LogPendakian)
\ No newline at end of file
+admin.site.register(LogPendakian)
+
+
+@admin.register(GunungStats)
+class GunungStatsAdmin(admin.ModelAdmin):
+    list_display = ("gunung", "total_logs", "summit_rate", "avg_rating", "avg_team_size", "avg_duration_days")
+    ordering = ("-total_logs",)
+
+
+@admin.register(LogTrack)
+class LogTrackAdmin(admin.ModelAdmin):
+    list_display = ("log", "point_count", "distance_km", "elevation_gain_m", "max_elevation_m", "uploaded_at")
+    exclude = ("points", "levels")
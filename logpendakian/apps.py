@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LogpendakianConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logpendakian'
+
+    def ready(self):
+        from logpendakian import signals  # noqa: F401
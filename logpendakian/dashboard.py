@@ -0,0 +1,277 @@
+"""
+Statistik pendakian per user untuk halaman dashboard.
+
+Dilayani dari satu baris UserClimbStats per user plus bucket bulanan
+MonthlyClimbStats (jumlah pendakian per bulan mulai dan hari aktif per
+tanggal untuk heatmap), jadi dashboard tidak perlu memindai seluruh log.
+Keduanya dijaga dengan delta dari nilai log lama & baru (stats.capture()),
+dipanggil oleh signal setiap kali log_create/log_update/log_delete
+menyimpan atau menghapus log. Ketinggian & provinsi gunung disalin ke log
+(gunung_ketinggian, gunung_provinsi; dari snapshot katalog, tanpa query)
+saat log dibuat atau dipindah gunung, dan salinan itulah yang ditambahkan
+maupun dikurangi: mengedit ketinggian/provinsi Gunung tidak membuat
+pengurangan berikutnya melenceng dari yang dulu ditambahkan.
+
+Trip terpanjang tidak bisa dikurangi dengan delta: bila log terpanjang
+dihapus/dipendekkan, nilainya dicari ulang dengan satu query per user.
+`python manage.py rebuild_user_stats` menyegarkan salinan gunung di setiap
+log lalu menghitung ulang semuanya dari nol; user yang barisnya belum ada
+dihitung dari log-lognya saat perubahan pertamanya.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F, OuterRef, Subquery
+
+from explore_gunung import catalog
+from logpendakian import stats
+
+MAX_TRIP_DAYS = 366  # batas hari per log yang dihitung di heatmap
+HEATMAP_LEVELS = 4
+
+
+def _month(day):
+    return day.replace(day=1)
+
+
+def trip_days(values):
+    """Tanggal-tanggal sebuah log (start..end, atau start saja)."""
+    start = values["start_date"]
+    days = min(stats.duration_days(values) or 1, MAX_TRIP_DAYS)
+    return [start + timedelta(days=n) for n in range(days)]
+
+
+def _gunung(gunung_id):
+    """(ketinggian, provinsi) gunung dari snapshot katalog; fallback ke database."""
+    row = catalog.get().get(gunung_id)
+    if row is not None:
+        return row.ketinggian or 0, row.provinsi
+    from explore_gunung.models import Gunung
+
+    found = Gunung.objects.filter(pk=gunung_id).values_list("ketinggian", "provinsi").first()
+    return (found[0] or 0, found[1]) if found else (0, "")
+
+
+def fill_gunung(log):
+    """Salin ketinggian & provinsi gunung log (dipanggil sebelum log baru/pindah gunung disimpan)."""
+    log.gunung_ketinggian, log.gunung_provinsi = _gunung(log.gunung_id)
+
+
+def _bump(counts, key, sign):
+    n = counts.get(key, 0) + sign
+    if n > 0:
+        counts[key] = n
+    else:
+        counts.pop(key, None)
+
+
+def _apply(agg, bucket, sign, values):
+    """
+    Tambahkan (sign=1) atau kurangi (sign=-1) sumbangan satu log ke agregat
+    dan bucket (objek di memori). Return True bila trip terpanjang perlu
+    dicari ulang.
+    """
+    ketinggian, provinsi = values["gunung_ketinggian"], values["gunung_provinsi"]
+    summit = int(bool(values["summit_reached"]))
+    for target in (agg, bucket(values["start_date"])):
+        target.total_logs += sign
+        target.summit_count += sign * summit
+        target.summit_ketinggian += sign * summit * ketinggian
+    _bump(agg.gunung_counts, str(values["gunung_id"]), sign)
+    if provinsi:
+        _bump(agg.provinsi_counts, provinsi, sign)
+    for day in trip_days(values):
+        bucket(day).days[day.day - 1] += sign
+
+    duration = stats.duration_days(values) or 0
+    if sign > 0 and duration > agg.longest_days:
+        agg.longest_days, agg.longest_log_id = duration, values["id"]
+    # longest_log bisa sudah di-NULL-kan oleh on_delete=SET_NULL sebelum signal ini jalan
+    return sign < 0 and (values["id"] == agg.longest_log_id or (agg.longest_log_id is None and agg.longest_days))
+
+
+def longest_trip(user_id):
+    """(id log, durasi hari) trip terpanjang user, atau (None, 0)."""
+    from logpendakian.models import LogPendakian
+
+    found = (LogPendakian.objects
+             .filter(user_id=user_id, end_date__isnull=False)
+             .annotate(span=ExpressionWrapper(F("end_date") - F("start_date"), output_field=DurationField()))
+             .order_by("-span", "start_date")
+             .values_list("id", "span")
+             .first())
+    return (found[0], found[1].days + 1) if found else (None, 0)
+
+
+def _compute(logs):
+    """Agregat & bucket baru (belum disimpan) dari iterable log: ({user_id: agg}, {(user_id, bulan): bucket})."""
+    from logpendakian.models import MonthlyClimbStats, UserClimbStats
+
+    aggs, buckets = {}, {}
+    for log in logs:
+        values = stats.capture(log)
+        user_id = values["user_id"]
+        agg = aggs.get(user_id)
+        if agg is None:
+            agg = aggs[user_id] = UserClimbStats(user_id=user_id, gunung_counts={}, provinsi_counts={})
+
+        def bucket(day):
+            key = (user_id, _month(day))
+            if key not in buckets:
+                buckets[key] = MonthlyClimbStats(user_id=user_id, month=key[1], days=[0] * 31)
+            return buckets[key]
+
+        _apply(agg, bucket, 1, values)
+    return aggs, buckets
+
+
+def _logs(**filters):
+    from logpendakian.models import LogPendakian
+
+    return (LogPendakian.objects.filter(user__isnull=False, **filters).only(*stats.TRACKED_FIELDS)
+            .order_by("start_date", "id").iterator(chunk_size=2000))
+
+
+def _rebuild_user(user_id):
+    """
+    Hitung statistik satu user dari log-lognya (perubahan yang sedang
+    diterapkan sudah ada di database). Dipakai bila barisnya belum ada,
+    supaya delta -1 tidak dikurangkan dari baris nol.
+    """
+    from logpendakian.models import MonthlyClimbStats, UserClimbStats
+
+    UserClimbStats.objects.get_or_create(user_id=user_id)
+    UserClimbStats.objects.select_for_update().get(pk=user_id)  # apply_many lain untuk user ini menunggu
+    aggs, buckets = _compute(_logs(user_id=user_id))
+    agg = aggs.get(user_id) or UserClimbStats(user_id=user_id)
+    agg.save()
+    MonthlyClimbStats.objects.filter(user_id=user_id).delete()
+    MonthlyClimbStats.objects.bulk_create(buckets.values(), batch_size=500)
+
+
+def apply(old, new):
+    """Terapkan perubahan satu log (capture() lama & baru, None bila tidak ada) ke statistik user."""
+    if old != new:
+        apply_many([(-1, old), (1, new)])
+
+
+def apply_many(changes):
+    """
+    Terapkan banyak perubahan sekaligus: list (sign, capture()) dengan sign
+    1 = log ditambahkan, -1 = log dihapus. Satu kali lock & simpan per user
+    (dipakai juga oleh import massal yang melewati signal).
+    """
+    from logpendakian.models import MonthlyClimbStats, UserClimbStats
+
+    by_user = {}
+    for sign, values in changes:
+        if values and values["user_id"]:
+            by_user.setdefault(values["user_id"], []).append((sign, values))
+    for user_id, changes in by_user.items():
+        with transaction.atomic():
+            agg = UserClimbStats.objects.select_for_update().filter(pk=user_id).first()
+            if agg is None:
+                # belum pernah dihitung: hitung dari log, kecuali tanpa log baru (mis. user sedang dihapus)
+                if any(sign > 0 for sign, _ in changes):
+                    _rebuild_user(user_id)
+                continue
+
+            months = {_month(day) for _, v in changes for day in (v["start_date"], *trip_days(v))}
+            buckets = {
+                b.month: b for b in
+                MonthlyClimbStats.objects.select_for_update().filter(user_id=user_id, month__in=months)
+            }
+
+            def bucket(day):
+                month = _month(day)
+                if month not in buckets:
+                    buckets[month] = MonthlyClimbStats(user_id=user_id, month=month, days=[0] * 31)
+                return buckets[month]
+
+            recompute = False
+            for sign, values in changes:
+                recompute |= _apply(agg, bucket, sign, values)
+            if recompute:
+                agg.longest_log_id, agg.longest_days = longest_trip(user_id)
+            agg.save()
+            for b in buckets.values():
+                if b.total_logs or any(b.days):
+                    b.save()
+                elif b.pk is not None:
+                    b.delete()
+
+
+def rebuild():
+    """
+    Hitung ulang seluruh statistik user dari LogPendakian, setelah salinan
+    ketinggian & provinsi di setiap log disamakan dengan Gunung saat ini.
+    """
+    from explore_gunung.models import Gunung
+    from logpendakian.models import LogPendakian, MonthlyClimbStats, UserClimbStats
+
+    gunung = Gunung.objects.filter(pk=OuterRef("gunung_id"))
+    LogPendakian.objects.update(
+        gunung_ketinggian=Subquery(gunung.values("ketinggian")[:1]),
+        gunung_provinsi=Subquery(gunung.values("provinsi")[:1]),
+    )
+    aggs, buckets = _compute(_logs())
+
+    with transaction.atomic():
+        MonthlyClimbStats.objects.all().delete()
+        UserClimbStats.objects.all().delete()
+        UserClimbStats.objects.bulk_create(aggs.values(), batch_size=500)
+        MonthlyClimbStats.objects.bulk_create(buckets.values(), batch_size=500)
+    return len(aggs), len(buckets)
+
+
+# =====================================================
+# 🔹 DATA DASHBOARD
+# =====================================================
+def heatmap(year, buckets):
+    """
+    Grid kalender satu tahun: list minggu (Senin-Minggu), setiap sel berisi
+    {"date", "count", "level"} atau None untuk tanggal di luar tahun itu.
+    """
+    days = {b.month.month: b.days for b in buckets if b.month.year == year}
+    first, last = date(year, 1, 1), date(year, 12, 31)
+    day = first - timedelta(days=first.weekday())
+    weeks = []
+    while day <= last:
+        week = []
+        for _ in range(7):
+            if day.year == year:
+                count = days.get(day.month, [0] * 31)[day.day - 1]
+                week.append({"date": day, "count": count, "level": min(count, HEATMAP_LEVELS)})
+            else:
+                week.append(None)
+            day += timedelta(days=1)
+        weeks.append(week)
+    return weeks
+
+
+def summary(user, year=None):
+    """Konteks dashboard: agregat, total per tahun, dan heatmap `year` (default tahun aktif terakhir)."""
+    from logpendakian.models import MonthlyClimbStats, UserClimbStats
+
+    agg = (UserClimbStats.objects.select_related("longest_log__gunung").filter(pk=user.pk).first()
+           or UserClimbStats(user=user))
+    buckets = list(MonthlyClimbStats.objects.filter(user=user))
+
+    yearly = {}
+    for b in buckets:
+        totals = yearly.setdefault(b.month.year, {"year": b.month.year, "total_logs": 0, "summit_count": 0,
+                                                  "summit_ketinggian": 0, "active_days": 0})
+        totals["total_logs"] += b.total_logs
+        totals["summit_count"] += b.summit_count
+        totals["summit_ketinggian"] += b.summit_ketinggian
+        totals["active_days"] += sum(1 for n in b.days if n)
+    years = sorted(yearly, reverse=True)
+    if year is None:
+        year = years[0] if years else date.today().year
+    return {
+        "stats": agg,
+        "yearly": [yearly[y] for y in years],
+        "year": year,
+        "years": years,
+        "heatmap": heatmap(year, buckets),
+    }
@@ -0,0 +1,105 @@
+"""
+Ekspor riwayat pendakian (CSV / NDJSON) secara streaming.
+
+Log dibaca per CHUNK_SIZE baris lewat QuerySet.iterator() (values_list +
+join ke Gunung, tanpa membuat instance model), diubah menjadi teks baris
+demi baris, dikumpulkan sampai ~BUFFER_BYTES, lalu dikirim. Bila gzip
+diminta, setiap potongan langsung dikompres dengan zlib.compressobj. Memori
+worker tetap konstan berapa pun jumlah log user.
+"""
+import csv
+import json
+import zlib
+
+CHUNK_SIZE = 500
+BUFFER_BYTES = 64 * 1024
+GZIP_LEVEL = 6
+
+# (nama kolom ekspor, lookup values_list)
+COLUMNS = (
+    ("id", "id"),
+    ("gunung", "gunung__nama"),
+    ("provinsi", "gunung__provinsi"),
+    ("ketinggian", "gunung__ketinggian"),
+    ("start_date", "start_date"),
+    ("end_date", "end_date"),
+    ("summit_reached", "summit_reached"),
+    ("team_size", "team_size"),
+    ("rating", "rating"),
+    ("notes", "notes"),
+    ("created_at", "created_at"),
+)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def rows(user):
+    """Tuple nilai COLUMNS untuk setiap log user, terurut dari yang terlama."""
+    from logpendakian.models import LogPendakian
+
+    return (LogPendakian.objects
+            .filter(user=user)
+            .order_by("start_date", "created_at", "id")
+            .values_list(*(lookup for _, lookup in COLUMNS))
+            .iterator(chunk_size=CHUNK_SIZE))
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class _Echo:
+    """File-like untuk csv.writer: writerow() langsung mengembalikan barisnya."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(values):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in COLUMNS])
+    for row in values:
+        yield writer.writerow(["" if v is None else _text(v) for v in row])
+
+
+def ndjson_lines(values):
+    names = [name for name, _ in COLUMNS]
+    for row in values:
+        yield json.dumps(dict(zip(names, map(_text, row))), ensure_ascii=False) + "\n"
+
+
+def buffered(lines, size=BUFFER_BYTES):
+    """Gabungkan baris teks menjadi potongan bytes ~`size` supaya tidak mengirim ribuan chunk kecil."""
+    parts, total = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        parts.append(data)
+        total += len(data)
+        if total >= size:
+            yield b"".join(parts)
+            parts, total = [], 0
+    if parts:
+        yield b"".join(parts)
+
+
+def gzipped(chunks, level=GZIP_LEVEL):
+    """Kompres aliran bytes menjadi aliran gzip (wbits=31 = header & trailer gzip)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(user, fmt="csv", gzip=False):
+    """Iterator bytes isi ekspor."""
+    lines = (csv_lines if fmt == "csv" else ndjson_lines)(rows(user))
+    chunks = buffered(lines)
+    return gzipped(chunks) if gzip else chunks
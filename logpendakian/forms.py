@@ -1,12 +1,23 @@
 from django import forms
+from django.urls import reverse_lazy
 from .models import LogPendakian
+from . import gpx, tracks
 from explore_gunung.models import Gunung
 
 class DateInput(forms.DateInput):
     input_type = "date"
 
 class LogPendakianForm(forms.ModelForm):
-    gunung = forms.ModelChoiceField(queryset=Gunung.objects.none(), label="Gunung")
+    gunung = forms.ModelChoiceField(
+        queryset=Gunung.objects.none(), label="Gunung",
+        # combobox di logpendakian.js mengambil saran dari index autocomplete gunung
+        widget=forms.Select(attrs={"data-autocomplete-url": reverse_lazy("explore_gunung:autocomplete_gunung")}),
+    )
+    # bukan field model: disimpan ke LogTrack lewat save_track()
+    track = forms.FileField(
+        required=False, label="Track GPX (opsional)",
+        widget=forms.ClearableFileInput(attrs={"accept": ".gpx,application/gpx+xml", "class": "lp-input"}),
+    )
 
     class Meta:
         model = LogPendakian
@@ -40,3 +51,17 @@ class LogPendakianForm(forms.ModelForm):
         self.fields["gunung"].label_from_instance = lambda obj: getattr(obj, "nama", str(obj))
         self.fields["team_size"].required = False
         self.fields["rating"].required = False
+
+    def clean_track(self):
+        upload = self.cleaned_data.get("track")
+        if not upload:
+            return None
+        try:
+            return tracks.parse(upload)
+        except gpx.GPXError as e:
+            raise forms.ValidationError(str(e))
+
+    def save_track(self, log):
+        """Simpan track hasil clean_track() (bila ada) untuk `log` yang sudah tersimpan."""
+        if self.cleaned_data.get("track") is not None:
+            tracks.save(log, self.cleaned_data["track"])
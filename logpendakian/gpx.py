@@ -0,0 +1,74 @@
+"""
+Pembacaan berkas GPX secara streaming (xml.etree.ElementTree.iterparse).
+
+Elemen titik dibuang (dikosongkan dan dilepas dari parent-nya) segera
+setelah dibaca, jadi berkas track besar tidak perlu dimuat utuh ke memori.
+Namespace GPX 1.0/1.1 diabaikan. Waktu titik selalu aware UTC; waktu tanpa
+zona dianggap UTC.
+"""
+from datetime import datetime, timezone
+from xml.etree.ElementTree import ParseError, iterparse
+
+POINT_TAGS = {"trkpt", "rtept"}
+
+
+class GPXError(ValueError):
+    pass
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_time(text):
+    try:
+        value = datetime.fromisoformat((text or "").strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def read(fileobj):
+    """
+    Yield ("name", teks) untuk <name> di metadata/track, lalu ("point",
+    (lat, lon, ele|None, datetime|None)) untuk setiap titik track/route.
+    Raise GPXError bila XML rusak.
+    """
+    depth_in_point = 0
+    parents = []  # elemen yang sedang terbuka, untuk melepas titik dari parent-nya
+    try:
+        for event, elem in iterparse(fileobj, events=("start", "end")):
+            tag = _local(elem.tag)
+            if event == "start":
+                parents.append(elem)
+                if tag in POINT_TAGS:
+                    depth_in_point += 1
+                continue
+            parents.pop()
+            if tag in POINT_TAGS:
+                depth_in_point -= 1
+                try:
+                    lat, lon = float(elem.get("lat")), float(elem.get("lon"))
+                except (TypeError, ValueError):
+                    raise GPXError("Titik tanpa lat/lon yang valid")
+                ele = time = None
+                for child in elem:
+                    child_tag = _local(child.tag)
+                    if child_tag == "ele":
+                        try:
+                            ele = float(child.text)
+                        except (TypeError, ValueError):
+                            pass
+                    elif child_tag == "time":
+                        time = _parse_time(child.text)
+                yield "point", (lat, lon, ele, time)
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+            elif tag == "name" and not depth_in_point and elem.text:
+                yield "name", elem.text.strip()
+    except ParseError as e:
+        raise GPXError(f"GPX tidak valid: {e}")
+
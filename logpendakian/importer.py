@@ -0,0 +1,307 @@
+"""
+Import massal LogPendakian milik satu user dari CSV atau berkas GPX.
+
+- Nama gunung dicocokkan dengan satu dict yang dibangun sekali dari snapshot
+  katalog (nama ternormalisasi, dengan/tanpa awalan "Gunung"); kolom
+  provinsi opsional untuk membedakan nama yang sama.
+- Tanggal, rating, dan team_size divalidasi di Python sesuai check
+  constraint model, jadi baris yang salah dilaporkan tanpa round trip ke
+  database.
+- Baris valid dikumpulkan lalu disimpan per BATCH_SIZE dengan bulk_create
+  (ignore_conflicts untuk uniq_user_gunung_start). Kombinasi gunung & tanggal
+  mulai yang sudah ada dilaporkan sebagai duplikat.
+- bulk_create tidak memicu signal, jadi statistik gunung (stats.py) dan
+  statistik user (dashboard.py) diperbarui dengan delta per batch.
+- Setiap berkas GPX juga disimpan sebagai LogTrack (tracks.py) log-nya.
+
+Hasilnya laporan per baris: jumlah yang dibuat/duplikat dan daftar error.
+"""
+import csv
+import io
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from explore_gunung import autocomplete, catalog, geo
+from logpendakian import dashboard, gpx, stats, tracks
+
+BATCH_SIZE = 500
+MAX_ERRORS = 500            # error yang dicantumkan di laporan (sisanya hanya dihitung)
+GPX_MATCH_RADIUS_KM = 5     # titik tertinggi track harus sedekat ini ke gunung katalog
+SUMMIT_TOLERANCE_M = 150    # selisih elevasi maksimum ke puncak agar dianggap sampai puncak
+TEAM_SIZE_MAX = 32767       # PositiveSmallIntegerField
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+TRUE_VALUES = {"1", "true", "ya", "y", "yes", "iya"}
+FALSE_VALUES = {"0", "false", "tidak", "t", "no", "n", "belum"}
+
+# nama kolom CSV yang dikenali -> field
+COLUMN_ALIASES = {
+    "gunung": "gunung", "nama gunung": "gunung", "mountain": "gunung",
+    "provinsi": "provinsi", "provinsi gunung": "provinsi",
+    "start_date": "start_date", "tanggal mulai": "start_date", "mulai": "start_date",
+    "end_date": "end_date", "tanggal selesai": "end_date", "selesai": "end_date",
+    "summit_reached": "summit_reached", "sampai puncak": "summit_reached", "puncak": "summit_reached",
+    "team_size": "team_size", "jumlah tim": "team_size",
+    "rating": "rating",
+    "notes": "notes", "catatan": "notes",
+}
+
+
+class RowError(ValueError):
+    pass
+
+
+def parse_date(value, field):
+    value = (value or "").strip()
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise RowError(f"{field} tidak valid: {value!r} (gunakan YYYY-MM-DD atau DD/MM/YYYY)")
+
+
+def parse_int(value, field):
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError(f"{field} harus berupa angka: {value!r}")
+
+
+def parse_bool(value):
+    value = (value or "").strip().lower()
+    if not value or value in TRUE_VALUES:
+        return True  # default model: summit_reached=True
+    if value in FALSE_VALUES:
+        return False
+    raise RowError(f"summit_reached tidak dikenali: {value!r}")
+
+
+def validate(start_date, end_date, team_size, rating):
+    """Cek yang sama dengan constraint LogPendakian, di Python."""
+    if start_date is None:
+        raise RowError("start_date wajib diisi")
+    if end_date is not None and end_date < start_date:
+        raise RowError("end_date tidak boleh sebelum start_date (end_gte_start_or_null)")
+    if rating is not None and not 1 <= rating <= 5:
+        raise RowError("rating harus 1-5 (rating_1_5_or_null)")
+    if team_size is not None and not 0 <= team_size <= TEAM_SIZE_MAX:
+        raise RowError(f"team_size harus 0-{TEAM_SIZE_MAX}")
+
+
+class GunungLookup:
+    """Pencarian gunung berdasarkan nama, dari satu dict yang dibangun sekali per import."""
+
+    def __init__(self, snapshot=None):
+        self.snapshot = snapshot or catalog.get()
+        self.by_name = defaultdict(list)  # nama ternormalisasi -> [indeks baris snapshot]
+        for i, row in enumerate(self.snapshot.rows):
+            for key in self.keys(row.nama):
+                if i not in self.by_name[key]:
+                    self.by_name[key].append(i)
+
+    @staticmethod
+    def keys(nama):
+        name = autocomplete.normalize(nama)
+        tokens = name.split()
+        while tokens and tokens[0] in autocomplete.STOPWORDS:
+            tokens = tokens[1:]
+        return {name, " ".join(tokens)} - {""}
+
+    def resolve(self, nama, provinsi=""):
+        """Baris snapshot untuk nama (+ provinsi opsional). Raise RowError bila tidak ada/ambigu."""
+        candidates = []
+        for key in self.keys(nama):
+            candidates += [i for i in self.by_name.get(key, ()) if i not in candidates]
+        if provinsi:
+            wanted = autocomplete.normalize(provinsi)
+            candidates = [i for i in candidates if autocomplete.normalize(self.snapshot.rows[i].provinsi) == wanted]
+        if not candidates:
+            raise RowError(f"Gunung tidak ditemukan: {nama!r}")
+        if len(candidates) > 1:
+            raise RowError(f"Nama gunung {nama!r} ambigu, isi kolom provinsi")
+        return self.snapshot.rows[candidates[0]]
+
+    def find_in_text(self, text):
+        """Baris snapshot pertama yang namanya muncul sebagai rangkaian kata di `text` (mis. nama track)."""
+        tokens = autocomplete.normalize(text).split()
+        for size in range(min(4, len(tokens)), 0, -1):
+            for pos in range(len(tokens) - size + 1):
+                found = self.by_name.get(" ".join(tokens[pos:pos + size]))
+                if found and len(found) == 1:
+                    return self.snapshot.rows[found[0]]
+        return None
+
+
+class LogImporter:
+    def __init__(self, user, dry_run=False, batch_size=BATCH_SIZE):
+        from logpendakian.models import LogPendakian
+
+        self.user = user
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.lookup = GunungLookup()
+        # kombinasi yang sudah ada milik user ini (satu query), untuk laporan duplikat
+        self.seen = set(LogPendakian.objects.filter(user=user).values_list("gunung_id", "start_date"))
+        self.pending = []
+        self.pending_tracks = {}  # log id -> field LogTrack
+        self.created = self.duplicates = self.error_count = 0
+        self.errors = []
+
+    # -------------------------------------------------
+    def error(self, source, row, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"source": source, "row": row, "error": message})
+
+    def add(self, source, row, gunung, start_date, end_date=None, summit_reached=True,
+            team_size=None, rating=None, notes="", track=None):
+        """Validasi satu log lalu antrekan untuk disimpan. Return True bila diterima."""
+        from logpendakian.models import LogPendakian
+
+        try:
+            validate(start_date, end_date, team_size, rating)
+        except RowError as e:
+            self.error(source, row, str(e))
+            return False
+        key = (gunung.id, start_date)
+        if key in self.seen:
+            self.duplicates += 1
+            self.error(source, row, f"Log {gunung.nama} tanggal {start_date} sudah ada")
+            return False
+        self.seen.add(key)
+        log = LogPendakian(
+            id=uuid.uuid4(), user=self.user, gunung_id=gunung.id, start_date=start_date, end_date=end_date,
+            summit_reached=summit_reached, team_size=team_size, rating=rating, notes=notes or "",
+            gunung_ketinggian=gunung.ketinggian or 0, gunung_provinsi=gunung.provinsi,
+        )
+        self.pending.append(log)
+        if track is not None and not self.dry_run:
+            self.pending_tracks[log.pk] = track.fields()  # blob ringkas, array float64 bisa dibuang
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        from logpendakian.models import LogPendakian, LogTrack
+
+        batch, self.pending = self.pending, []
+        track_fields, self.pending_tracks = self.pending_tracks, {}
+        if not batch:
+            return
+        if self.dry_run:
+            self.created += len(batch)
+            return
+        with transaction.atomic():
+            LogPendakian.objects.bulk_create(batch, ignore_conflicts=True)
+            # yang benar-benar masuk (baris lain bisa dibuat bersamaan oleh request lain)
+            inserted = set(LogPendakian.objects.filter(pk__in=[log.pk for log in batch]).values_list("pk", flat=True))
+            logs = [log for log in batch if log.pk in inserted]
+            values = [stats.capture(log) for log in logs]
+            dashboard.apply_many([(1, v) for v in values])
+            stats.apply(stats.diff(new=[stats.contribution(v) for v in values]))
+            LogTrack.objects.bulk_create(
+                [LogTrack(log_id=log.pk, **track_fields[log.pk]) for log in logs if log.pk in track_fields],
+                batch_size=50,
+            )
+        self.created += len(logs)
+        self.duplicates += len(batch) - len(logs)
+        if logs:
+            stats.invalidate(on_commit=True)
+
+    def finish(self):
+        self.flush()
+        return {
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "dry_run": self.dry_run,
+        }
+
+    # -------------------------------------------------
+    def import_csv(self, fileobj, source="csv"):
+        """Baca CSV (bytes atau teks) baris demi baris."""
+        if not isinstance(fileobj, io.TextIOBase):
+            fileobj = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(fileobj)
+        columns = {name: COLUMN_ALIASES.get(name.strip().lower()) for name in (reader.fieldnames or [])}
+        if not {"gunung", "start_date"} <= set(columns.values()):
+            self.error(source, 1, "Header CSV harus memuat kolom gunung dan start_date")
+            return
+        try:
+            for line, raw in enumerate(reader, start=2):
+                values = {field: (raw.get(name) or "") for name, field in columns.items() if field}
+                try:
+                    gunung = self.lookup.resolve(values["gunung"], values.get("provinsi", ""))
+                    self.add(
+                        source, line, gunung,
+                        start_date=parse_date(values["start_date"], "start_date"),
+                        end_date=parse_date(values.get("end_date"), "end_date"),
+                        summit_reached=parse_bool(values.get("summit_reached")),
+                        team_size=parse_int(values.get("team_size"), "team_size"),
+                        rating=parse_int(values.get("rating"), "rating"),
+                        notes=values.get("notes", "").strip(),
+                    )
+                except RowError as e:
+                    self.error(source, line, str(e))
+        except (UnicodeDecodeError, csv.Error) as e:
+            self.error(source, None, f"CSV tidak bisa dibaca: {e}")
+
+    def import_gpx(self, fileobj, source="gpx"):
+        """
+        Satu berkas GPX = satu log (dengan track-nya). Tanggal dari waktu
+        titik pertama/terakhir, gunung dari nama track atau gunung terdekat
+        dari titik tertinggi, summit_reached dari elevasi titik tertinggi
+        bila tersedia.
+        """
+        try:
+            track = tracks.parse(fileobj)
+        except gpx.GPXError as e:
+            self.error(source, None, str(e))
+            return
+        if track.started_at is None:
+            self.error(source, None, "GPX tidak memiliki waktu (<time>) untuk menentukan tanggal")
+            return
+
+        gunung = None
+        for name in track.names:
+            gunung = self.lookup.find_in_text(name)
+            if gunung:
+                break
+        lat, lon, ele = track.highest
+        if gunung is None:
+            snapshot, hits = geo.nearby(lat, lon, k=1, radius_km=GPX_MATCH_RADIUS_KM)
+            gunung = snapshot.rows[hits[0][1]] if hits else None
+        if gunung is None:
+            self.error(source, None, "Gunung tidak dikenali dari nama track maupun koordinat")
+            return
+
+        summit = True if ele is None or not gunung.ketinggian else ele >= gunung.ketinggian - SUMMIT_TOLERANCE_M
+        start, end = timezone.localtime(track.started_at).date(), timezone.localtime(track.finished_at).date()
+        self.add(source, None, gunung, start_date=start, end_date=end, summit_reached=summit, track=track)
+
+
+def import_files(user, files, dry_run=False):
+    """
+    files: iterable (nama berkas, file object biner). Berkas .csv dan .gpx
+    diproses sesuai ekstensinya. Return laporan (dict).
+    """
+    importer = LogImporter(user, dry_run=dry_run)
+    for name, fileobj in files:
+        lower = name.lower()
+        if lower.endswith(".csv"):
+            importer.import_csv(fileobj, source=name)
+        elif lower.endswith(".gpx"):
+            importer.import_gpx(fileobj, source=name)
+        else:
+            importer.error(name, None, "Hanya berkas .csv atau .gpx yang didukung")
+    return importer.finish()
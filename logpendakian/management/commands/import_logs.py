@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from logpendakian import importer
+
+
+class Command(BaseCommand):
+    help = 'Import massal log pendakian satu user dari berkas CSV dan/atau GPX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Pemilik log yang diimport')
+        parser.add_argument('paths', nargs='+', help='Berkas .csv / .gpx')
+        parser.add_argument('--dry-run', action='store_true', help='Validasi saja tanpa menyimpan')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' tidak ditemukan")
+
+        handles = []
+        try:
+            for path in options['paths']:
+                try:
+                    handles.append((path, open(path, 'rb')))
+                except OSError as e:
+                    raise CommandError(f'Tidak bisa membuka {path}: {e}')
+            report = importer.import_files(user, handles, dry_run=options['dry_run'])
+        finally:
+            for _, fileobj in handles:
+                fileobj.close()
+
+        for error in report['errors']:
+            row = f":{error['row']}" if error['row'] else ''
+            self.stdout.write(self.style.WARNING(f"⚠️ {error['source']}{row} — {error['error']}"))
+        prefix = '🔎 [dry run] ' if report['dry_run'] else '✅ '
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{report['created']} log dibuat, {report['duplicates']} duplikat, {report['error_count']} error."
+        ))
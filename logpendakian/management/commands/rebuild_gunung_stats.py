@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from logpendakian import stats
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang GunungStats dari seluruh LogPendakian (bila statistik inkremental melenceng)'
+
+    def handle(self, *args, **options):
+        fresh, previous = stats.rebuild()
+        stats.invalidate()  # bulk_create tidak memicu signal
+
+        # laporkan gunung yang statistiknya berbeda dari hasil hitung ulang
+        drift = [
+            gunung_id for gunung_id in fresh.keys() | previous.keys()
+            if any(fresh.get(gunung_id, {}).get(f, 0) != previous.get(gunung_id, {}).get(f, 0) for f in stats.FIELDS)
+        ]
+        if drift:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} gunung memiliki statistik yang melenceng dan sudah diperbaiki.'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Statistik {len(fresh)} gunung dihitung ulang.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from logpendakian import dashboard
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang statistik pendakian per user (UserClimbStats & MonthlyClimbStats) dari seluruh LogPendakian'
+
+    def handle(self, *args, **options):
+        users, months = dashboard.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✅ Statistik {users} user ({months} bucket bulanan) dihitung ulang.'))
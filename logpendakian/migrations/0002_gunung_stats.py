@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_stats(apps, schema_editor):
+    # satu baris GunungStats per gunung yang sudah punya log
+    LogPendakian = apps.get_model('logpendakian', 'LogPendakian')
+    GunungStats = apps.get_model('logpendakian', 'GunungStats')
+    totals = {}
+    logs = LogPendakian.objects.values_list(
+        'gunung_id', 'summit_reached', 'rating', 'team_size', 'start_date', 'end_date',
+    ).iterator(chunk_size=2000)
+    for gunung_id, summit_reached, rating, team_size, start_date, end_date in logs:
+        row = totals.setdefault(gunung_id, {
+            'total_logs': 0, 'summit_count': 0, 'rating_sum': 0, 'rating_count': 0,
+            'team_size_sum': 0, 'team_size_count': 0, 'duration_sum': 0, 'duration_count': 0,
+        })
+        row['total_logs'] += 1
+        row['summit_count'] += int(bool(summit_reached))
+        if rating is not None:
+            row['rating_sum'] += rating
+            row['rating_count'] += 1
+        if team_size is not None:
+            row['team_size_sum'] += team_size
+            row['team_size_count'] += 1
+        if start_date and end_date:
+            row['duration_sum'] += (end_date - start_date).days + 1
+            row['duration_count'] += 1
+    GunungStats.objects.bulk_create(
+        [GunungStats(gunung_id=gunung_id, **values) for gunung_id, values in totals.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explore_gunung', '0004_coordinates'),
+        ('logpendakian', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GunungStats',
+            fields=[
+                ('gunung', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='explore_gunung.gunung')),
+                ('total_logs', models.PositiveIntegerField(default=0)),
+                ('summit_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('team_size_sum', models.PositiveIntegerField(default=0)),
+                ('team_size_count', models.PositiveIntegerField(default=0)),
+                ('duration_sum', models.PositiveIntegerField(default=0)),
+                ('duration_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:53
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+MAX_TRIP_DAYS = 366
+
+
+def _bump(counts, key):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def backfill_user_stats(apps, schema_editor):
+    # ketinggian & provinsi diambil dari Gunung saat backfill (log belum punya salinannya)
+    LogPendakian = apps.get_model('logpendakian', 'LogPendakian')
+    UserClimbStats = apps.get_model('logpendakian', 'UserClimbStats')
+    MonthlyClimbStats = apps.get_model('logpendakian', 'MonthlyClimbStats')
+    Gunung = apps.get_model('explore_gunung', 'Gunung')
+
+    gunung = {pk: (ketinggian or 0, provinsi) for pk, ketinggian, provinsi
+              in Gunung.objects.values_list('id', 'ketinggian', 'provinsi')}
+    aggs, buckets = {}, {}
+
+    def bucket(user_id, day):
+        key = (user_id, day.replace(day=1))
+        if key not in buckets:
+            buckets[key] = MonthlyClimbStats(user_id=user_id, month=key[1], days=[0] * 31)
+        return buckets[key]
+
+    logs = (LogPendakian.objects.filter(user__isnull=False).order_by('start_date', 'id')
+            .values_list('id', 'user_id', 'gunung_id', 'summit_reached', 'start_date', 'end_date')
+            .iterator(chunk_size=2000))
+    for log_id, user_id, gunung_id, summit_reached, start_date, end_date in logs:
+        agg = aggs.get(user_id)
+        if agg is None:
+            agg = aggs[user_id] = UserClimbStats(user_id=user_id, gunung_counts={}, provinsi_counts={})
+        ketinggian, provinsi = gunung.get(gunung_id, (0, ''))
+        summit = int(bool(summit_reached))
+        for target in (agg, bucket(user_id, start_date)):
+            target.total_logs += 1
+            target.summit_count += summit
+            target.summit_ketinggian += summit * ketinggian
+        _bump(agg.gunung_counts, str(gunung_id))
+        if provinsi:
+            _bump(agg.provinsi_counts, provinsi)
+
+        duration = (end_date - start_date).days + 1 if end_date else None
+        for n in range(min(duration or 1, MAX_TRIP_DAYS)):
+            day = start_date + timedelta(days=n)
+            bucket(user_id, day).days[day.day - 1] += 1
+        if duration and duration > agg.longest_days:
+            agg.longest_days, agg.longest_log_id = duration, log_id
+
+    UserClimbStats.objects.bulk_create(aggs.values(), batch_size=500)
+    MonthlyClimbStats.objects.bulk_create(buckets.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logpendakian', '0002_gunung_stats'),
+        ('userprofile', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserClimbStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='climb_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_logs', models.PositiveIntegerField(default=0)),
+                ('summit_count', models.PositiveIntegerField(default=0)),
+                ('summit_ketinggian', models.PositiveBigIntegerField(default=0)),
+                ('gunung_counts', models.JSONField(default=dict)),
+                ('provinsi_counts', models.JSONField(default=dict)),
+                ('longest_days', models.PositiveIntegerField(default=0)),
+                ('longest_log', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='logpendakian.logpendakian')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthlyClimbStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('total_logs', models.PositiveIntegerField(default=0)),
+                ('summit_count', models.PositiveIntegerField(default=0)),
+                ('summit_ketinggian', models.PositiveBigIntegerField(default=0)),
+                ('days', models.JSONField(default=list)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='climb_months', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month'), name='uniq_user_month')],
+            },
+        ),
+        migrations.RunPython(backfill_user_stats, migrations.RunPython.noop),
+    ]
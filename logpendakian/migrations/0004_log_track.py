@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logpendakian', '0003_user_climb_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogTrack',
+            fields=[
+                ('log', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='track', serialize=False, to='logpendakian.logpendakian')),
+                ('points', models.BinaryField()),
+                ('levels', models.BinaryField()),
+                ('level_sizes', models.JSONField(default=list)),
+                ('point_count', models.PositiveIntegerField(default=0)),
+                ('distance_m', models.FloatField(default=0)),
+                ('elevation_gain_m', models.FloatField(default=0)),
+                ('elevation_loss_m', models.FloatField(default=0)),
+                ('max_elevation_m', models.FloatField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('uploaded_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
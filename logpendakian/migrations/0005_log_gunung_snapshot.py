@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:49
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_gunung_snapshot(apps, schema_editor):
+    # statistik user yang ada dihitung dari ketinggian & provinsi gunung saat ini
+    LogPendakian = apps.get_model('logpendakian', 'LogPendakian')
+    Gunung = apps.get_model('explore_gunung', 'Gunung')
+    gunung = Gunung.objects.filter(pk=OuterRef('gunung_id'))
+    LogPendakian.objects.update(
+        gunung_ketinggian=Subquery(gunung.values('ketinggian')[:1]),
+        gunung_provinsi=Subquery(gunung.values('provinsi')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('explore_gunung', '0004_coordinates'),
+        ('logpendakian', '0004_log_track'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logpendakian',
+            name='gunung_ketinggian',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='logpendakian',
+            name='gunung_provinsi',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_gunung_snapshot, migrations.RunPython.noop),
+    ]
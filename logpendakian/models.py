@@ -23,6 +23,10 @@ class LogPendakian(models.Model):
     summit_reached = models.BooleanField(default=True)
     team_size = models.PositiveSmallIntegerField(null=True, blank=True)
     rating = models.PositiveSmallIntegerField(null=True, blank=True)
+    # salinan ketinggian & provinsi gunung saat log dibuat/dipindah gunung; nilai inilah yang
+    # ditambahkan ke statistik user dan dikurangi lagi saat log diubah/dihapus (dashboard.py)
+    gunung_ketinggian = models.PositiveIntegerField(default=0, editable=False)
+    gunung_provinsi = models.CharField(max_length=255, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -48,6 +52,14 @@ class LogPendakian(models.Model):
             ),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # nilai saat dimuat, untuk menghitung delta statistik saat disimpan/dihapus
+        from logpendakian import stats
+        instance._stats_loaded = stats.capture(instance)
+        return instance
+
     def __str__(self):
         gunung_name = getattr(self.gunung, "nama", "(tanpa nama)")
         prof = getattr(self, "user", None)  # ini UserProfile
@@ -67,3 +79,135 @@ class LogPendakian(models.Model):
         return None
     
     
+
+class GunungStats(models.Model):
+    """
+    Statistik pendakian per gunung, dijaga inkremental (lihat logpendakian/stats.py).
+    Disimpan sebagai jumlah & cacah supaya setiap perubahan log cukup berupa delta.
+    """
+    gunung = models.OneToOneField(
+        "explore_gunung.Gunung",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    total_logs = models.PositiveIntegerField(default=0)
+    summit_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    team_size_sum = models.PositiveIntegerField(default=0)
+    team_size_count = models.PositiveIntegerField(default=0)
+    duration_sum = models.PositiveIntegerField(default=0)
+    duration_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Statistik {getattr(self.gunung, 'nama', self.gunung_id)}"
+
+    @staticmethod
+    def _avg(total, count):
+        return round(total / count, 2) if count else None
+
+    @property
+    def summit_rate(self):
+        return self._avg(self.summit_count, self.total_logs)
+
+    @property
+    def avg_rating(self):
+        return self._avg(self.rating_sum, self.rating_count)
+
+    @property
+    def avg_team_size(self):
+        return self._avg(self.team_size_sum, self.team_size_count)
+
+    @property
+    def avg_duration_days(self):
+        return self._avg(self.duration_sum, self.duration_count)
+
+
+class UserClimbStats(models.Model):
+    """
+    Ringkasan riwayat pendakian satu user, dijaga inkremental (lihat
+    logpendakian/dashboard.py). Jumlah log per gunung/provinsi disimpan
+    supaya jumlah gunung & provinsi berbeda tetap bisa dihitung dari delta.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="climb_stats",
+    )
+    total_logs = models.PositiveIntegerField(default=0)
+    summit_count = models.PositiveIntegerField(default=0)
+    summit_ketinggian = models.PositiveBigIntegerField(default=0)  # total mdpl gunung yang dicapai puncaknya
+    gunung_counts = models.JSONField(default=dict)    # {gunung_id: jumlah log}
+    provinsi_counts = models.JSONField(default=dict)  # {provinsi: jumlah log}
+    longest_log = models.ForeignKey(
+        LogPendakian, on_delete=models.SET_NULL, null=True, blank=True, related_name="+",
+    )
+    longest_days = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Statistik pendakian {self.user_id}"
+
+    @property
+    def distinct_gunung(self):
+        return len(self.gunung_counts)
+
+    @property
+    def distinct_provinsi(self):
+        return len(self.provinsi_counts)
+
+
+class MonthlyClimbStats(models.Model):
+    """Bucket bulanan per user: jumlah pendakian (per bulan mulai) dan hari aktif per tanggal."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="climb_months",
+    )
+    month = models.DateField()  # tanggal 1 bulan tersebut
+    total_logs = models.PositiveIntegerField(default=0)
+    summit_count = models.PositiveIntegerField(default=0)
+    summit_ketinggian = models.PositiveBigIntegerField(default=0)
+    days = models.JSONField(default=list)  # 31 angka: jumlah log yang sedang berlangsung per tanggal
+
+    class Meta:
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "month"], name="uniq_user_month"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m}"
+
+
+class LogTrack(models.Model):
+    """
+    Track GPX opsional sebuah log. Titik disimpan sebagai satu blob float32
+    (lat, lon, ele) dan indeks hasil Douglas-Peucker per toleransi sebagai
+    blob uint32 (lihat logpendakian/tracks.py); metrik dihitung saat upload.
+    """
+    log = models.OneToOneField(
+        LogPendakian,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="track",
+    )
+    points = models.BinaryField()
+    levels = models.BinaryField()
+    level_sizes = models.JSONField(default=list)  # jumlah indeks per toleransi di tracks.TOLERANCES_M
+    point_count = models.PositiveIntegerField(default=0)
+    distance_m = models.FloatField(default=0)
+    elevation_gain_m = models.FloatField(default=0)
+    elevation_loss_m = models.FloatField(default=0)
+    max_elevation_m = models.FloatField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    uploaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Track {self.log_id} ({self.point_count} titik)"
+
+    @property
+    def distance_km(self):
+        return round(self.distance_m / 1000, 1)
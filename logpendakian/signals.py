@@ -0,0 +1,39 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from logpendakian import dashboard, stats
+from logpendakian.models import LogPendakian
+
+
+def _log_changed(old, new):
+    dashboard.apply(old, new)
+    if stats.apply(stats.diff(old=[stats.contribution(old)], new=[stats.contribution(new)])):
+        stats.invalidate(on_commit=True)
+
+
+@receiver(pre_save, sender=LogPendakian)
+def log_saving(sender, instance, **kwargs):
+    # instance yang tidak dimuat dari database (mis. dibuat dengan pk lalu di-save)
+    # belum punya nilai lama: ambil sekali sebelum ditimpa
+    if getattr(instance, "_stats_loaded", None) is None and not instance._state.adding:
+        old = sender.objects.filter(pk=instance.pk).first()
+        instance._stats_loaded = old._stats_loaded if old else None
+    # log baru/pindah gunung: salin ketinggian & provinsi yang akan dijumlahkan ke statistik user
+    loaded = getattr(instance, "_stats_loaded", None)
+    if loaded is None or loaded["gunung_id"] != instance.gunung_id:
+        dashboard.fill_gunung(instance)
+
+
+@receiver(post_save, sender=LogPendakian)
+def log_saved(sender, instance, created, **kwargs):
+    new = stats.capture(instance)
+    if new is None:
+        # sebagian field tidak dimuat (QuerySet.only/defer): baca nilai yang tersimpan
+        new = sender.objects.get(pk=instance.pk)._stats_loaded
+    old = None if created else getattr(instance, "_stats_loaded", None)
+    _log_changed(old, new)
+    instance._stats_loaded = new
+
+
+@receiver(post_delete, sender=LogPendakian)
+def log_deleted(sender, instance, **kwargs):
+    _log_changed(getattr(instance, "_stats_loaded", None) or stats.capture(instance), None)
@@ -9,6 +9,11 @@
   const modal = document.getElementById("lp-modal");
   const modalBody = document.getElementById("lp-modal-body");
   const emptyBox = document.getElementById("lp-empty");
+  const listUrl = root.dataset.listUrl;
+  const moreBox = document.getElementById("lp-more");
+  const moreBtn = document.getElementById("lp-more-btn");
+  let nextCursor = root.dataset.nextCursor || "";
+  let loadingMore = false;
 
 
   function getCookie(name) {
@@ -87,9 +92,29 @@
       return ALL.filter(o => o.text.toLowerCase().startsWith(q));
     }
 
+    // Saran dari server (prefix + toleran salah ketik); fallback ke filter lokal
+    const autocompleteUrl = select.dataset.autocompleteUrl;
+    let suggestSeq = 0;
+    function fetchSuggestions() {
+      const q = (input.value || "").trim();
+      if (!autocompleteUrl || !q) return;
+      const seq = ++suggestSeq;
+      fetch(`${autocompleteUrl}?q=${encodeURIComponent(q)}&k=10`, { credentials: "same-origin" })
+        .then(res => (res.ok ? res.json() : null))
+        .then(data => {
+          if (!data || seq !== suggestSeq || panel.hasAttribute("hidden")) return;
+          const items = data.results
+            .map(g => ALL.find(o => o.value === g.id))
+            .filter(Boolean);
+          renderList(items, input.value);
+        })
+        .catch(() => {});
+    }
+
     function openPanel() {
       renderList(currentItems(), input.value);
       panel.removeAttribute("hidden");
+      fetchSuggestions();
     }
     function closePanel() {
       panel.setAttribute("hidden", "");
@@ -343,7 +368,10 @@ async function onSubmitDelete(e) {
     const byData = list.querySelector(`[data-id="${data.id}"]`);
     const byId = document.getElementById(`lp-item-${data.id}`);
     (byData || byId)?.remove();
-    if (list.children.length === 0 && emptyBox) emptyBox.removeAttribute("hidden");
+    if (list.children.length === 0) {
+      if (nextCursor) loadMore();
+      else if (emptyBox) emptyBox.removeAttribute("hidden");
+    }
     closeModal();
   } else {
     alert("Gagal menghapus.");
@@ -384,6 +412,40 @@ async function onSubmitDelete(e) {
     });
 
 
+  // Infinite scroll: ambil fragmen row.html halaman berikutnya memakai cursor
+  async function loadMore() {
+    if (!nextCursor || loadingMore) return;
+    loadingMore = true;
+    try {
+      const res = await fetch(`${listUrl}?cursor=${encodeURIComponent(nextCursor)}`, {
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+        credentials: "same-origin"
+      });
+      const data = await res.json();
+      if (!res.ok) throw new Error(data.error || res.status);
+      const tpl = document.createElement("template");
+      tpl.innerHTML = data.html.trim();
+      // lewati baris yang sudah ada (mis. baru dibuat lalu ikut di halaman berikutnya)
+      Array.from(tpl.content.children).forEach(node => {
+        if (!document.getElementById(node.id)) list.appendChild(node);
+      });
+      nextCursor = data.next_cursor || "";
+    } catch (err) {
+      console.error("Gagal memuat riwayat:", err);
+    } finally {
+      loadingMore = false;
+      if (moreBox) moreBox.hidden = !nextCursor;
+      if (emptyBox) emptyBox.hidden = list.children.length > 0 || !!nextCursor;
+    }
+  }
+
+  moreBtn?.addEventListener("click", loadMore);
+  if (moreBox && "IntersectionObserver" in window) {
+    new IntersectionObserver(entries => {
+      if (entries.some(e => e.isIntersecting)) loadMore();
+    }, { rootMargin: "400px" }).observe(moreBox);
+  }
+
   cta?.addEventListener("click", openCreateForm);
   fab?.addEventListener("click", openCreateForm);
 })();
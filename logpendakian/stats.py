@@ -0,0 +1,191 @@
+"""
+Pemeliharaan GunungStats secara inkremental.
+
+Setiap log menyumbang satu "kontribusi" (total, summit, jumlah & cacah
+rating/team_size/durasi) ke statistik gunungnya. Saat log dibuat, diubah,
+atau dihapus, hanya selisih kontribusi lama dan baru yang ditambahkan ke
+baris GunungStats lewat UPDATE ... SET x = x + delta, tanpa agregasi ulang.
+Kontribusi lama dihitung dari nilai saat log dimuat (capture() di
+LogPendakian.from_db); nilai yang sama dipakai statistik per user
+(logpendakian/dashboard.py).
+
+Operasi yang melewati signal (QuerySet.update, bulk_create) harus memanggil
+apply() sendiri; `python manage.py rebuild_gunung_stats` menghitung ulang
+semuanya dari nol bila statistik sempat melenceng.
+
+Untuk penyajian (explore, detail gunung) statistik dibaca dari peta per
+proses (current()) yang punya versi sendiri (STATS_VERSION_KEY), terpisah
+dari snapshot katalog: perubahan log cukup memanggil invalidate() di modul
+ini, sehingga katalog, autocomplete, KD-tree, dan cluster tidak dimuat ulang.
+"""
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from gundex.versioning import SharedVersion
+
+FIELDS = (
+    "total_logs", "summit_count",
+    "rating_sum", "rating_count",
+    "team_size_sum", "team_size_count",
+    "duration_sum", "duration_count",
+)
+# attname field LogPendakian yang memengaruhi statistik (gunung & user)
+TRACKED = ("user_id", "gunung_id", "summit_reached", "rating", "team_size", "start_date", "end_date",
+           "gunung_ketinggian", "gunung_provinsi")
+# nama field untuk QuerySet.only() saat menghitung ulang
+TRACKED_FIELDS = ("user", "gunung", "summit_reached", "rating", "team_size", "start_date", "end_date",
+                  "gunung_ketinggian", "gunung_provinsi")
+# ringkasan yang disajikan per gunung (properti GunungStats)
+SUMMARY = ("total_logs", "summit_rate", "avg_rating", "avg_team_size", "avg_duration_days")
+
+STATS_VERSION_KEY = "gunung:stats:version"
+_version = SharedVersion(STATS_VERSION_KEY)
+_lock = threading.Lock()
+_map = None
+
+
+def capture(log):
+    """Nilai field TRACKED (+ id) sebuah log, atau None bila ada yang belum dimuat."""
+    if set(TRACKED) & log.get_deferred_fields():
+        return None
+    values = {name: getattr(log, name) for name in TRACKED}
+    for name in ("start_date", "end_date"):
+        values[name] = log._meta.get_field(name).to_python(values[name])
+    values["id"] = log.pk
+    return values
+
+
+def duration_days(values):
+    start, end = values["start_date"], values["end_date"]
+    return (end - start).days + 1 if start and end else None
+
+
+def contribution(values):
+    """(gunung_id, {field: nilai}) sumbangan satu log hasil capture(), atau None."""
+    if values is None:
+        return None
+    duration = duration_days(values)
+    return values["gunung_id"], {
+        "total_logs": 1,
+        "summit_count": int(bool(values["summit_reached"])),
+        "rating_sum": values["rating"] or 0,
+        "rating_count": int(values["rating"] is not None),
+        "team_size_sum": values["team_size"] or 0,
+        "team_size_count": int(values["team_size"] is not None),
+        "duration_sum": duration or 0,
+        "duration_count": int(duration is not None),
+    }
+
+
+def diff(old=(), new=()):
+    """
+    Gabungkan kontribusi menjadi delta per gunung: `new` ditambah, `old`
+    dikurangi. Return {gunung_id: {field: delta}} tanpa delta nol.
+    """
+    deltas = {}
+    for sign, items in ((-1, old), (1, new)):
+        for item in items:
+            if item is None:
+                continue
+            gunung_id, values = item
+            delta = deltas.setdefault(gunung_id, dict.fromkeys(FIELDS, 0))
+            for field, value in values.items():
+                delta[field] += sign * value
+    return {
+        gunung_id: {f: d for f, d in delta.items() if d}
+        for gunung_id, delta in deltas.items()
+        if any(delta.values())
+    }
+
+
+def apply(deltas):
+    """Terapkan delta dari diff(); baris GunungStats dibuat bila belum ada. Return True bila ada perubahan."""
+    from logpendakian.models import GunungStats
+
+    for gunung_id, delta in deltas.items():
+        expressions = {f: F(f) + d for f, d in delta.items()}
+        if GunungStats.objects.filter(pk=gunung_id).update(**expressions):
+            continue
+        try:
+            with transaction.atomic():
+                GunungStats.objects.create(gunung_id=gunung_id, **{f: max(d, 0) for f, d in delta.items()})
+        except IntegrityError:
+            # dibuat bersamaan oleh request lain
+            GunungStats.objects.filter(pk=gunung_id).update(**expressions)
+    return bool(deltas)
+
+
+def totals(logs):
+    """Hitung statistik dari nol: {gunung_id: {field: nilai}} untuk iterable log."""
+    return diff(new=(contribution(capture(log)) for log in logs))
+
+
+def rebuild():
+    """Ganti seluruh isi GunungStats dengan hasil totals(). Return (totals, statistik lama)."""
+    from logpendakian.models import GunungStats, LogPendakian
+
+    logs = LogPendakian.objects.only(*TRACKED_FIELDS).iterator(chunk_size=2000)
+    fresh = totals(logs)
+    with transaction.atomic():
+        previous = {row["gunung_id"]: row for row in GunungStats.objects.values("gunung_id", *FIELDS)}
+        GunungStats.objects.all().delete()
+        GunungStats.objects.bulk_create(
+            [GunungStats(gunung_id=gunung_id, **values) for gunung_id, values in fresh.items()],
+            batch_size=500,
+        )
+    return fresh, previous
+
+
+# =====================================================
+# 🔹 PETA STATISTIK PER PROSES
+# =====================================================
+def summary(stats):
+    """Ringkasan satu GunungStats untuk JSON/template."""
+    return {name: getattr(stats, name) for name in SUMMARY}
+
+
+class StatsMap:
+    """Ringkasan statistik semua gunung untuk satu versi: {gunung_id (str): dict}."""
+
+    def __init__(self, version, items):
+        self.version = version
+        self.data = dict(items)
+        self.empty = summary(_empty_stats())
+
+    def get(self, gunung_id):
+        """Ringkasan untuk id gunung; gunung tanpa log mendapat total 0 & rata-rata None."""
+        return self.data.get(str(gunung_id), self.empty)
+
+
+def _empty_stats():
+    from logpendakian.models import GunungStats
+
+    return GunungStats(**dict.fromkeys(FIELDS, 0))
+
+
+def _load(version):
+    from logpendakian.models import GunungStats
+
+    return StatsMap(version, ((str(row.gunung_id), summary(row)) for row in GunungStats.objects.all()))
+
+
+def current():
+    """Peta statistik milik proses ini; dimuat ulang (satu query) bila versinya berubah."""
+    global _map
+    version = _version.get()
+    stats_map = _map
+    if stats_map is not None and stats_map.version == version:
+        return stats_map
+    with _lock:
+        if _map is None or _map.version != version:
+            _map = _load(version)
+        return _map
+
+
+def invalidate(on_commit=False):
+    """Tandai peta statistik usang di semua worker (on_commit: seperti catalog.invalidate)."""
+    _version.bump()
+    if on_commit:
+        transaction.on_commit(invalidate)
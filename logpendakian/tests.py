@@ -1,3 +1,4 @@
+import re
 from datetime import date, timedelta
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -163,3 +164,610 @@ class LogPendakianTests(TestCase):
         self.login(self.user)
         r = self.ajax_get("logpendakian:delete", foreign.pk)
         self.assertEqual(r.status_code, 404)
+
+
+class GunungStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user("s1", "s1@example.com", "pass")
+        cls.g1 = Gunung.objects.create(nama="Merbabu", provinsi="Jawa Tengah", ketinggian=3145)
+        cls.g2 = Gunung.objects.create(nama="Lawu", provinsi="Jawa Tengah", ketinggian=3265)
+        cls.d1 = date(2024, 5, 1)
+
+    def stats(self, gunung):
+        from logpendakian.models import GunungStats
+        return GunungStats.objects.filter(pk=gunung.pk).first()
+
+    def assertMatchesRebuild(self):
+        from logpendakian import stats
+        from logpendakian.models import GunungStats
+        stored = {
+            row["gunung_id"]: {f: row[f] for f in stats.FIELDS if row[f]}
+            for row in GunungStats.objects.values("gunung_id", *stats.FIELDS)
+            if row["total_logs"]
+        }
+        self.assertEqual(stored, stats.totals(LogPendakian.objects.all()))
+
+    def test_create_update_delete_apply_deltas(self):
+        log = LogPendakian.objects.create(user=self.user, gunung=self.g1, start_date=self.d1,
+                                          end_date=self.d1 + timedelta(days=2), rating=4, team_size=3)
+        LogPendakian.objects.create(user=self.user, gunung=self.g1, start_date=self.d1 + timedelta(days=30),
+                                    summit_reached=False, rating=2)
+        s = self.stats(self.g1)
+        self.assertEqual((s.total_logs, s.summit_rate, s.avg_rating, s.avg_team_size, s.avg_duration_days),
+                         (2, 0.5, 3.0, 3.0, 3.0))
+
+        # pindah gunung + ubah rating: statistik lama dikurangi, yang baru ditambah
+        log = LogPendakian.objects.get(pk=log.pk)
+        log.gunung, log.rating = self.g2, 5
+        log.save()
+        self.assertEqual((self.stats(self.g1).total_logs, self.stats(self.g1).avg_rating), (1, 2.0))
+        self.assertEqual((self.stats(self.g2).total_logs, self.stats(self.g2).avg_rating), (1, 5.0))
+        self.assertMatchesRebuild()
+
+        LogPendakian.objects.filter(gunung=self.g2).delete()
+        self.assertEqual(self.stats(self.g2).total_logs, 0)
+        self.assertMatchesRebuild()
+
+    def test_views_keep_stats_in_sync(self):
+        self.client.login(username="s1", password="pass")
+        payload = {"gunung": self.g1.pk, "start_date": str(self.d1), "end_date": str(self.d1), "rating": 5,
+                   "summit_reached": "on"}
+        self.client.post(reverse("logpendakian:create"), payload, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        log = LogPendakian.objects.get()
+        self.client.post(reverse("logpendakian:update", args=[log.pk]), {**payload, "rating": 1},
+                         HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(self.stats(self.g1).avg_rating, 1.0)
+        self.assertMatchesRebuild()
+        self.client.post(reverse("logpendakian:delete", args=[log.pk]), HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(self.stats(self.g1).total_logs, 0)
+
+    def test_update_without_tracked_changes_writes_no_stats(self):
+        log = LogPendakian.objects.create(user=self.user, gunung=self.g1, start_date=self.d1)
+        log = LogPendakian.objects.get(pk=log.pk)
+        log.notes = "catatan baru"
+        with self.assertNumQueries(1):  # hanya UPDATE log
+            log.save()
+
+    def test_rebuild_command_repairs_drift(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from logpendakian.models import GunungStats
+        LogPendakian.objects.create(user=self.user, gunung=self.g1, start_date=self.d1, rating=3)
+        GunungStats.objects.filter(pk=self.g1.pk).update(total_logs=10)  # melewati signal
+        out = StringIO()
+        call_command("rebuild_gunung_stats", stdout=out)
+        self.assertIn("1 gunung memiliki statistik yang melenceng", out.getvalue())
+        self.assertEqual(self.stats(self.g1).total_logs, 1)
+
+    def test_catalog_detail_and_popular_sort(self):
+        for offset in range(3):
+            LogPendakian.objects.create(user=self.user, gunung=self.g2, start_date=self.d1 + timedelta(days=offset), rating=4)
+        self.client.login(username="s1", password="pass")
+        data = self.client.get(reverse("explore_gunung:show_json"), {"sort": "populer"}).json()
+        self.assertEqual([g["nama"] for g in data["results"]], ["Lawu", "Merbabu"])
+        self.assertEqual(data["results"][0]["stats"]["total_logs"], 3)
+        self.assertIsNone(data["results"][1]["stats"]["avg_rating"])
+
+        page = self.client.get(reverse("explore_gunung:show_json"), {"sort": "populer", "limit": 1, "cursor": ""}).json()
+        rest = self.client.get(reverse("explore_gunung:show_json"),
+                               {"sort": "populer", "limit": 1, "cursor": page["next_cursor"]}).json()
+        self.assertEqual(rest["results"][0]["nama"], "Merbabu")
+
+        r = self.client.get(reverse("explore_gunung:show_gunung", args=[self.g2.pk]))
+        self.assertContains(r, "Total pendakian")
+        self.assertContains(r, "100%")
+
+    def test_log_write_keeps_catalog_snapshot(self):
+        from explore_gunung import catalog
+        snapshot = catalog.get()
+        LogPendakian.objects.create(user=self.user, gunung=self.g2, start_date=self.d1, rating=4)
+        fresh = catalog.get()
+        self.assertEqual(fresh.version, snapshot.version)  # autocomplete/geo/cluster tidak dibangun ulang
+        self.assertIs(fresh.rows, snapshot.rows)
+        self.assertEqual(fresh.stats.get(self.g2.pk)["total_logs"], 1)
+        self.assertEqual(snapshot.stats.get(self.g2.pk)["total_logs"], 0)
+        self.assertEqual(fresh.orders["populer"][0], fresh.by_id[str(self.g2.pk)])
+
+
+class LogListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from logpendakian import views
+        User = get_user_model()
+        cls.user = User.objects.create_user("p1", "p1@example.com", "pass")
+        cls.gunung = [Gunung.objects.create(nama=f"Gunung {i}") for i in range(3)]
+        cls.page_size = views.LOG_PAGE_SIZE
+        start = date(2020, 1, 1)
+        cls.logs = [
+            LogPendakian.objects.create(user=cls.user, gunung=cls.gunung[i % 3], start_date=start + timedelta(days=i // 3))
+            for i in range(cls.page_size + 5)
+        ]
+
+    def setUp(self):
+        self.client.login(username="p1", password="pass")
+
+    def test_first_page_is_bounded(self):
+        with self.assertNumQueries(3):  # session, user, satu SELECT halaman log + gunung
+            r = self.client.get(reverse("logpendakian:list"))
+        self.assertEqual(len(r.context["logs"]), self.page_size)
+        self.assertFalse(r.context["empty"])
+        self.assertTrue(r.context["next_cursor"])
+        self.assertContains(r, 'id="lp-more"')
+
+    def test_infinite_scroll_walks_every_log_once(self):
+        r = self.client.get(reverse("logpendakian:list"))
+        seen = [str(x.pk) for x in r.context["logs"]]
+        cursor = r.context["next_cursor"]
+        while cursor:
+            data = self.client.get(reverse("logpendakian:list"), {"cursor": cursor},
+                                   HTTP_X_REQUESTED_WITH="XMLHttpRequest").json()
+            seen += re.findall(r'id="lp-item-([0-9a-f-]+)"', data["html"])
+            cursor = data["next_cursor"]
+            self.assertEqual(data["has_more"], cursor is not None)
+        expected = LogPendakian.objects.order_by("-start_date", "-created_at", "-id").values_list("pk", flat=True)
+        self.assertEqual(seen, [str(pk) for pk in expected])
+
+    def test_empty_state_and_bad_cursor(self):
+        User = get_user_model()
+        User.objects.create_user("baru", "baru@example.com", "pass")
+        self.client.login(username="baru", password="pass")
+        r = self.client.get(reverse("logpendakian:list"))
+        self.assertTrue(r.context["empty"])
+        self.assertIsNone(r.context["next_cursor"])
+        r = self.client.get(reverse("logpendakian:list"), {"cursor": "rusak"}, HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        self.assertEqual(r.status_code, 400)
+
+
+class UserClimbStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user("d1", "d1@example.com", "pass")
+        cls.rinjani = Gunung.objects.create(nama="Rinjani", provinsi="NTB", ketinggian=3726)
+        cls.semeru = Gunung.objects.create(nama="Semeru", provinsi="Jawa Timur", ketinggian=3676)
+        cls.arjuno = Gunung.objects.create(nama="Arjuno", provinsi="Jawa Timur", ketinggian=3339)
+
+    def snapshot(self):
+        """Agregat & bucket tersimpan dalam bentuk yang bisa dibandingkan."""
+        from logpendakian.models import MonthlyClimbStats, UserClimbStats
+        agg = UserClimbStats.objects.filter(pk=self.user.pk).values(
+            "total_logs", "summit_count", "summit_ketinggian", "gunung_counts", "provinsi_counts",
+            "longest_log", "longest_days").first()
+        months = list(MonthlyClimbStats.objects.filter(user=self.user).order_by("month").values(
+            "month", "total_logs", "summit_count", "summit_ketinggian", "days"))
+        return agg, months
+
+    def assertMatchesRebuild(self):
+        from logpendakian import dashboard
+        incremental = self.snapshot()
+        dashboard.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def create(self, gunung, start, days=None, **kwargs):
+        end = start + timedelta(days=days - 1) if days else None
+        return LogPendakian.objects.create(user=self.user, gunung=gunung, start_date=start, end_date=end, **kwargs)
+
+    def test_deltas_match_full_rebuild(self):
+        from logpendakian.models import UserClimbStats
+        a = self.create(self.rinjani, date(2023, 1, 30), days=4)  # melintasi Januari-Februari
+        b = self.create(self.semeru, date(2023, 7, 1), days=2, summit_reached=False)
+        c = self.create(self.semeru, date(2024, 3, 10), days=3)
+        stats = UserClimbStats.objects.get(pk=self.user.pk)
+        self.assertEqual((stats.total_logs, stats.summit_count, stats.summit_ketinggian), (3, 2, 3726 + 3676))
+        self.assertEqual((stats.distinct_gunung, stats.distinct_provinsi), (2, 2))
+        self.assertEqual((stats.longest_log_id, stats.longest_days), (a.pk, 4))
+        self.assertMatchesRebuild()
+
+        # ubah gunung & tanggal log b, lalu hapus log terpanjang
+        b = LogPendakian.objects.get(pk=b.pk)
+        b.gunung, b.start_date, b.end_date = self.arjuno, date(2024, 3, 12), date(2024, 3, 13)
+        b.save()
+        self.assertMatchesRebuild()
+        LogPendakian.objects.filter(pk=a.pk).delete()
+        stats = UserClimbStats.objects.get(pk=self.user.pk)
+        self.assertEqual((stats.longest_log_id, stats.longest_days), (c.pk, 3))
+        self.assertEqual(stats.provinsi_counts, {"Jawa Timur": 2})
+        self.assertMatchesRebuild()
+
+    def test_missing_row_is_computed_from_logs(self):
+        from logpendakian.models import MonthlyClimbStats, UserClimbStats
+        self.create(self.rinjani, date(2023, 1, 30), days=4)
+        b = self.create(self.semeru, date(2023, 7, 1), days=2)
+        # statistik user belum pernah dihitung (mis. log lama sebelum fitur ini)
+        UserClimbStats.objects.all().delete()
+        MonthlyClimbStats.objects.all().delete()
+
+        # perubahan -1/+1 tidak boleh dikurangkan dari baris nol
+        b = LogPendakian.objects.get(pk=b.pk)
+        b.gunung = self.arjuno
+        b.save()
+        stats = UserClimbStats.objects.get(pk=self.user.pk)
+        self.assertEqual(stats.total_logs, 2)
+        self.assertEqual(stats.gunung_counts, {str(self.rinjani.pk): 1, str(self.arjuno.pk): 1})
+        self.assertMatchesRebuild()
+
+    def test_gunung_edit_does_not_skew_removal(self):
+        from logpendakian.models import UserClimbStats
+        gunung = Gunung.objects.create(nama="Bukit", provinsi="Jawa Barat", ketinggian=1000)
+        log = self.create(gunung, date(2024, 5, 1))
+        gunung.ketinggian, gunung.provinsi = 3000, "Banten"
+        gunung.save()
+
+        self.client.login(username="d1", password="pass")
+        r = self.client.post(reverse("logpendakian:delete", args=[log.pk]))
+        self.assertLess(r.status_code, 400)
+        stats = UserClimbStats.objects.get(pk=self.user.pk)
+        self.assertEqual((stats.total_logs, stats.summit_ketinggian), (0, 0))
+        self.assertEqual(stats.provinsi_counts, {})
+
+        # rebuild menyegarkan salinan gunung di log yang tersisa
+        from logpendakian import dashboard
+        log = self.create(gunung, date(2024, 6, 1))
+        Gunung.objects.filter(pk=gunung.pk).update(ketinggian=1500)
+        dashboard.rebuild()
+        self.assertEqual(UserClimbStats.objects.get(pk=self.user.pk).summit_ketinggian, 1500)
+        LogPendakian.objects.filter(pk=log.pk).delete()
+        self.assertEqual(UserClimbStats.objects.get(pk=self.user.pk).summit_ketinggian, 0)
+
+    def test_dashboard_page(self):
+        self.create(self.rinjani, date(2023, 8, 16), days=3)
+        self.create(self.semeru, date(2024, 8, 17), days=2)
+        self.client.login(username="d1", password="pass")
+        r = self.client.get(reverse("logpendakian:dashboard"))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context["year"], 2024)
+        self.assertEqual([row["year"] for row in r.context["yearly"]], [2024, 2023])
+        self.assertEqual(r.context["yearly"][1]["active_days"], 3)
+        cells = [cell for week in r.context["heatmap"] for cell in week if cell]
+        self.assertEqual(len(cells), 366)
+        self.assertEqual([c["date"] for c in cells if c["count"]], [date(2024, 8, 17), date(2024, 8, 18)])
+        self.assertContains(r, "Rinjani")  # trip terpanjang
+        r = self.client.get(reverse("logpendakian:dashboard"), {"year": "2023"})
+        self.assertEqual(r.context["year"], 2023)
+
+    def test_dashboard_empty_and_user_delete(self):
+        from logpendakian.models import UserClimbStats
+        self.client.login(username="d1", password="pass")
+        r = self.client.get(reverse("logpendakian:dashboard"))
+        self.assertContains(r, "Belum ada riwayat")
+        self.create(self.rinjani, date(2024, 1, 1), days=2)
+        self.user.delete()  # log ikut terhapus (cascade) tanpa membuat statistik yatim
+        self.assertFalse(UserClimbStats.objects.exists())
+
+
+class LogExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user("e1", "e1@example.com", "pass")
+        cls.other = User.objects.create_user("e2", "e2@example.com", "pass")
+        cls.gunung = Gunung.objects.create(nama="Kerinci", provinsi="Jambi", ketinggian=3805)
+        LogPendakian.objects.create(user=cls.user, gunung=cls.gunung, start_date=date(2024, 2, 1),
+                                    end_date=date(2024, 2, 3), notes='catatan, dengan "kutip"\nbaris dua', rating=5)
+        LogPendakian.objects.create(user=cls.other, gunung=cls.gunung, start_date=date(2024, 2, 1))
+
+    def setUp(self):
+        self.client.login(username="e1", password="pass")
+
+    def body(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv_and_ndjson(self):
+        import csv, io, json
+        r = self.client.get(reverse("logpendakian:export"))
+        self.assertEqual(r["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment", r["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self.body(r).decode())))
+        self.assertEqual(len(rows), 1)  # hanya log milik user
+        self.assertEqual((rows[0]["gunung"], rows[0]["ketinggian"], rows[0]["end_date"]), ("Kerinci", "3805", "2024-02-03"))
+        self.assertEqual(rows[0]["notes"], 'catatan, dengan "kutip"\nbaris dua')
+
+        r = self.client.get(reverse("logpendakian:export"), {"format": "ndjson"})
+        lines = self.body(r).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["provinsi"], "Jambi")
+        self.assertEqual(self.client.get(reverse("logpendakian:export"), {"format": "xml"}).status_code, 400)
+
+    def test_gzip_on_the_fly(self):
+        import gzip
+        plain = self.body(self.client.get(reverse("logpendakian:export")))
+        r = self.client.get(reverse("logpendakian:export"), HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(r["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", r["Vary"])
+        self.assertEqual(gzip.decompress(self.body(r)), plain)
+        r = self.client.get(reverse("logpendakian:export"), {"gzip": "1"})
+        self.assertEqual(r["Content-Type"], "application/gzip")
+        self.assertIn('.csv.gz"', r["Content-Disposition"])
+        self.assertEqual(gzip.decompress(self.body(r)), plain)
+
+    def test_memory_stays_bounded(self):
+        import tracemalloc
+        from logpendakian import export
+        start = date(1950, 1, 1)  # sebelum log di setUpTestData
+        note = "catatan perjalanan " * 20
+
+        def add_logs(first, last):
+            LogPendakian.objects.bulk_create([
+                LogPendakian(user=self.user, gunung=self.gunung, start_date=start + timedelta(days=i), notes=note)
+                for i in range(first, last)
+            ])
+
+        def peak(fmt, gzip):
+            tracemalloc.start()
+            size = 0
+            try:
+                for chunk in export.stream(self.user, fmt, gzip):
+                    size += len(chunk)
+                return tracemalloc.get_traced_memory()[1], size
+            finally:
+                tracemalloc.stop()
+
+        cases = [(fmt, gzip) for fmt in ("csv", "ndjson") for gzip in (False, True)]
+        add_logs(0, 1000)
+        small = {case: peak(*case) for case in cases}
+        add_logs(1000, 10000)
+        for case in cases:
+            (small_peak, small_size), (big_peak, big_size) = small[case], peak(*case)
+            self.assertGreater(big_size, small_size * 8)  # 10x data...
+            # ...tetapi puncak memori tetap sebatas satu chunk query + buffer + state zlib
+            self.assertLess(big_peak, small_peak * 1.25, case)
+            self.assertLess(big_peak, 2_000_000, case)
+
+
+class LogImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user("i1", "i1@example.com", "pass")
+        cls.rinjani = Gunung.objects.create(nama="Gunung Rinjani", provinsi="NTB", ketinggian=3726,
+                                            latitude=-8.4115, longitude=116.4577)
+        cls.slamet = Gunung.objects.create(nama="Slamet", provinsi="Jawa Tengah", ketinggian=3428,
+                                           latitude=-7.2425, longitude=109.2083)
+        cls.sumbing_jateng = Gunung.objects.create(nama="Sumbing", provinsi="Jawa Tengah", ketinggian=3371)
+        cls.sumbing_jatim = Gunung.objects.create(nama="Sumbing", provinsi="Jawa Timur", ketinggian=1100)
+
+    def setUp(self):
+        self.client.login(username="i1", password="pass")
+
+    def upload(self, name, content, **data):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        files = [SimpleUploadedFile(name, content.encode())]
+        return self.client.post(reverse("logpendakian:import"), {"files": files, **data})
+
+    def gpx(self, name, points):
+        trkpts = "".join(
+            f'<trkpt lat="{lat}" lon="{lon}"><ele>{ele}</ele><time>{time}</time></trkpt>'
+            for lat, lon, ele, time in points
+        )
+        return ('<?xml version="1.0"?><gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">'
+                f"<trk><name>{name}</name><trkseg>{trkpts}</trkseg></trk></gpx>")
+
+    def test_csv_import_with_report(self):
+        from logpendakian.models import GunungStats, UserClimbStats
+        LogPendakian.objects.create(user=self.user, gunung=self.slamet, start_date=date(2024, 1, 5))
+        content = (
+            "gunung,provinsi,start_date,end_date,summit_reached,team_size,rating,notes\n"
+            "rinjani,,2024-05-01,2024-05-03,ya,4,5,lewat Sembalun\n"   # tanpa awalan "Gunung"
+            "Sumbing,Jawa Tengah,02/06/2024,,tidak,,,\n"
+            "Slamet,,2024-01-05,,,,,\n"                                 # sudah ada di database
+            "Rinjani,,2024-05-01,,,,,\n"                                # duplikat dalam berkas
+            "Sumbing,,2024-07-01,,,,,\n"                                # ambigu
+            "Merbabu,,2024-07-01,,,,,\n"                                # tidak dikenal
+            "Slamet,,2024-08-10,2024-08-09,,,,\n"                       # end < start
+            "Slamet,,2024-09-01,,,,7,\n"                                # rating di luar 1-5
+            "Slamet,,kemarin,,,,,\n"
+        )
+        r = self.upload("riwayat.csv", content)
+        self.assertEqual(r.status_code, 200)
+        report = r.json()
+        self.assertEqual((report["created"], report["duplicates"], report["error_count"]), (2, 2, 7))
+        self.assertEqual([e["row"] for e in report["errors"]], [4, 5, 6, 7, 8, 9, 10])
+        self.assertIn("ambigu", report["errors"][2]["error"])
+        self.assertIn("end_gte_start_or_null", report["errors"][4]["error"])
+
+        log = LogPendakian.objects.get(user=self.user, gunung=self.rinjani)
+        self.assertEqual((log.end_date, log.team_size, log.rating, log.notes), (date(2024, 5, 3), 4, 5, "lewat Sembalun"))
+        self.assertFalse(LogPendakian.objects.get(gunung=self.sumbing_jateng).summit_reached)
+        # statistik yang biasanya dijaga signal ikut diperbarui
+        self.assertEqual(GunungStats.objects.get(pk=self.rinjani.pk).total_logs, 1)
+        self.assertEqual(UserClimbStats.objects.get(pk=self.user.pk).total_logs, 3)
+
+    def test_gpx_import_by_name_and_nearest(self):
+        named = self.gpx("Pendakian Rinjani via Sembalun", [
+            (-8.39, 116.52, 1150, "2024-08-16T22:00:00Z"),
+            (-8.4115, 116.4577, 3700, "2024-08-18T21:30:00Z"),
+        ])
+        unnamed = self.gpx("Track 12", [
+            (-7.26, 109.21, 1500, "2024-09-01T01:00:00Z"),
+            (-7.245, 109.209, 2900, "2024-09-01T06:00:00Z"),  # jauh di bawah puncak
+        ])
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        r = self.client.post(reverse("logpendakian:import"), {"files": [
+            SimpleUploadedFile("a.gpx", named.encode()),
+            SimpleUploadedFile("b.gpx", unnamed.encode()),
+            SimpleUploadedFile("rusak.gpx", b"<gpx><trk>"),
+        ]})
+        report = r.json()
+        self.assertEqual(report["created"], 2)
+        self.assertEqual([e["source"] for e in report["errors"]], ["rusak.gpx"])
+        rinjani = LogPendakian.objects.get(user=self.user, gunung=self.rinjani)
+        self.assertTrue(rinjani.summit_reached)
+        self.assertEqual(rinjani.end_date - rinjani.start_date, timedelta(days=2))
+        self.assertFalse(LogPendakian.objects.get(user=self.user, gunung=self.slamet).summit_reached)
+
+    def test_dry_run_method_and_command(self):
+        import io, os, tempfile
+        from django.core.management import call_command
+        r = self.upload("a.csv", "gunung,start_date\nSlamet,2024-01-01\n", dry_run="1")
+        self.assertEqual((r.json()["created"], r.json()["dry_run"]), (1, True))
+        self.assertFalse(LogPendakian.objects.exists())
+        self.assertEqual(self.client.get(reverse("logpendakian:import")).status_code, 405)
+        self.assertEqual(self.upload("a.txt", "x").json()["error_count"], 1)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("gunung,start_date\nSlamet,2024-01-01\nSlamet,2024-02-01\n")
+        self.addCleanup(os.unlink, f.name)
+        out = io.StringIO()
+        call_command("import_logs", "i1", f.name, stdout=out)
+        self.assertIn("2 log dibuat", out.getvalue())
+        self.assertEqual(LogPendakian.objects.filter(user=self.user).count(), 2)
+
+    def test_batches_update_stats(self):
+        import io
+        from logpendakian import importer
+        from logpendakian.models import GunungStats
+        lines = ["gunung,start_date"] + [f"Slamet,{date(2000, 1, 1) + timedelta(days=i)}" for i in range(1200)]
+        imp = importer.LogImporter(self.user, batch_size=500)
+        imp.import_csv(io.BytesIO("\n".join(lines).encode()))
+        report = imp.finish()
+        self.assertEqual(report["created"], 1200)
+        self.assertEqual(GunungStats.objects.get(pk=self.slamet.pk).total_logs, 1200)
+
+
+class LogTrackTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user("t1", "t1@example.com", "pass")
+        cls.other = User.objects.create_user("t2", "t2@example.com", "pass")
+        cls.gunung = Gunung.objects.create(nama="Merbabu", provinsi="Jawa Tengah", ketinggian=3145,
+                                           latitude=-7.455, longitude=110.44)
+        cls.log = LogPendakian.objects.create(user=cls.user, gunung=cls.gunung, start_date=date(2024, 6, 1))
+
+    def setUp(self):
+        self.client.login(username="t1", password="pass")
+
+    def gpx_bytes(self, n=2000):
+        """Zig-zag naik ~1000 m dalam n titik (jarak horizontal ~5 km)."""
+        import math
+        trkpts = []
+        for i in range(n):
+            lat = -7.50 + 0.045 * i / n + 0.0003 * math.sin(i / 15)
+            lon = 110.43 + 0.0002 * math.cos(i / 7)
+            trkpts.append(f'<trkpt lat="{lat:.7f}" lon="{lon:.7f}"><ele>{2100 + 1000 * i / n:.1f}</ele>'
+                          f'<time>2024-06-01T{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z</time></trkpt>')
+        return ('<?xml version="1.0"?><gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">'
+                f'<trk><name>Merbabu via Selo</name><trkseg>{"".join(trkpts)}</trkseg></trk></gpx>').encode()
+
+    def reference_dp(self, xy, tolerance):
+        import numpy as np
+        from logpendakian import tracks
+        keep = {0, len(xy) - 1}
+        stack = [(0, len(xy) - 1)]
+        while stack:
+            a, b = stack.pop()
+            if b - a < 2:
+                continue
+            inner = np.arange(a + 1, b)
+            dist = tracks._segment_distance(xy[inner], np.repeat(xy[[a]], len(inner), 0), np.repeat(xy[[b]], len(inner), 0))
+            i = int(np.argmax(dist))
+            if dist[i] > tolerance:
+                keep.add(a + 1 + i)
+                stack += [(a, a + 1 + i), (a + 1 + i, b)]
+        return sorted(keep)
+
+    def test_simplify_matches_recursive_douglas_peucker(self):
+        import io
+        import numpy as np
+        from logpendakian import tracks
+        track = tracks.parse(io.BytesIO(self.gpx_bytes()))
+        xy = tracks.project(track.points)
+        sizes = []
+        for tolerance in tracks.TOLERANCES_M:
+            kept = tracks.simplify(xy, tolerance)
+            self.assertEqual(kept.tolist(), self.reference_dp(xy, tolerance))
+            sizes.append(len(kept))
+        self.assertEqual(sizes, sorted(sizes, reverse=True))  # makin kasar makin sedikit titik
+        # loop tertutup (awal == akhir) dan track pendek tetap aman
+        loop = np.array([[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]], dtype=float)
+        self.assertEqual(tracks.simplify(loop, 1).tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(tracks.simplify(loop[:1], 1).tolist(), [0])
+
+    def test_parse_mixed_time_formats_as_utc(self):
+        import io
+        from datetime import datetime, timezone
+        from unittest import mock
+        from xml.etree.ElementTree import iterparse
+        from logpendakian import gpx, tracks
+        data = ('<?xml version="1.0"?><gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>'
+                '<trkpt lat="-7.50" lon="110.43"><time>2024-06-01T06:00:00</time></trkpt>'
+                '<trkpt lat="-7.49" lon="110.43"><time>2024-06-01T05:30:00Z</time></trkpt>'
+                '<trkpt lat="-7.48" lon="110.43"><time>2024-06-01T14:00:00+07:00</time></trkpt>'
+                '</trkseg></trk></gpx>').encode()
+        track = tracks.parse(io.BytesIO(data))
+        self.assertEqual(track.started_at, datetime(2024, 6, 1, 5, 30, tzinfo=timezone.utc))
+        self.assertEqual(track.finished_at, datetime(2024, 6, 1, 7, 0, tzinfo=timezone.utc))
+        # titik yang sudah dibaca dilepas dari trkseg, tidak menumpuk di pohon XML
+        counts = []
+
+        def spying_iterparse(*args, **kwargs):
+            for event, elem in iterparse(*args, **kwargs):
+                if event == "end" and elem.tag.endswith("trkseg"):
+                    counts.append(len(elem))
+                yield event, elem
+
+        with mock.patch.object(gpx, "iterparse", spying_iterparse):
+            list(gpx.read(io.BytesIO(self.gpx_bytes(50))))
+        self.assertEqual(counts, [0])
+
+    def test_upload_metrics_and_zoom(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from logpendakian import tracks
+        from logpendakian.models import LogTrack
+        url = reverse("logpendakian:track", args=[self.log.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        r = self.client.post(url, {"file": SimpleUploadedFile("t.gpx", self.gpx_bytes())})
+        self.assertEqual(r.status_code, 200)
+        stats = r.json()["stats"]
+        self.assertEqual(r.json()["point_count"], 2000)
+        self.assertAlmostEqual(stats["elevation_gain_m"], 1000, delta=5)
+        self.assertLess(stats["elevation_loss_m"], 1)
+        self.assertAlmostEqual(stats["max_elevation_m"], 3099.5, delta=0.5)
+        self.assertGreater(stats["distance_m"], 5000)
+
+        track = LogTrack.objects.get(pk=self.log.pk)
+        self.assertEqual(len(track.points), 2000 * 3 * 4)  # satu blob float32, bukan satu baris per titik
+        detail = self.client.get(url, {"zoom": 18}).json()
+        self.assertEqual((detail["tolerance_m"], len(detail["points"])), (None, 2000))
+        overview = self.client.get(url, {"zoom": 9}).json()
+        self.assertEqual(overview["tolerance_m"], 120)
+        self.assertLess(len(overview["points"]), 20)
+        self.assertEqual(overview["points"][0], detail["points"][0])
+        self.assertEqual(self.client.get(url).json()["tolerance_m"], tracks.TOLERANCES_M[0])
+        self.assertEqual(self.client.get(url, {"zoom": "abc"}).status_code, 400)
+
+        self.client.login(username="t2", password="pass")
+        self.assertEqual(self.client.get(url).status_code, 404)  # track milik user lain
+        self.client.login(username="t1", password="pass")
+        self.assertEqual(self.client.post(url, {"file": SimpleUploadedFile("x.gpx", b"<gpx>")}).status_code, 400)
+        self.assertTrue(self.client.delete(url).json()["ok"])
+        self.assertFalse(LogTrack.objects.exists())
+
+    def test_track_via_form_import_and_list(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from logpendakian.models import LogTrack
+        r = self.client.post(reverse("logpendakian:create"), {
+            "gunung": self.gunung.pk, "start_date": "2024-07-01", "summit_reached": "on",
+            "track": SimpleUploadedFile("t.gpx", self.gpx_bytes(300)),
+        })
+        self.assertTrue(r.json()["ok"])
+        self.assertIn("Track:", r.json()["html"])
+        r = self.client.post(reverse("logpendakian:create"), {
+            "gunung": self.gunung.pk, "start_date": "2024-07-02",
+            "track": SimpleUploadedFile("t.gpx", b"bukan xml"),
+        })
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(LogPendakian.objects.filter(start_date=date(2024, 7, 2)).count(), 0)
+
+        # import GPX ikut menyimpan track
+        LogPendakian.objects.filter(start_date=date(2024, 6, 1)).delete()
+        r = self.client.post(reverse("logpendakian:import"), {"files": [SimpleUploadedFile("m.gpx", self.gpx_bytes(500))]})
+        self.assertEqual(r.json()["created"], 1)
+        self.assertEqual(LogTrack.objects.count(), 2)
+
+        with self.assertNumQueries(3):  # session, user, log + track (tanpa query per log)
+            r = self.client.get(reverse("logpendakian:list"))
+        self.assertContains(r, "Track:", count=2)
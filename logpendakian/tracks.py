@@ -0,0 +1,235 @@
+"""
+Track GPX per log pendakian: parsing, penyederhanaan, dan metrik (NumPy).
+
+- Titik dibaca streaming oleh gpx.read() ke array('d'), lalu disimpan
+  sebagai satu blob float32 (lat, lon, ele; ele NaN bila tidak ada),
+  bukan satu baris per titik.
+- Douglas-Peucker dijalankan tervektorisasi untuk setiap toleransi di
+  TOLERANCES_M: setiap iterasi memproses semua segmen yang masih terbuka
+  sekaligus (jarak titik ke segmen dihitung untuk seluruh array). Hasilnya
+  indeks titik per level, disimpan sebagai blob uint32.
+- Jarak (haversine), naik/turun elevasi (setelah dihaluskan), dan elevasi
+  maksimum dihitung sekali saat upload.
+
+Endpoint track memilih level dengan toleransi terbesar yang masih di bawah
+ukuran satu piksel pada zoom peta yang diminta (level_for_zoom()).
+"""
+import math
+from array import array
+
+import numpy as np
+
+from logpendakian import gpx
+
+POINT_DTYPE = np.dtype("<f4")   # lat, lon, ele per titik
+INDEX_DTYPE = np.dtype("<u4")
+TOLERANCES_M = (2, 8, 30, 120, 500)  # dari halus ke kasar
+MAX_POINTS = 500_000
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_PIXEL_Z0 = 156_543.03    # Web Mercator, 256 px per tile, di khatulistiwa
+ELEVATION_WINDOW = 5                # moving average sebelum menghitung naik/turun
+MAX_ZOOM = 22
+
+
+class Track:
+    """Hasil parse satu berkas GPX (semua array float64, N x 3)."""
+
+    def __init__(self, points, names=(), started_at=None, finished_at=None):
+        self.points = points
+        self.names = list(names)
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def highest(self):
+        """(lat, lon, ele|None) titik tertinggi, atau titik pertama bila tanpa elevasi."""
+        ele = self.points[:, 2]
+        if np.isnan(ele).all():
+            lat, lon, _ = self.points[0]
+            return float(lat), float(lon), None
+        lat, lon, top = self.points[np.nanargmax(ele)]
+        return float(lat), float(lon), float(top)
+
+    def fields(self):
+        """Nilai field LogTrack (tanpa `log`)."""
+        levels = [simplify(project(self.points), tolerance) for tolerance in TOLERANCES_M]
+        stored = self.points.astype(POINT_DTYPE)
+        return {
+            "points": stored.tobytes(),
+            "levels": np.concatenate(levels).astype(INDEX_DTYPE).tobytes(),
+            "level_sizes": [len(level) for level in levels],
+            "point_count": len(self.points),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            **metrics(self.points),
+        }
+
+
+def parse(fileobj):
+    """Baca berkas GPX menjadi Track. Raise gpx.GPXError bila rusak/kosong/terlalu besar."""
+    coords, names = array("d"), []
+    start = end = None
+    nan = float("nan")
+    for kind, value in gpx.read(fileobj):
+        if kind == "name":
+            names.append(value)
+            continue
+        lat, lon, ele, time = value
+        coords.extend((lat, lon, nan if ele is None else ele))
+        if len(coords) > MAX_POINTS * 3:
+            raise gpx.GPXError(f"Track terlalu besar (maksimal {MAX_POINTS} titik)")
+        if time is not None:
+            start = time if start is None or time < start else start
+            end = time if end is None or time > end else end
+    if not coords:
+        raise gpx.GPXError("GPX tidak berisi titik track")
+    points = np.frombuffer(coords, dtype=np.float64).reshape(-1, 3)
+    return Track(points, names, start, end)
+
+
+# =====================================================
+# 🔹 GEOMETRI
+# =====================================================
+def project(points):
+    """Proyeksi equirectangular lokal (meter) di sekitar lintang rata-rata; cukup akurat untuk satu track."""
+    lat = np.radians(points[:, 0])
+    lon = np.radians(points[:, 1])
+    x = (lon - lon[0]) * math.cos(float(lat.mean())) * EARTH_RADIUS_M
+    y = (lat - lat[0]) * EARTH_RADIUS_M
+    return np.column_stack((x, y))
+
+
+def _segment_distance(p, a, b):
+    """Jarak setiap titik p[i] ke segmen a[i]-b[i] (segmen, bukan garis: aman untuk track melingkar)."""
+    d = b - a
+    length2 = np.einsum("ij,ij->i", d, d)
+    t = np.einsum("ij,ij->i", p - a, d) / np.where(length2 > 0, length2, 1)
+    t = np.clip(t, 0, 1)
+    nearest = a + t[:, None] * d
+    return np.hypot(*(p - nearest).T)
+
+
+def simplify(xy, tolerance):
+    """
+    Douglas-Peucker tervektorisasi. Return indeks titik yang dipertahankan
+    (terurut, selalu memuat titik pertama & terakhir).
+    """
+    n = len(xy)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    active = ~keep  # titik yang segmennya belum selesai diperiksa
+    while True:
+        pts = np.flatnonzero(active)
+        if not len(pts):
+            break
+        anchors = np.flatnonzero(keep)
+        seg = np.searchsorted(anchors, pts) - 1
+        dist = _segment_distance(xy[pts], xy[anchors[seg]], xy[anchors[seg + 1]])
+        far = dist > tolerance
+
+        # segmen tanpa titik jauh sudah final
+        open_seg = np.zeros(len(anchors), dtype=bool)
+        open_seg[seg[far]] = True
+        active[pts[~open_seg[seg]]] = False
+        if not far.any():
+            break
+
+        # titik terjauh di setiap segmen terbuka menjadi anchor baru
+        far_pts, far_seg, far_dist = pts[far], seg[far], dist[far]
+        order = np.lexsort((-far_dist, far_seg))
+        first = np.r_[True, far_seg[order][1:] != far_seg[order][:-1]]
+        chosen = far_pts[order][first]
+        keep[chosen] = True
+        active[chosen] = False
+    return np.flatnonzero(keep)
+
+
+def metrics(points):
+    """Jarak total, naik/turun elevasi, dan elevasi maksimum (meter)."""
+    lat = np.radians(points[:, 0])
+    lon = np.radians(points[:, 1])
+    h = (np.sin(np.diff(lat) / 2) ** 2
+         + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2)
+    distance = float((2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(h, 0, 1)))).sum())
+
+    ele = points[:, 2][~np.isnan(points[:, 2])]
+    highest = float(ele.max()) if len(ele) else None
+    gain = loss = 0.0
+    if len(ele) > 1:
+        if len(ele) >= ELEVATION_WINDOW:  # haluskan derau GPS supaya naik/turun tidak menggelembung
+            ele = np.convolve(ele, np.ones(ELEVATION_WINDOW) / ELEVATION_WINDOW, mode="valid")
+        step = np.diff(ele)
+        gain, loss = float(step[step > 0].sum()), float(-step[step < 0].sum())
+    return {
+        "distance_m": round(distance, 1),
+        "elevation_gain_m": round(gain, 1),
+        "elevation_loss_m": round(loss, 1),
+        "max_elevation_m": highest,
+    }
+
+
+# =====================================================
+# 🔹 PENYAJIAN
+# =====================================================
+def meters_per_pixel(zoom, latitude):
+    return METERS_PER_PIXEL_Z0 * math.cos(math.radians(latitude)) / 2 ** zoom
+
+
+def level_for_zoom(zoom, latitude):
+    """Indeks level (TOLERANCES_M) dengan toleransi terbesar <= 1 piksel, atau None = semua titik."""
+    if zoom is None:
+        return 0
+    limit = meters_per_pixel(zoom, latitude)
+    fitting = [i for i, tolerance in enumerate(TOLERANCES_M) if tolerance <= limit]
+    return fitting[-1] if fitting else None
+
+
+def load_points(track):
+    return np.frombuffer(bytes(track.points), dtype=POINT_DTYPE).reshape(-1, 3)
+
+
+def load_level(track, level):
+    offset = sum(track.level_sizes[:level])
+    return np.frombuffer(bytes(track.levels), dtype=INDEX_DTYPE,
+                         count=track.level_sizes[level], offset=offset * INDEX_DTYPE.itemsize)
+
+
+def polyline(track, zoom=None):
+    """Payload JSON track pada zoom tertentu."""
+    points = load_points(track)
+    level = level_for_zoom(zoom, float(points[:, 0].mean()))
+    if level is not None:
+        points = points[load_level(track, level)]
+    coords = np.round(points.astype(np.float64), 6)
+    lat, lon = coords[:, 0], coords[:, 1]
+    return {
+        "id": str(track.pk),
+        "zoom": zoom,
+        "tolerance_m": None if level is None else TOLERANCES_M[level],
+        "point_count": track.point_count,
+        "points": [[a, b, None if math.isnan(e) else round(e, 1)] for a, b, e in coords.tolist()],
+        "bounds": [[float(lat.min()), float(lon.min())], [float(lat.max()), float(lon.max())]],
+        "stats": stats_dict(track),
+    }
+
+
+def stats_dict(track):
+    return {
+        "distance_m": track.distance_m,
+        "elevation_gain_m": track.elevation_gain_m,
+        "elevation_loss_m": track.elevation_loss_m,
+        "max_elevation_m": track.max_elevation_m,
+        "started_at": track.started_at.isoformat() if track.started_at else None,
+        "finished_at": track.finished_at.isoformat() if track.finished_at else None,
+    }
+
+
+def save(log, track):
+    """Simpan/ganti track sebuah log dari Track hasil parse()."""
+    from logpendakian.models import LogTrack
+
+    obj, _ = LogTrack.objects.update_or_create(log=log, defaults=track.fields())
+    return obj
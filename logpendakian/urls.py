@@ -4,7 +4,11 @@ from . import views
 app_name = "logpendakian"
 urlpatterns = [
     path("", views.log_list, name="list"),
+    path("dashboard/", views.log_dashboard, name="dashboard"),
+    path("export/", views.log_export, name="export"),
+    path("import/", views.log_import, name="import"),
     path("new/", views.log_create, name="create"),
     path("<uuid:pk>/edit/", views.log_update, name="update"),
     path("<uuid:pk>/delete/", views.log_delete, name="delete"),
+    path("<uuid:pk>/track/", views.log_track, name="track"),
 ]
@@ -1,36 +1,159 @@
+import re
+from datetime import date
 from django.contrib.auth.decorators import login_required
 from django.db import IntegrityError
-from django.http import HttpResponse, JsonResponse, HttpResponseForbidden
+from django.http import HttpResponse, JsonResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from django.shortcuts import render, get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.db import IntegrityError, transaction 
 from .forms import LogPendakianForm
-from .models import LogPendakian
+from .models import LogPendakian, LogTrack
+from . import dashboard, export, importer, gpx, tracks
+from gundex.pagination import paginate, InvalidCursor
 
 def _current_profile(request):
     return request.user
 
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+# urutan riwayat (terbaru dulu); id sebagai pemecah seri supaya cursor stabil
+LOG_ORDER = ("-start_date", "-created_at", "-id")
+LOG_PAGE_SIZE = 20
+
+
 @login_required(login_url='/userprofile/login/')
 def log_list(request):
+    """
+    Riwayat pendakian per halaman (keyset pada LOG_ORDER, index (user, start_date)).
+    Request AJAX dengan `cursor` mengembalikan JSON berisi fragmen row.html
+    untuk infinite scroll.
+    """
     prof = _current_profile(request)
-    logs = (LogPendakian.objects
-            .filter(user=prof)
-            .select_related()
-            .order_by("-start_date", "-created_at"))
-    empty = not logs.exists()
-    return render(request, "logpendakian/list.html", {"logs": logs, "empty": empty})
+    # metrik track ikut di-join; blob titiknya tidak dimuat
+    logs = (LogPendakian.objects.filter(user=prof)
+            .select_related("gunung", "track").defer("track__points", "track__levels"))
+    try:
+        page, next_cursor = paginate(logs, LOG_ORDER, request.GET.get("cursor"), LOG_PAGE_SIZE)
+    except InvalidCursor as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        html = "".join(
+            render_to_string("logpendakian/partials/row.html", {"x": x}, request=request) for x in page
+        )
+        return JsonResponse({"html": html, "next_cursor": next_cursor, "has_more": next_cursor is not None})
+
+    # halaman pertama sekaligus menentukan empty-state, tanpa query exists() terpisah
+    empty = not page and not request.GET.get("cursor")
+    return render(request, "logpendakian/list.html", {"logs": page, "empty": empty, "next_cursor": next_cursor})
+
+@login_required(login_url='/userprofile/login/')
+def log_dashboard(request):
+    """Ringkasan statistik pendakian user dari agregat inkremental (logpendakian/dashboard.py)."""
+    try:
+        year = int(request.GET["year"]) if request.GET.get("year") else None
+    except ValueError:
+        year = None
+    if year is not None and not 1900 <= year <= 2100:
+        year = None
+    return render(request, "logpendakian/dashboard.html", dashboard.summary(request.user, year))
+
+@login_required(login_url='/userprofile/login/')
+def log_export(request):
+    """
+    Unduh seluruh riwayat sebagai `format=csv` (default) atau `format=ndjson`,
+    di-stream tanpa memuat semua log ke memori (logpendakian/export.py).
+    `gzip=1` mengunduh berkas .gz; selain itu gzip dipakai sebagai
+    Content-Encoding bila klien mendukungnya.
+    """
+    fmt = request.GET.get("format", "csv")
+    if fmt not in export.FORMATS:
+        return JsonResponse({"error": f"format harus salah satu dari: {', '.join(export.FORMATS)}"}, status=400)
+    content_type, extension = export.FORMATS[fmt]
+    as_file = request.GET.get("gzip") == "1"
+    transparent = not as_file and bool(ACCEPTS_GZIP.search(request.headers.get("Accept-Encoding", "")))
+
+    response = StreamingHttpResponse(
+        export.stream(request.user, fmt, gzip=as_file or transparent),
+        content_type="application/gzip" if as_file else content_type,
+    )
+    filename = f"gundex-log-pendakian-{date.today():%Y%m%d}.{extension}" + (".gz" if as_file else "")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if transparent:
+        response["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+@login_required(login_url='/userprofile/login/')
+def log_import(request):
+    """
+    Import massal dari berkas `.csv` dan/atau `.gpx` (field `files`, boleh
+    lebih dari satu) untuk user yang login. `dry_run=1` hanya memvalidasi.
+    Return laporan: jumlah dibuat, duplikat, dan error per baris.
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "Gunakan metode POST"}, status=405)
+    files = request.FILES.getlist("files") or request.FILES.getlist("file")
+    if not files:
+        return JsonResponse({"error": "Sertakan minimal satu berkas .csv atau .gpx"}, status=400)
+    report = importer.import_files(
+        request.user,
+        ((f.name, f) for f in files),
+        dry_run=request.POST.get("dry_run") == "1",
+    )
+    return JsonResponse(report)
+
+@login_required(login_url='/userprofile/login/')
+def log_track(request, pk):
+    """
+    GET: polyline track log pada `zoom` peta (0-22; tanpa zoom = level
+    paling detail), disederhanakan dengan toleransi sebesar < 1 piksel.
+    POST: upload/ganti track dari berkas `file` (.gpx). DELETE: hapus track.
+    """
+    log = get_object_or_404(LogPendakian, pk=pk, user=request.user)
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        if upload is None:
+            return JsonResponse({"error": "Sertakan berkas GPX pada field file"}, status=400)
+        try:
+            track = tracks.save(log, tracks.parse(upload))
+        except gpx.GPXError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse({"ok": True, "point_count": track.point_count, "stats": tracks.stats_dict(track)})
+    if request.method == "DELETE":
+        deleted, _ = LogTrack.objects.filter(log=log).delete()
+        return JsonResponse({"ok": bool(deleted)})
+    if request.method != "GET":
+        return JsonResponse({"error": "Metode tidak didukung"}, status=405)
+
+    zoom = request.GET.get("zoom")
+    if zoom is not None:
+        try:
+            zoom = int(zoom)
+        except ValueError:
+            zoom = -1
+        if not 0 <= zoom <= tracks.MAX_ZOOM:
+            return JsonResponse({"error": f"zoom harus bilangan bulat 0-{tracks.MAX_ZOOM}"}, status=400)
+    track = LogTrack.objects.filter(log=log).first()
+    if track is None:
+        return JsonResponse({"error": "Log ini belum memiliki track"}, status=404)
+    return JsonResponse(tracks.polyline(track, zoom))
+
 
 @login_required(login_url='/userprofile/login/')
 def log_create(request):
     if request.method == "POST":
-        form = LogPendakianForm(request.POST)
+        form = LogPendakianForm(request.POST, request.FILES)
         if form.is_valid():
             obj = form.save(commit=False)
             obj.user = request.user
             try:
                 with transaction.atomic():
                     obj.save()
+                    form.save_track(obj)
             except IntegrityError:
                 form.add_error(None, "Riwayat untuk gunung & tanggal mulai tersebut sudah ada.")
                 html = render_to_string(
@@ -60,11 +183,12 @@ def log_create(request):
 def log_update(request, pk):
     obj = get_object_or_404(LogPendakian, pk=pk, user=request.user)
     if request.method == "POST":
-        form = LogPendakianForm(request.POST, instance=obj)
+        form = LogPendakianForm(request.POST, request.FILES, instance=obj)
         if form.is_valid():
             try:
                 with transaction.atomic():
                     obj = form.save()
+                    form.save_track(obj)
             except IntegrityError:
                 form.add_error(None, "Kombinasi gunung & tanggal mulai sudah dipakai di log lain Anda.")
                 html = render_to_string(
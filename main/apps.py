@@ -1,6 +1,13 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        # whitenoise membaca WHITENOISE_ROOT saat start; pastikan foldernya ada
+        os.makedirs(os.path.join(settings.THUMBNAIL_CACHE_DIR, 'thumbs'), exist_ok=True)
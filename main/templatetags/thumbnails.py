@@ -0,0 +1,17 @@
+from django import template
+
+from main import thumbnails
+
+register = template.Library()
+
+
+@register.filter
+def thumb_url(source_url, width=320):
+    """{{ artikel.image|thumb_url:640 }} -> URL thumbnail WebP (atau URL asal bila bukan http/https)."""
+    return thumbnails.thumbnail_url(source_url, int(width))
+
+
+@register.filter
+def thumb_srcset(source_url):
+    """{{ gunung.foto|thumb_srcset }} -> nilai atribut srcset semua lebar thumbnail."""
+    return thumbnails.srcset(source_url)
@@ -1,3 +1,162 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from PIL import Image
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from explore_gunung.models import Gunung
+from main import thumbnails
+
+
+def _png(width=1200, height=800):
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (161, 195, 73)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class _Origin(BaseHTTPRequestHandler):
+    """Pengganti server gambar eksternal: /ok.png berisi PNG (dengan ETag), selain itu 404."""
+    body = _png()
+    etag = '"v1"'
+    hits = []
+
+    def do_GET(self):
+        self.hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/ok.png" and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+        elif self.path == "/ok.png":
+            self.send_response(200)
+            self.send_header("ETag", self.etag)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThumbnailTestCase(TestCase):
+    """Unit test cache thumbnail WebP (main/thumbnails.py)"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.origin = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.override = override_settings(THUMBNAIL_CACHE_DIR=self.tmp, THUMBNAIL_WIDTHS=(160, 320, 640))
+        self.override.enable()
+        _Origin.hits.clear()
+        cache.clear()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    # ✅ TEST 1: URL & srcset hanya dibuat untuk URL http/https
+    def test_urls_and_srcset(self):
+        src = f"{self.origin}/ok.png"
+        url = thumbnails.thumbnail_url(src, 320)
+        key = thumbnails.source_key(src)
+        self.assertTrue(url.startswith(f"/thumbs/{key}-{thumbnails.revision(key)}-320.webp?src="))
+        self.assertEqual(thumbnails.srcset(src).count("w, "), 2)
+        self.assertIn(" 640w", thumbnails.srcset(src))
+        # lebar di luar daftar dibulatkan ke lebar terdekat
+        self.assertIn("-640.webp", thumbnails.thumbnail_url(src, 1000))
+        self.assertEqual(thumbnails.thumbnail_url("", 320), "")
+        self.assertEqual(thumbnails.thumbnail_url("/static/a.png", 320), "/static/a.png")
+        self.assertEqual(thumbnails.srcset(None), "")
+
+    # ✅ TEST 2: request pertama membuat semua ukuran WebP dari satu fetch
+    def test_generates_webp_once(self):
+        src = f"{self.origin}/ok.png"
+        response = self.client.get(thumbnails.thumbnail_url(src, 320))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(response["Cache-Control"], f"public, max-age={thumbnails.refresh_interval()}")
+        with Image.open(io.BytesIO(b"".join(response.streaming_content))) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 213))
+
+        key = thumbnails.source_key(src)
+        for width in (160, 320, 640):
+            self.assertTrue(os.path.exists(thumbnails.thumbnail_path(key, thumbnails.revision(key), width)))
+        response = self.client.get(thumbnails.thumbnail_url(src, 640))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertEqual(_Origin.hits, [("/ok.png", None)])
+
+    # ✅ TEST 3: tanda tangan salah -> 404 tanpa menyentuh origin (bukan open proxy)
+    def test_bad_signature(self):
+        key = thumbnails.source_key(f"{self.origin}/ok.png")
+        rev = thumbnails.revision(key)
+        response = self.client.get(f"/thumbs/{'0' * 32}-{rev}-320.webp?src={self.origin}/ok.png")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(f"/thumbs/{key}-{rev}-999.webp?src={self.origin}/ok.png").status_code, 404)
+        # revisi di masa depan juga ditolak, supaya tidak bisa memaksa fetch ulang sesukanya
+        self.assertEqual(self.client.get(f"/thumbs/{key}-{rev + 1}-320.webp?src={self.origin}/ok.png").status_code, 404)
+        self.assertEqual(_Origin.hits, [])
+
+    # ✅ TEST 4: origin gagal -> redirect ke URL asal, kegagalan di-cache sementara
+    def test_origin_failure_redirects(self):
+        src = f"{self.origin}/hilang.png"
+        for _ in range(2):
+            response = self.client.get(thumbnails.thumbnail_url(src, 160))
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response["Location"], src)
+        self.assertEqual(_Origin.hits, [("/hilang.png", None)])
+
+    # ✅ TEST 5: revisi berikutnya memvalidasi ulang origin; gambar yang tidak berubah cukup disalin
+    def test_next_revision_revalidates_origin(self):
+        import time
+        from unittest import mock
+        src = f"{self.origin}/ok.png"
+        key = thumbnails.source_key(src)
+        self.client.get(thumbnails.thumbnail_url(src, 320)).close()
+        rev = thumbnails.revision(key)
+
+        later = time.time() + thumbnails.refresh_interval()
+        with mock.patch.object(thumbnails.time, "time", return_value=later):
+            url = thumbnails.thumbnail_url(src, 320)
+            self.assertIn(f"-{rev + 1}-320.webp", url)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            response.close()
+        self.assertEqual(_Origin.hits, [("/ok.png", None), ("/ok.png", '"v1"')])
+        with open(thumbnails.thumbnail_path(key, rev, 320), "rb") as old, \
+                open(thumbnails.thumbnail_path(key, rev + 1, 320), "rb") as new:
+            self.assertEqual(old.read(), new.read())
+
+        # URL yang jauh tertinggal diarahkan ke revisi saat ini tanpa membuat file baru
+        much_later = later + 2 * thumbnails.refresh_interval()
+        with mock.patch.object(thumbnails.time, "time", return_value=much_later):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response["Location"], thumbnails.thumbnail_url(src, 320))
+        self.assertEqual(len(_Origin.hits), 2)
+
+    # ✅ TEST 6: JSON explore memuat URL thumbnail siap srcset
+    def test_show_json_has_srcset(self):
+        Gunung.objects.create(nama="Rinjani", ketinggian=3726, provinsi="NTB",
+                              foto=f"{self.origin}/ok.png", deksripsi="Lombok")
+        result = self.client.get("/json/").json()["results"][0]
+        self.assertTrue(result["foto_thumb"].startswith("/thumbs/"))
+        self.assertEqual(len(result["foto_srcset"].split(", ")), 3)
@@ -0,0 +1,202 @@
+"""
+Cache thumbnail lokal untuk gambar eksternal (Artikel.image, Gunung.foto).
+
+URL thumbnail berbentuk  /thumbs/<key>-<revisi>-<lebar>.webp?src=<url asal>
+dengan `key` = HMAC(SECRET_KEY, url asal), jadi server hanya mau mengambil
+gambar yang URL-nya memang pernah ia tandatangani (bukan open proxy).
+`revisi` naik setiap THUMBNAIL_REFRESH_INTERVAL detik (digeser per key agar
+tidak serempak), sehingga perubahan gambar di origin terlihat paling lambat
+setelah satu interval dan file dengan nama yang sama tidak pernah berubah.
+URL dengan revisi yang sudah lewat diarahkan ke revisi saat ini.
+
+Saat thumbnail suatu revisi diminta pertama kali, view `thumbnail` mengambil
+gambar asal sekali, membuat WebP untuk semua lebar di THUMBNAIL_WIDTHS, lalu
+menyimpannya di THUMBNAIL_CACHE_DIR/thumbs/. Revisi berikutnya memakai
+request bersyarat (ETag/Last-Modified dari origin); bila gambar tidak
+berubah, file revisi sebelumnya cukup disalin. Folder itu juga didaftarkan
+sebagai WHITENOISE_ROOT sehingga permintaan berikutnya dilayani langsung
+oleh whitenoise dengan max-age sepanjang interval itu (lihat settings.py).
+"""
+import hashlib
+import hmac
+import io
+import os
+import shutil
+import tempfile
+import time
+from urllib.parse import urlencode
+
+import requests
+from PIL import Image, UnidentifiedImageError
+from django.conf import settings
+from django.core.cache import cache
+
+URL_PREFIX = "/thumbs/"
+FAILURE_CACHE_PREFIX = "thumbs:failed:"
+VALIDATORS_CACHE_PREFIX = "thumbs:validators:"
+
+
+class ThumbnailError(Exception):
+    pass
+
+
+def widths():
+    return tuple(getattr(settings, "THUMBNAIL_WIDTHS", (160, 320, 640)))
+
+
+def cache_dir():
+    return os.path.join(settings.THUMBNAIL_CACHE_DIR, "thumbs")
+
+
+def refresh_interval():
+    return getattr(settings, "THUMBNAIL_REFRESH_INTERVAL", 7 * 24 * 3600)
+
+
+def source_key(source_url):
+    digest = hmac.new(settings.SECRET_KEY.encode(), source_url.encode(), hashlib.sha256)
+    return digest.hexdigest()[:32]
+
+
+def revision(key):
+    """Revisi thumbnail `key` saat ini (naik tiap refresh_interval(), digeser per key)."""
+    interval = refresh_interval()
+    return (int(time.time()) + int(key[:8], 16) % interval) // interval
+
+
+def is_remote(source_url):
+    return bool(source_url) and source_url.startswith(("http://", "https://"))
+
+
+def thumbnail_url(source_url, width):
+    """URL thumbnail WebP untuk `source_url` (kosong bila bukan URL http/https)."""
+    if not is_remote(source_url):
+        return source_url or ""
+    if width not in widths():
+        width = min(widths(), key=lambda w: abs(w - width))
+    key = source_key(source_url)
+    return f"{URL_PREFIX}{key}-{revision(key)}-{width}.webp?{urlencode({'src': source_url})}"
+
+
+def srcset(source_url):
+    """Nilai atribut srcset untuk semua lebar thumbnail."""
+    if not is_remote(source_url):
+        return ""
+    return ", ".join(f"{thumbnail_url(source_url, w)} {w}w" for w in widths())
+
+
+def thumbnail_path(key, rev, width):
+    return os.path.join(cache_dir(), f"{key}-{rev}-{width}.webp")
+
+
+def _fetch(source_url, validators):
+    """
+    Ambil gambar asal. Return (isi, validator baru); isi None bila origin
+    menjawab 304 untuk validator lama.
+    """
+    max_bytes = getattr(settings, "THUMBNAIL_MAX_SOURCE_BYTES", 15 * 1024 * 1024)
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        with requests.get(source_url, headers=headers, stream=True,
+                          timeout=getattr(settings, "THUMBNAIL_FETCH_TIMEOUT", 5)) as resp:
+            if resp.status_code == 304 and headers:
+                return None, validators
+            resp.raise_for_status()
+            fresh = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+            buf = io.BytesIO()
+            for chunk in resp.iter_content(64 * 1024):
+                buf.write(chunk)
+                if buf.tell() > max_bytes:
+                    raise ThumbnailError("Gambar asal terlalu besar")
+    except requests.RequestException as e:
+        raise ThumbnailError(f"Gagal mengambil gambar: {e}")
+    buf.seek(0)
+    return buf, fresh
+
+
+def _write_atomic(path, write):
+    """Tulis lewat file sementara + os.replace supaya request paralel tidak membaca file setengah jadi."""
+    fd, tmp = tempfile.mkstemp(dir=cache_dir(), suffix=".tmp")
+    with os.fdopen(fd, "wb") as out:
+        write(out)
+    os.replace(tmp, path)
+
+
+def generate(source_url, rev):
+    """
+    Tulis WebP revisi `rev` untuk semua lebar dari satu fetch gambar asal.
+    Bila origin menyatakan gambar tidak berubah sejak revisi sebelumnya,
+    file revisi itu disalin tanpa decode ulang.
+    """
+    key = source_key(source_url)
+    os.makedirs(cache_dir(), exist_ok=True)
+    validators = cache.get(VALIDATORS_CACHE_PREFIX + key) or {}
+    previous = validators.get("rev")
+    if previous is None or not all(os.path.exists(thumbnail_path(key, previous, w)) for w in widths()):
+        validators = {}
+    source, fresh = _fetch(source_url, validators)
+    if source is None:
+        for width in widths():
+            with open(thumbnail_path(key, previous, width), "rb") as old:
+                _write_atomic(thumbnail_path(key, rev, width), lambda out: shutil.copyfileobj(old, out))
+    else:
+        _encode(source, key, rev)
+    # validator hanya dibutuhkan oleh revisi berikutnya
+    cache.set(VALIDATORS_CACHE_PREFIX + key, {**fresh, "rev": rev}, 2 * refresh_interval())
+    return key
+
+
+def _encode(source, key, rev):
+
+    try:
+        with Image.open(source) as image:
+            image.load()
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    except (UnidentifiedImageError, OSError) as e:
+        raise ThumbnailError(f"Gambar tidak valid: {e}")
+
+    quality = getattr(settings, "THUMBNAIL_WEBP_QUALITY", 80)
+    for width in widths():
+        if image.width > width:
+            resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        else:
+            resized = image
+        _write_atomic(thumbnail_path(key, rev, width),
+                      lambda out: resized.save(out, "WEBP", quality=quality, method=4))
+
+
+def is_valid(key, rev, width, source_url):
+    """
+    True bila (key, rev, width) memang URL thumbnail yang ditandatangani untuk
+    `source_url` (revisi di masa depan ditolak).
+    """
+    return (width in widths() and is_remote(source_url)
+            and hmac.compare_digest(key, source_key(source_url))
+            and rev <= revision(key))
+
+
+def is_current(key, rev):
+    """True bila file revisi `rev` masih boleh dibuat: revisi saat ini, atau sebelumnya
+    untuk halaman yang dirender tepat sebelum revisi berganti."""
+    return rev >= revision(key) - 1
+
+
+def get_or_create(key, rev, width, source_url):
+    """Path file thumbnail; dibuat dulu bila belum ada. Raise ThumbnailError bila gagal."""
+    if not (is_valid(key, rev, width, source_url) and is_current(key, rev)):
+        raise ThumbnailError("Thumbnail tidak dikenal")
+    path = thumbnail_path(key, rev, width)
+    if os.path.exists(path):
+        return path
+    # gagal baru-baru ini: jangan membebani origin dengan percobaan ulang terus-menerus
+    if cache.get(FAILURE_CACHE_PREFIX + key):
+        raise ThumbnailError("Gambar asal sedang tidak bisa diambil")
+    try:
+        generate(source_url, rev)
+    except ThumbnailError:
+        cache.set(FAILURE_CACHE_PREFIX + key, True, getattr(settings, "THUMBNAIL_FAILURE_TTL", 600))
+        raise
+    return path
@@ -1,8 +1,9 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 app_name = 'main'
 
 urlpatterns = [
     path('', views.show_main, name='show_main'),  
-]
\ No newline at end of file
+    re_path(r'^thumbs/(?P<key>[0-9a-f]{32})-(?P<rev>[0-9]+)-(?P<width>[0-9]+)\.webp$', views.thumbnail, name='thumbnail'),
+]
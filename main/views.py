@@ -1,4 +1,8 @@
+from django.http import FileResponse, Http404, HttpResponseRedirect
 from django.shortcuts import render, redirect
+from django.views.decorators.http import require_GET
+
+from main import thumbnails
 
 def show_main(request):
     context = {
@@ -8,3 +12,28 @@ def show_main(request):
     }
 
     return render(request, "main.html", context)
+
+
+# =====================================================
+# 🔹 THUMBNAIL (fallback saat file belum ada di cache)
+# =====================================================
+@require_GET
+def thumbnail(request, key, rev, width):
+    """
+    Dipanggil hanya saat whitenoise belum punya filenya: buat semua ukuran
+    sekali, lalu kirim file yang diminta. Bila origin gagal, arahkan ke URL asal.
+    """
+    source_url = request.GET.get('src', '')
+    if not thumbnails.is_valid(key, int(rev), int(width), source_url):
+        raise Http404("Thumbnail tidak ditemukan")
+    if not thumbnails.is_current(key, int(rev)):
+        # URL dari data yang di-cache lama (snapshot katalog, fragmen): arahkan ke revisi saat ini
+        return HttpResponseRedirect(thumbnails.thumbnail_url(source_url, int(width)))
+    try:
+        path = thumbnails.get_or_create(key, int(rev), int(width), source_url)
+    except thumbnails.ThumbnailError:
+        return HttpResponseRedirect(source_url)
+
+    response = FileResponse(open(path, 'rb'), content_type='image/webp')
+    response['Cache-Control'] = f'public, max-age={thumbnails.refresh_interval()}'
+    return response
@@ -426,4 +426,30 @@ class WishlistIntegrationTestCase(TestCase):
         # 6. Verify empty
         final_json = self.client.get(reverse('wishlist:get_wishlist_json'))
         final_data = json.loads(final_json.content)
-        self.assertEqual(len(final_data), 0)
\ No newline at end of file
+        self.assertEqual(len(final_data), 0)
+
+class WishlistResponseFormatTestCase(TestCase):
+    """Test format columnar/msgpack pada endpoint JSON wishlist"""
+
+    def setUp(self):
+        self.user = UserProfile.objects.create_user(username='formatuser', password='testpass123')
+        for nama in ('Gunung Lawu', 'Gunung Slamet'):
+            gunung = Gunung.objects.create(nama=nama, ketinggian=3000, provinsi='Jawa Tengah', deksripsi='-')
+            WishlistItem.objects.create(user=self.user, gunung=gunung)
+        self.client.login(username='formatuser', password='testpass123')
+
+    def test_columnar_via_accept_header(self):
+        response = self.client.get(reverse('wishlist:get_wishlist_json'),
+                                   HTTP_ACCEPT='application/vnd.gundex.columnar+json')
+        self.assertEqual(response['Content-Type'], 'application/vnd.gundex.columnar+json')
+        self.assertIn('Accept', response['Vary'])
+        data = json.loads(response.content)
+        self.assertEqual(data['keys'], ['id', 'gunung_id', 'gunung_nama', 'added_at'])
+        self.assertEqual(sorted(row[2] for row in data['rows']), ['Gunung Lawu', 'Gunung Slamet'])
+
+    def test_msgpack_matches_json(self):
+        from gundex import serializers
+        url = reverse('wishlist:get_wishlist_json')
+        rows = json.loads(self.client.get(url).content)
+        packed = serializers.unpackb(self.client.get(url, {'format': 'msgpack'}).content)
+        self.assertEqual([dict(zip(packed['keys'], row)) for row in packed['rows']], rows)
@@ -4,6 +4,7 @@ from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy
 from .models import WishlistItem
 from explore_gunung.models import Gunung
+from gundex import serializers
 import json
 
 # Hanya bisa diakses oleh user yang sudah log in
@@ -33,7 +34,8 @@ def get_wishlist_json(request):
             'added_at': item.added_at.strftime('%Y-%m-%d %H:%M:%S')
         })
     
-    return JsonResponse(wishlist_data, safe=False)
+    # JSON (default), columnar, atau msgpack sesuai header Accept / ?format=
+    return serializers.render(request, wishlist_data, rows_key=None)
 
 # Fungsi ini untuk dipanggil oleh AJAX (saat user klik "Add" di hal. Explore)
 @login_required(login_url=reverse_lazy('userprofile:login'))